@@ -1,95 +1,221 @@
+import json
+import operator
+import threading
 import polars as pl
+from functools import reduce
+from collections import OrderedDict
+from typing import Dict, Optional
 from utils.db_management import SSDF
 from utils.logging_utils import logger
 
 
+TEXT_INVERSE = {
+    "equals": "notEqual",
+    "notEqual": "equals",
+    "contains": "notContains",
+    "notContains": "contains",
+    "startsWith": "notStartsWith",
+    "notStartsWith": "startsWith",
+    "endsWith": "notEndsWith",
+    "notEndsWith": "endsWith",
+    "blank": "notBlank",
+    "notBlank": "blank",
+}
+SCALAR_INVERSE = {
+    "equals": "notEqual",
+    "notEqual": "equals",
+    "lessThan": "greaterThanOrEqual",
+    "lessThanOrEqual": "greaterThan",
+    "greaterThan": "lessThanOrEqual",
+    "greaterThanOrEqual": "lessThan",
+    "blank": "notBlank",
+    "notBlank": "blank",
+    "inRange": "notInRange",
+    "notInRange": "inRange",
+}
+
+
+def condition_expression(filter_model):
+    """AG Grid 단일 컬럼 필터 조건을 polars 표현식으로 변환 (지원하지 않는 조건은 None)"""
+    col = filter_model["colId"]
+    crit1 = filter_model.get("filter")
+    filter_type = filter_model.get("type")
+    if filter_model["filterType"] == "boolean":
+        return pl.col(col) == filter_type
+    if filter_type is None:
+        return None
+    if filter_type == "contains":
+        return pl.col(col).str.contains(crit1)
+    elif filter_type == "notContains":
+        return ~pl.col(col).str.contains(crit1)
+    elif filter_type == "equals":
+        return pl.col(col) == crit1
+    elif filter_type == "notEqual":
+        return pl.col(col) != crit1
+    elif filter_type == "startsWith":
+        return pl.col(col).str.starts_with(crit1)
+    elif filter_type == "notStartsWith":
+        return ~pl.col(col).str.starts_with(crit1)
+    elif filter_type == "endsWith":
+        return pl.col(col).str.ends_with(crit1)
+    elif filter_type == "notEndsWith":
+        return ~pl.col(col).str.ends_with(crit1)
+    elif filter_type == "blank":
+        return pl.col(col) == ""
+    elif filter_type == "notBlank":
+        return pl.col(col) != ""
+    elif filter_model["filterType"] == "number" and filter_type in ("inRange", "notInRange"):
+        if "filterTo" in filter_model:
+            in_range = pl.col(col).is_between(crit1, filter_model["filterTo"])
+            return in_range if filter_type == "inRange" else ~in_range
+        return None
+    elif filter_type == "greaterThanOrEqual":
+        return pl.col(col) >= crit1
+    elif filter_type == "lessThanOrEqual":
+        return pl.col(col) <= crit1
+    elif filter_type == "lessThan":
+        return pl.col(col) < crit1
+    elif filter_type == "greaterThan":
+        return pl.col(col) > crit1
+    return None
+
+
+def filter_expression(filterModel):
+    """filterModel 전체(중첩 AND/OR 포함)를 하나의 polars 표현식으로 변환 (필터 없으면 None)
+
+    DataFrame/LazyFrame 어디에나 적용할 수 있어 그리드 조회와 스트리밍 내보내기가 같은 조건을 공유합니다.
+    """
+    if not filterModel:
+        return None
+
+    def combine(conditions, operator):
+        exprs = [expr for expr in (to_expr(condition) for condition in conditions) if expr is not None]
+        if not exprs:
+            return None
+        return pl.any_horizontal(exprs) if operator == "OR" else pl.all_horizontal(exprs)
+
+    def to_expr(model):
+        if "conditions" in model:
+            return combine(model["conditions"], model.get("type", "AND"))
+        if "colId" in model:
+            return condition_expression(model)
+        return None
+
+    return to_expr(filterModel)
+
+
+def invert_model(model: Dict) -> Optional[Dict]:
+    """filter model의 역조건 (De Morgan: AND <-> OR, 각 조건은 반대 연산자) - 뒤집을 수 없으면 None"""
+    if not model:
+        return None
+    if "conditions" in model:
+        conditions = [invert_model(condition) for condition in model["conditions"]]
+        if any(condition is None for condition in conditions):
+            return None
+        return {**model, "type": "OR" if model.get("type", "AND") == "AND" else "AND", "conditions": conditions}
+    filter_type = model.get("filterType")
+    if filter_type in ("text", "object"):
+        inverse_map = TEXT_INVERSE
+    elif filter_type in ("number", "date", "dateString"):
+        inverse_map = SCALAR_INVERSE
+    elif filter_type == "boolean":
+        return {**model, "type": "false" if model.get("type") == "true" else "true"}
+    else:
+        return None
+    return {**model, "type": inverse_map.get(model.get("type"), model.get("type"))}
+
+
+class FilterMaskCache:
+    """filter model의 각 노드(단일 조건, AND/OR 묶음)별 boolean mask를 SSDF.dataframe 버전 단위로 캐시
+
+    필터를 일부만 수정하면 바뀌지 않은 하위 조건의 mask를 재사용하고, 역필터처럼 캐시된 조건의 역조건이 요청되면
+    다시 계산하지 않고 캐시된 mask의 NOT을 사용합니다. mask는 null을 그대로 두어(Kleene 논리)
+    표현식으로 계산한 결과와 같습니다.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._version = None
+        self._masks: "OrderedDict[str, pl.Series]" = OrderedDict()
+
+    @staticmethod
+    def _key(model: Optional[Dict]) -> str:
+        return json.dumps(model, sort_keys=True, default=str)
+
+    def mask(self, filterModel: Dict, df: pl.DataFrame, version: int) -> Optional[pl.Series]:
+        """df와 version은 SSDF.snapshot처럼 함께 읽은 값이어야 함 - 다른 버전의 mask는 읽지도 저장하지도 않음"""
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._masks.clear()
+                self._version = version
+        return self._node_mask(filterModel, df, version)
+
+    def _get(self, key: str, df: pl.DataFrame, version: int) -> Optional[pl.Series]:
+        with self._lock:
+            if self._version != version:
+                return None
+            mask = self._masks.get(key)
+            if mask is None or mask.len() != df.height:
+                return None
+            self._masks.move_to_end(key)
+            return mask
+
+    def _put(self, key: str, mask: pl.Series, df: pl.DataFrame, version: int) -> None:
+        with self._lock:
+            # 계산하는 동안 프레임이 교체되었으면 저장하지 않음
+            if self._version != version or mask.len() != df.height:
+                return
+            self._masks[key] = mask
+            while len(self._masks) > self.max_entries:
+                self._masks.popitem(last=False)
+
+    def _node_mask(self, model: Dict, df: pl.DataFrame, version: int) -> Optional[pl.Series]:
+        key = self._key(model)
+        mask = self._get(key, df, version)
+        if mask is not None:
+            return mask
+
+        inverse = self._get(self._key(invert_model(model)), df, version)
+        if inverse is not None:
+            mask = ~inverse
+        elif "conditions" in model:
+            masks = [mask for mask in (self._node_mask(condition, df, version) for condition in model["conditions"]) if mask is not None]
+            if not masks:
+                return None
+            mask = reduce(operator.or_ if model.get("type", "AND") == "OR" else operator.and_, masks)
+        elif "colId" in model:
+            expr = condition_expression(model)
+            if expr is None:
+                return None
+            mask = df.select(expr.alias("mask")).to_series()
+        else:
+            return None
+        self._put(key, mask, df, version)
+        return mask
+
+
+FILTER_MASKS = FilterMaskCache()
+
+
 def apply_filters(df, request):
     filterModel = request.get("filterModel")
     if not filterModel:
         SSDF.filtered_row_count = ""
         return df
 
-    def filterDf(dff, filter_model, col):
-        if "filter" in filter_model:
-            crit1 = filter_model["filter"]
-        if filter_model["filterType"] == "boolean":
-            dff = dff.filter(pl.col(col) == filter_model["type"])
-        elif "type" in filter_model:
-            if filter_model["type"] == "contains":
-                dff = dff.filter(pl.col(col).str.contains(crit1))
-            elif filter_model["type"] == "notContains":
-                dff = dff.filter(~pl.col(col).str.contains(crit1))
-            elif filter_model["type"] == "equals":
-                dff = dff.filter(pl.col(col) == crit1)
-            elif filter_model["type"] == "notEqual":
-                dff = dff.filter(pl.col(col) != crit1)
-            elif filter_model["type"] == "startsWith":
-                dff = dff.filter(pl.col(col).str.starts_with(crit1))
-            elif filter_model["type"] == "notStartsWith":
-                dff = dff.filter(~pl.col(col).str.starts_with(crit1))
-            elif filter_model["type"] == "endsWith":
-                dff = dff.filter(pl.col(col).str.ends_with(crit1))
-            elif filter_model["type"] == "notEndsWith":
-                dff = dff.filter(~pl.col(col).str.ends_with(crit1))
-            elif filter_model["type"] == "blank":
-                dff = dff.filter(pl.col(col) == "")
-            elif filter_model["type"] == "notBlank":
-                dff = dff.filter(pl.col(col) != "")
-            elif filter_model["filterType"] == "number" and filter_model["type"] == "inRange":
-                if "filterTo" in filter_model:
-                    crit2 = filter_model["filterTo"]
-                    dff = dff.filter(pl.col(col).is_between(crit1, crit2))
-            else:
-                if filter_model["type"] == "greaterThanOrEqual":
-                    dff = dff.filter(pl.col(col) >= crit1)
-                elif filter_model["type"] == "lessThanOrEqual":
-                    dff = dff.filter(pl.col(col) <= crit1)
-                elif filter_model["type"] == "lessThan":
-                    dff = dff.filter(pl.col(col) < crit1)
-                elif filter_model["type"] == "greaterThan":
-                    dff = dff.filter(pl.col(col) > crit1)
-                elif filter_model["type"] == "notEqual":
-                    dff = dff.filter(pl.col(col) != crit1)
-                elif filter_model["type"] == "equals":
-                    dff = dff.filter(pl.col(col) == crit1)
-        return dff
-
-    def apply_filter_condition(df, condition):
-        col = condition["colId"]
-        return filterDf(df, condition, col)
-
-    def process_conditions(df, conditions, operator):
-        if operator == "AND":
-            for condition in conditions:
-                if "conditions" in condition:  # 중첩된 조건 처리
-                    df = process_conditions(df, condition["conditions"], condition["type"])
-                else:
-                    df = apply_filter_condition(df, condition)
-        elif operator == "OR":
-            expressions = []
-            for condition in conditions:
-                if "conditions" in condition:
-                    temp_df = process_conditions(df.clone(), condition["conditions"], condition["type"])
-                    expressions.append(temp_df)
-                else:
-                    temp_df = apply_filter_condition(df.clone(), condition)
-                    expressions.append(temp_df)
-            # OR 조건을 만족하는 모든 행을 포함하는 단일 DataFrame을 생성
-            if expressions:
-                # 첫 번째 DataFrame을 기준으로 시작
-                final_df = expressions[0]
-                for expr_df in expressions[1:]:
-                    final_df = final_df.vstack(expr_df).unique(maintain_order=True)
-                df = final_df
-        return df
-
     try:
         SSDF.filtered_row_count = ""
-        if "colId" in filterModel:
-            df = apply_filter_condition(df, filterModel)
-        elif "conditions" in filterModel:
-            operator = filterModel.get("type", "AND")
-            df = process_conditions(df, filterModel["conditions"], operator)
+        current, version = SSDF.snapshot
+        if df is current:
+            # 원본 프레임이면 노드별 캐시된 mask로 필터 (스크롤/역필터/조건 일부 수정 시 재계산 최소화)
+            mask = FILTER_MASKS.mask(filterModel, df, version)
+            if mask is not None:
+                df = df.filter(mask)
+        else:
+            expr = filter_expression(filterModel)
+            if expr is not None:
+                df = df.filter(expr)
         SSDF.filtered_row_count = f"{len(df):,}"
         return df
     except Exception as e:
@@ -7,6 +7,9 @@ from dash import Output, Input, State, html, dcc, no_update, exceptions
 from datetime import datetime
 import polars as pl
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
+from utils.recovery_log import RecoveryLog
+from utils.background_writer import BACKGROUND_WRITER
 from utils.config import CONFIG
 from utils.logging_utils import logger
 from components.grid.dag.column_definitions import generate_column_definitions
@@ -20,6 +23,7 @@ class AutoRecovery:
         self.last_backup_time = None
         self.backup_thread = None
         self.stop_flag = threading.Event()
+        self.recovery_log = None  # 현재 파일의 복구 로그만 유지 (이전 파일의 기준 DataFrame을 계속 들고 있지 않도록)
         self._setup_backup_directory()
         
     def _setup_backup_directory(self):
@@ -30,6 +34,15 @@ class AutoRecovery:
         except Exception as e:
             logger.error(f"백업 디렉토리 생성 실패: {str(e)}")
     
+    def get_recovery_log(self, file_name):
+        """현재 파일의 복구 로그 (base 스냅샷 + 변경분 세그먼트) 반환 - 다른 파일이 열리면 이전 로그의 메모리 참조를 해제"""
+        directory = os.path.join(self.backup_path, f"{os.path.splitext(file_name)[0]}_recovery")
+        if self.recovery_log is None or self.recovery_log.directory != directory:
+            if self.recovery_log is not None:
+                self.recovery_log.release()
+            self.recovery_log = RecoveryLog(directory)
+        return self.recovery_log
+
     def layout(self):
         return html.Div([
             dcc.Interval(id="backup-interval", interval=self.backup_interval * 1000),  # 10분마다 백업
@@ -114,29 +127,32 @@ class AutoRecovery:
                     # 디스크 공간 확인 실패해도 계속 진행
                     pass
                 
-                # 백업 파일명 생성
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                file_base = os.path.splitext(file_info["name"])[0]
-                backup_file = os.path.join(self.backup_path, f"{file_base}_backup.parquet")
-                
-                # 이전 백업 파일 삭제 (하나만 유지)
-                if backup_info and backup_info.get("backup_file") and os.path.exists(backup_info["backup_file"]):
-                    try:
-                        os.remove(backup_info["backup_file"])
-                    except Exception as e:
-                        logger.error(f"이전 백업 파일 삭제 실패: {str(e)}")
-                
-                # 새 백업 저장
-                SSDF.dataframe.write_parquet(backup_file)
-                
-                # 백업 정보 업데이트
+                # 직전 백업 작업 결과 반영 (아직 쓰는 중이면 이번 주기는 건너뜀)
+                backup_info = dict(backup_info or {})
+                job = BACKGROUND_WRITER.status(backup_info["job_id"]) if backup_info.get("job_id") else None
+                if job and job["state"] in ("queued", "running"):
+                    return no_update, f"자동 백업 진행 중 ({job['progress'] * 100:.0f}%)", "gray"
+                if job and job["state"] == "done" and job["result"] != "skipped":
+                    backup_info["last_backup"] = datetime.fromtimestamp(job["finished"]).strftime("%Y%m%d_%H%M%S")
+                if job and job["state"] == "failed":
+                    logger.error(f"자동 백업 실패: {job['error']}")
+
+                # 복구 로그 체크포인트는 백그라운드 스레드에서 기록 (버전이 같으면 생략, 변경된 컬럼/셀만 추가 기록)
+                recovery_log = self.get_recovery_log(file_info["name"])
+                if recovery_log.exists() and SSDF.version == recovery_log.version:
+                    backup_info["job_id"] = None
+                    return backup_info, f"마지막 백업: {backup_info.get('last_backup') or '-'} (변경 없음)", "gray"
+
+                df, version = SSDF.dataframe, SSDF.version
                 new_backup_info = {
-                    "last_backup": timestamp,
-                    "backup_file": backup_file,
+                    **backup_info,
+                    "job_id": BACKGROUND_WRITER.submit("자동 백업", lambda progress: recovery_log.checkpoint(df, version)),
+                    "backup_file": recovery_log.directory,
                     "original_file": file_info["path"]
                 }
                 
-                return new_backup_info, f"마지막 백업: {timestamp}", "green"
+                status_color = "red" if job and job["state"] == "failed" else "green"
+                return new_backup_info, f"마지막 백업: {backup_info.get('last_backup') or '-'} (백업 진행 중)", status_color
                 
             except Exception as e:
                 logger.error(f"자동 백업 실패: {str(e)}")
@@ -156,19 +172,18 @@ class AutoRecovery:
                 if not os.path.exists(self.backup_path):
                     return False, no_update
                     
-                # 현재 파일에 대한 백업 찾기
-                file_base = os.path.splitext(file_info["name"])[0]
-                backup_file = os.path.join(self.backup_path, f"{file_base}_backup.parquet")
+                # 현재 파일에 대한 복구 로그 찾기
+                recovery_log = self.get_recovery_log(file_info["name"])
                 
-                if not os.path.exists(backup_file):
+                if not recovery_log.exists():
                     return False, no_update
                 
                 # 백업 파일 정보 확인
-                backup_time = datetime.fromtimestamp(os.path.getmtime(backup_file)).strftime("%Y-%m-%d %H:%M:%S")
+                backup_time = datetime.fromtimestamp(recovery_log.mtime()).strftime("%Y-%m-%d %H:%M:%S")
                 
                 # 백업 파일이 현재 파일보다 최신인지 확인
                 current_file_time = datetime.fromtimestamp(file_info.get("mod_time", 0))
-                backup_file_time = datetime.fromtimestamp(os.path.getmtime(backup_file))
+                backup_file_time = datetime.fromtimestamp(recovery_log.mtime())
                 
                 if backup_file_time <= current_file_time:
                     return False, no_update
@@ -193,37 +208,39 @@ class AutoRecovery:
             Output("aggrid-table", "columnDefs", allow_duplicate=True),
             Output("toaster", "toasts", allow_duplicate=True),
             Output("recovery-alert", "isConfirmed"),
+            Output("purge-refresh", "data", allow_duplicate=True),
             Input("recovery-alert", "isConfirmed"),
             State("current-file-info", "data"),
             prevent_initial_call=True
         )
         def recover_from_backup(confirmed, file_info):
             if not confirmed:
-                return no_update, no_update, False
+                return no_update, no_update, False, no_update
                 
             try:
                 if not file_info or not file_info.get("path"):
-                    return no_update, no_update, False
+                    return no_update, no_update, False, no_update
                     
-                file_base = os.path.splitext(file_info["name"])[0]
-                backup_file = os.path.join(self.backup_path, f"{file_base}_backup.parquet")
+                recovery_log = self.get_recovery_log(file_info["name"])
                 
-                if not os.path.exists(backup_file):
-                    return no_update, [dbpc.Toast(message="백업 파일을 찾을 수 없습니다.", intent="danger", icon="error")], False
+                if not recovery_log.exists():
+                    return no_update, [dbpc.Toast(message="백업 파일을 찾을 수 없습니다.", intent="danger", icon="error")], False, no_update
                 
-                # 백업 파일 로드
-                df = pl.read_parquet(backup_file)
+                # 복구 로그 재생 (base + 세그먼트)
+                df = recovery_log.load()
                 SSDF.dataframe = df
+                EDIT_HISTORY.clear()
                 
                 # 백업 시간 확인
-                backup_time = datetime.fromtimestamp(os.path.getmtime(backup_file)).strftime("%Y-%m-%d %H:%M:%S")
+                backup_time = datetime.fromtimestamp(recovery_log.mtime()).strftime("%Y-%m-%d %H:%M:%S")
                 
                 return (
                     generate_column_definitions(df),
                     [dbpc.Toast(message=f"백업 파일 복구 완료 ({backup_time})", intent="success", icon="endorsed")],
-                    False
+                    False,
+                    backup_time,
                 )
                 
             except Exception as e:
                 logger.error(f"백업 파일 복구 실패: {str(e)}")
-                return no_update, [dbpc.Toast(message=f"백업 파일 복구 실패: {str(e)}", intent="danger", icon="error")], False
\ No newline at end of file
+                return no_update, [dbpc.Toast(message=f"백업 파일 복구 실패: {str(e)}", intent="danger", icon="error")], False, no_update
\ No newline at end of file
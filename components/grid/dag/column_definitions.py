@@ -1,5 +1,6 @@
 import polars as pl
-from typing import Dict, Any, List
+from dash import Patch
+from typing import Dict, Any, List, Union
 from enum import Enum
 
 SYSTEM_COLUMNS = ["uniqid", "waiver", "user", "group", "childCount", "tree_group"]
@@ -88,3 +89,41 @@ def generate_column_definition(
 
 def generate_column_definitions(df: pl.DataFrame, col_hide: List[str] = []) -> List[Dict[str, Any]]:
     return [generate_column_definition(col, df[col], col_hide) for col in df.columns if col != "uniqid"]
+
+
+def patch_column_definitions(df: pl.DataFrame, current_defs: List[Dict[str, Any]], col_hide: List[str] = []) -> Union[Patch, List[Dict[str, Any]]]:
+    """현재 columnDefs와 df를 비교하여 추가/삭제/타입 변경된 컬럼만 수정하는 Patch 반환
+
+    변경이 없어도 빈 Patch를 반환하므로 columnDefs 콜백(그리드 데이터 새로고침)은 그대로 트리거됩니다.
+    기존 컬럼의 상대 순서가 바뀐 경우에만 전체 목록을 다시 보냅니다 (기존 정의의 editable 등 상태는 유지).
+    """
+    target_fields = [col for col in df.columns if col != "uniqid"]
+    current_defs = current_defs or []
+    current_by_field = {col_def.get("field"): col_def for col_def in current_defs}
+
+    kept_fields = [col_def.get("field") for col_def in current_defs if col_def.get("field") in df.columns]
+    if kept_fields != [col for col in target_fields if col in current_by_field]:
+        return [current_by_field[col] if col in current_by_field and _same_column_type(current_by_field[col], df[col]) else generate_column_definition(col, df[col], col_hide) for col in target_fields]
+
+    patched_defs = Patch()
+
+    # 삭제된 컬럼 (뒤에서부터 제거하여 인덱스 유지)
+    for i in reversed(range(len(current_defs))):
+        if current_defs[i].get("field") not in df.columns:
+            del patched_defs[i]
+
+    # 타입 변경 및 추가된 컬럼 (target 순서대로 위치 지정)
+    for i, col in enumerate(target_fields):
+        if col not in current_by_field:
+            patched_defs.insert(i, generate_column_definition(col, df[col], col_hide))
+        elif not _same_column_type(current_by_field[col], df[col]):
+            patched_defs[i] = generate_column_definition(col, df[col], col_hide)
+
+    return patched_defs
+
+
+def _same_column_type(col_def: Dict[str, Any], column_expr: pl.Expr) -> bool:
+    if col_def.get("field") == "waiver":
+        return True
+    expected = "text" if determine_column_type(column_expr) == ColumnType.STRING else "number"
+    return col_def.get("cellDataType") == expected
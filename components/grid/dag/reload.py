@@ -1,30 +1,81 @@
 import os
+import json
+from urllib.parse import quote
 import dash_mantine_components as dmc
 import dash_blueprint_components as dbpc
+from flask import Response, request
 from dash import Output, Input, State, html, dcc, no_update, exceptions, set_props
+from dash_extensions import EventSource
 from utils.db_management import SSDF
+from utils.file_watcher import FILE_WATCHER
+from utils.edit_history import EDIT_HISTORY
 from utils.config import CONFIG
-from utils.data_processing import validate_df
+from utils.incremental_reload import INCREMENTAL_RELOAD
+from utils.logging_utils import logger
 from components.grid.dag.column_definitions import generate_column_definitions
 
 
 class FileReload:
 
     def layout(self):
-        return dmc.Group([dcc.Interval(id="update-interval", interval=10000),dcc.Store("csv-mod-time"),dbpc.Button("Reload",id="file-reload-btn",small=True,icon="data-sync",intent="warning",minimal=True), dbpc.Alert(id="data-reload-alert",children=[f"Do you want Reload the Data? (current changes will disappear)"],cancelButtonText="Cancel",confirmButtonText="Reload",icon="refresh",intent="warning")],justify="flex-start")
+        return dmc.Group([EventSource(id="file-events"),dcc.Store("csv-mod-time"),dbpc.Button("Reload",id="file-reload-btn",small=True,icon="data-sync",intent="warning",minimal=True), dbpc.Alert(id="data-reload-alert",children=[f"Do you want Reload the Data? (current changes except your waivers will disappear)"],cancelButtonText="Cancel",confirmButtonText="Reload",icon="refresh",intent="warning")],justify="flex-start")
+
+    @staticmethod
+    def file_events():
+        """파일 변경 시 현재 mtime을 보내는 SSE 스트림 (30초마다 keepalive)
+
+        WORKSPACE 안의 파일이나 현재 열린 파일만 감시합니다 (그 외 경로는 존재 여부도 알리지 않고 404).
+        """
+        file_path = request.args.get("path", "")
+        if file_path.startswith("WORKSPACE"):
+            file_path = file_path.replace("WORKSPACE", CONFIG.WORKSPACE)
+        file_path = os.path.realpath(file_path)
+        workspace = os.path.realpath(CONFIG.WORKSPACE)
+        current = INCREMENTAL_RELOAD.current
+        try:
+            in_workspace = os.path.commonpath([file_path, workspace]) == workspace
+        except ValueError:  # 다른 드라이브
+            in_workspace = False
+        if not (in_workspace or (current and file_path == os.path.realpath(current))) or not os.path.isfile(file_path):
+            return Response(status=404)
+
+        def stream():
+            FILE_WATCHER.watch(file_path)
+            try:
+                known_mtime = FILE_WATCHER.mtime(file_path)
+                yield f"data: {json.dumps({'mtime': known_mtime})}\n\n"
+                while True:
+                    mtime = FILE_WATCHER.wait_for_change(file_path, known_mtime, timeout=30)
+                    if mtime != known_mtime:
+                        known_mtime = mtime
+                        yield f"data: {json.dumps({'mtime': mtime})}\n\n"
+                    else:
+                        yield ": keepalive\n\n"
+            finally:
+                FILE_WATCHER.unwatch(file_path)
+
+        return Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
 
     def register_callbacks(self, app):
 
-        @app.callback(Output("file-reload-btn", "minimal"),Input("update-interval", "n_intervals"),State("flex-layout", "model"),State("csv-mod-time", "data"))
-        def check_file_update(n, model_layout, stored_mod_time):
-            file_path = model_layout["layout"]["children"][0]["children"][0].get("name")            
+        if "file_events" not in app.server.view_functions:
+            app.server.add_url_rule("/file-events", "file_events", self.file_events)
+
+        @app.callback(Output("file-events", "url"),Input("csv-mod-time", "data"),State("flex-layout", "model"))
+        def subscribe_file_events(mod_time, model_layout):
+            """열린 파일의 변경 알림 스트림(SSE) 구독 - 서버의 감시 스레드 하나가 모든 탭의 파일을 감시"""
+            file_path = model_layout["layout"]["children"][0]["children"][0].get("name")
             if not file_path:
+                return None
+            return f"/file-events?path={quote(file_path)}"
+
+        @app.callback(Output("file-reload-btn", "minimal"),Input("file-events", "message"),State("csv-mod-time", "data"))
+        def check_file_update(message, stored_mod_time):
+            if not message:
                 return no_update
-            if file_path.startswith("WORKSPACE"):
-                file_path = file_path.replace("WORKSPACE", CONFIG.WORKSPACE)
-            if not os.path.exists(file_path):
+            current_mod_time = json.loads(message)["mtime"]
+            if current_mod_time is None:
                 return no_update
-            current_mod_time = os.path.getmtime(file_path)
             return True if stored_mod_time == current_mod_time else False
 
         @app.callback(Output("data-reload-alert", "isOpen", allow_duplicate=True),Input("file-reload-btn", "n_clicks"),prevent_initial_call=True)
@@ -33,21 +84,28 @@ class FileReload:
                 return no_update
             return True
 
-        @app.callback(Output("aggrid-table", "columnDefs", allow_duplicate=True),Output("csv-mod-time", "data"),Output("data-reload-alert", "isConfirmed"),Input("data-reload-alert", "isConfirmed"),State("flex-layout", "model"),prevent_initial_call=True)
+        @app.callback(Output("aggrid-table", "columnDefs", allow_duplicate=True),Output("csv-mod-time", "data"),Output("data-reload-alert", "isConfirmed"),Output("purge-refresh", "data", allow_duplicate=True),Output("toaster", "toasts", allow_duplicate=True),Input("data-reload-alert", "isConfirmed"),State("flex-layout", "model"),prevent_initial_call=True)
         def reload_file(n, model_layout):
             file_path = model_layout["layout"]["children"][0]["children"][0]["name"]
 
             if not file_path:
-                return no_update, no_update, False
+                return no_update, no_update, False, no_update, no_update
 
             if file_path.startswith("WORKSPACE"):
                 file_path = file_path.replace("WORKSPACE", CONFIG.WORKSPACE)
 
             if not os.path.exists(file_path):
-                return no_update, no_update, False
-
-            SSDF.dataframe = validate_df(file_path)
+                return no_update, no_update, False, no_update, no_update
 
+            # 바뀐 블록부터만 다시 읽고(불가능하면 전체 파일), 로컬 waiver 반영
             current_mod_time = os.path.getmtime(file_path)
+            try:
+                df, message, intent = INCREMENTAL_RELOAD.reload_with_local_waivers(file_path, SSDF.dataframe)
+            except Exception as e:
+                logger.error(f"Reload 실패: {e}")
+                return no_update, no_update, False, no_update, [dbpc.Toast(message=f"Reload 실패: {e}", intent="danger", icon="error")]
 
-            return generate_column_definitions(SSDF.dataframe), current_mod_time, False
\ No newline at end of file
+            SSDF.dataframe = df
+            EDIT_HISTORY.clear()
+            icon = "endorsed" if intent == "success" else "warning-sign"
+            return generate_column_definitions(SSDF.dataframe), current_mod_time, False, current_mod_time, [dbpc.Toast(message=message, intent=intent, icon=icon, timeout=3000)]
\ No newline at end of file
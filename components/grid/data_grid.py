@@ -163,6 +163,11 @@ class DataGrid:
 
                 try {
                     const grid = await getGrid(id);
+                    if (grid.getGridOption("serverSideDatasource")) {
+                        // 컬럼 정의만 변경된 경우: 캐시된 블록을 유지한 채 값만 새로고침
+                        grid.refreshServerSide({ purge: false });
+                        return window.dash_clientside.no_update;
+                    }
                     const datasource = createServerSideDatasource();
                     grid.updateGridOptions({ serverSideDatasource: datasource });
                     console.log("Grid initialized successfully");
@@ -321,6 +326,18 @@ class DataGrid:
             
             
 
+        # 행 집합이 바뀐 경우(파일 열기/리로드/복구) 블록 캐시를 비우고 새로 로드
+        app.clientside_callback(
+            """
+            function (data, grid_id) {
+                dash_ag_grid.getApi(grid_id).refreshServerSide({ purge: true });
+            }
+            """,
+            Input("purge-refresh", "data"),
+            State("aggrid-table", "id"),
+            prevent_initial_call=True,
+        )
+
         app.clientside_callback(
         """
         function (data, grid_id) {
@@ -8,6 +8,7 @@ from components.menu.edit.item.split_column import SplitColumn
 from components.menu.edit.item.rename_headers import RenameHeaders
 from components.menu.edit.item.fill_nan_values import FillNanValues
 from components.menu.edit.item.find_and_replace import FindAndReplace
+from components.menu.edit.item.undo_redo import UndoRedo
 
 
 class EditMenu:
@@ -21,9 +22,11 @@ class EditMenu:
         self.rename_headers = RenameHeaders() 
         self.fill_nan_values = FillNanValues()
         self.find_and_replace = FindAndReplace()
+        self.undo_redo = UndoRedo()
 
     def layout(self):
         return dmc.Group([
+            self.undo_redo.button_layout(),
             self.add_column.button_layout(),
             self.del_column.button_layout(),
             self.rename_headers.button_layout(),
@@ -45,5 +48,6 @@ class EditMenu:
         self.rename_headers.register_callbacks(app)
         self.fill_nan_values.register_callbacks(app)
         self.find_and_replace.register_callbacks(app)
+        self.undo_redo.register_callbacks(app)
 
 
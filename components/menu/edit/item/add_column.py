@@ -6,8 +6,10 @@ from dash import Output, Input, State, Patch, html, no_update, exceptions, ctx
 
 from utils.data_processing import displaying_df
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
+from utils.column_profile import COLUMN_PROFILES
 from utils.logging_utils import logger
-from components.grid.dag.column_definitions import generate_column_definitions, SYSTEM_COLUMNS
+from components.grid.dag.column_definitions import patch_column_definitions, SYSTEM_COLUMNS
 from components.menu.edit.utils import find_tab_in_layout, handle_tab_button_click
 
 class AddColumn:
@@ -179,6 +181,45 @@ class AddColumn:
             withBorder=True,
         )
 
+    def _build_default_expr(self, header, datatype, default_value):
+        """기본값으로 채워진 컬럼 표현식 생성 (pl.lit 브로드캐스트 사용)"""
+        if not default_value and default_value != "0":
+            # 빈 값이면 null로 설정
+            return pl.lit(None).alias(header)
+
+        if datatype == "auto":
+            # 자동 타입 감지
+            if default_value.isdigit():
+                value, dtype = int(default_value), pl.Int64
+            elif default_value.replace(".", "", 1).isdigit():
+                value, dtype = float(default_value), pl.Float64
+            elif default_value.lower() in ["true", "false"]:
+                value, dtype = default_value.lower() == "true", pl.Boolean
+            else:
+                value, dtype = str(default_value), pl.Utf8
+        elif datatype == "int":
+            value, dtype = int(default_value), pl.Int64
+        elif datatype == "float":
+            value, dtype = float(default_value), pl.Float64
+        elif datatype == "bool":
+            value, dtype = default_value.lower() in self.boolean_true, pl.Boolean
+        else:  # str
+            value, dtype = str(default_value), pl.Utf8
+
+        return pl.lit(value, dtype=dtype).alias(header)
+
+    @staticmethod
+    def _insert_column(df, column_expr, header, add_to_left):
+        """새 컬럼을 추가하고 위치는 컬럼 순서(select)로만 조정 - 데이터 복사 없음"""
+        df = df.with_columns(column_expr)
+        if not add_to_left:
+            return df
+
+        # 왼쪽 추가: uniqid는 항상 맨 앞에 유지
+        leading = ["uniqid"] if "uniqid" in df.columns else []
+        rest = [col for col in df.columns if col not in leading and col != header]
+        return df.select(leading + [header] + rest)
+
     def register_callbacks(self, app):
         """콜백 함수 등록"""
         
@@ -357,9 +398,10 @@ class AddColumn:
             State("add-column-copy-select", "value"),
             State("add-column-transform-checkbox", "checked"),
             State("add-column-transform-select", "value"),
+            State("aggrid-table", "columnDefs"),
             prevent_initial_call=True
         )
-        def handle_add_column_submission(left_clicks, right_clicks, header, tab_value, datatype, default_value, copy_column, apply_transform, transform_function):
+        def handle_add_column_submission(left_clicks, right_clicks, header, tab_value, datatype, default_value, copy_column, apply_transform, transform_function, columnDefs):
             """컬럼 추가 로직 실행"""
             if not left_clicks and not right_clicks:
                 raise exceptions.PreventUpdate
@@ -388,45 +430,17 @@ class AddColumn:
                     return ([dbpc.Toast(message=f"'{header}'는 시스템 예약 컬럼입니다. 다른 이름을 사용해주세요.", intent="warning", icon="warning-sign")], no_update, no_update, no_update, no_update, no_update)
 
             try:
-                rows_count = len(SSDF.dataframe)
-
                 if tab_value == "default":
-                    # 기본값 모드 - 데이터 타입에 따라 변환
-                    if not default_value and default_value != "0":
-                        # 빈 값이면 null로 설정
-                        new_column = pl.Series(header, [None] * rows_count)
-                    else:
-                        try:
-                            if datatype == "auto":
-                                # 자동 타입 감지
-                                if default_value.isdigit():
-                                    new_column = pl.Series(header, [int(default_value)] * rows_count)
-                                elif default_value.replace(".", "", 1).isdigit():
-                                    new_column = pl.Series(header, [float(default_value)] * rows_count)
-                                elif default_value.lower() in ["true", "false"]:
-                                    new_column = pl.Series(header, [default_value.lower() == "true"] * rows_count)
-                                else:
-                                    new_column = pl.Series(header, [str(default_value)] * rows_count)
-                            elif datatype == "int":
-                                new_column = pl.Series(header, [int(default_value)] * rows_count)
-                            elif datatype == "float":
-                                new_column = pl.Series(header, [float(default_value)] * rows_count)
-                            elif datatype == "bool":
-                                bool_value = default_value.lower() in self.boolean_true
-                                new_column = pl.Series(header, [bool_value] * rows_count)
-                            else:  # str
-                                new_column = pl.Series(header, [str(default_value)] * rows_count)
-                        except ValueError as e:
-                            return ([dbpc.Toast(message=f"값 변환 오류: {str(e)}", intent="danger", icon="error")], no_update, no_update, no_update, no_update, no_update)
+                    # 기본값 모드 - 데이터 타입에 따라 상수 표현식 생성 (행 수만큼 리스트를 만들지 않음)
+                    try:
+                        new_column = self._build_default_expr(header, datatype, default_value)
+                    except ValueError as e:
+                        return ([dbpc.Toast(message=f"값 변환 오류: {str(e)}", intent="danger", icon="error")], no_update, no_update, no_update, no_update, no_update)
 
-                    # 컬럼 추가
-                    if add_to_left:
-                        # 왼쪽에 컬럼 추가
-                        new_df = pl.DataFrame({header: new_column})
-                        SSDF.dataframe = pl.concat([new_df, SSDF.dataframe], how="horizontal")
-                    else:
-                        # 오른쪽에 컬럼 추가
-                        SSDF.dataframe = SSDF.dataframe.with_columns([new_column])
+                    # 컬럼 추가 (상수는 with_columns에서 브로드캐스트됨)
+                    df = self._insert_column(SSDF.dataframe, new_column, header, add_to_left)
+                    EDIT_HISTORY.record("Add Column", [header])
+                    SSDF.dataframe = df
 
                     # 성공 메시지
                     position = "왼쪽" if add_to_left else "오른쪽"
@@ -464,13 +478,9 @@ class AddColumn:
 
                     # 컬럼 추가
                     try:
-                        if add_to_left:
-                            # 왼쪽에 컬럼 추가
-                            new_df = pl.DataFrame({header: SSDF.dataframe.select(new_column).to_series()})
-                            SSDF.dataframe = pl.concat([new_df, SSDF.dataframe], how="horizontal")
-                        else:
-                            # 오른쪽에 컬럼 추가
-                            SSDF.dataframe = SSDF.dataframe.with_columns(new_column)
+                        df = self._insert_column(SSDF.dataframe, new_column, header, add_to_left)
+                        EDIT_HISTORY.record("Add Column", [header])
+                        SSDF.dataframe = df
                     except Exception as e:
                         logger.error(f"컬럼 추가 중 오류: {str(e)}")
                         return ([dbpc.Toast(message=f"컬럼 추가 중 오류: {str(e)}", intent="danger", icon="error")], no_update, no_update, no_update, no_update, no_update)
@@ -480,8 +490,10 @@ class AddColumn:
                     transform_text = f", 변환: {transform_function}" if apply_transform else ""
                     toast_message = f"'{header}' 컬럼이 {position}에 추가되었습니다 (원본: {copy_column}{transform_text})"
 
+                COLUMN_PROFILES.invalidate([header])
+
                 # 컬럼 정의 업데이트
-                updated_columnDefs = generate_column_definitions(SSDF.dataframe)
+                updated_columnDefs = patch_column_definitions(SSDF.dataframe, columnDefs)
 
                 # 성공 토스트 메시지
                 toast = dbpc.Toast(message=toast_message, intent="success", icon="endorsed", timeout=4000)
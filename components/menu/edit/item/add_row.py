@@ -7,7 +7,7 @@ from dash import Output, Input, State, Patch, html, no_update, exceptions, ctx,
 from utils.data_processing import displaying_df
 from utils.db_management import SSDF
 from utils.logging_utils import logger
-from components.grid.dag.column_definitions import generate_column_definitions
+from components.grid.dag.column_definitions import patch_column_definitions
 from components.menu.edit.utils import find_tab_in_layout, handle_tab_button_click
 from components.grid.dag.server_side_operations import extract_rows_from_data
 
@@ -416,7 +416,7 @@ class AddRow:
                     SSDF.dataframe = final_df
                     
                     # 컬럼 정의 업데이트
-                    updated_columnDefs = generate_column_definitions(SSDF.dataframe)
+                    updated_columnDefs = patch_column_definitions(SSDF.dataframe, columnDefs)
                     
                     # 추가된 행 수 계산
                     added_rows = len(final_df) - original_row_count
@@ -5,8 +5,9 @@ from dash import Output, Input, State, Patch, html, no_update, exceptions, dcc
 
 from utils.data_processing import displaying_df
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
 from utils.logging_utils import logger
-from components.grid.dag.column_definitions import generate_column_definitions, SYSTEM_COLUMNS
+from components.grid.dag.column_definitions import patch_column_definitions, SYSTEM_COLUMNS
 from components.menu.edit.utils import find_tab_in_layout, handle_tab_button_click
 
 
@@ -67,7 +68,7 @@ class DelColumn:
                 # 삭제 확인 체크박스
                 dmc.Checkbox(
                     id="delete-column-confirm", 
-                    label="삭제를 확인합니다. 이 작업은 되돌릴 수 없습니다.", 
+                    label="삭제를 확인합니다. (Undo로 되돌릴 수 있습니다)", 
                     size="sm"
                 ),
 
@@ -255,31 +256,18 @@ class DelColumn:
                     )], no_update, selected_columns, True, warned_columns, no_update)
 
                 # 모든 경고 확인이 완료되거나 경고 대상이 없는 경우 실제 삭제 수행
-                # 백업 컬럼 데이터 (오류 발생 시 복구용)
-                backup_data = {}
-                for col in selected_columns:
-                    if col in SSDF.dataframe.columns:
-                        backup_data[col] = SSDF.dataframe[col]
-
-                # 컬럼 삭제 실행
+                # 컬럼 삭제 실행 (drop 실패 시 SSDF.dataframe은 그대로 유지됨)
                 try:
-                    SSDF.dataframe = SSDF.dataframe.drop(selected_columns)
+                    df = SSDF.dataframe.drop(selected_columns)
+                    EDIT_HISTORY.record("Delete Column", selected_columns)
+                    SSDF.dataframe = df
                 except Exception as e:
-                    # 오류 발생 시 원래 상태로 복원 시도
                     logger.error(f"컬럼 삭제 실패: {str(e)}")
-                    
-                    try:
-                        # 복원 시도
-                        for col, data in backup_data.items():
-                            SSDF.dataframe = SSDF.dataframe.with_columns(data)
-                    except Exception as restore_err:
-                        logger.error(f"상태 복원 실패: {str(restore_err)}")
-                        
                     return ([dbpc.Toast(message=f"컬럼 삭제 실패: {str(e)}", intent="danger", icon="error")], 
                             no_update, no_update, no_update, warned_columns, no_update)
 
                 # 컬럼 정의 업데이트
-                updated_columnDefs = generate_column_definitions(SSDF.dataframe)
+                updated_columnDefs = patch_column_definitions(SSDF.dataframe, columnDefs)
 
                 # 삭제된 컬럼 중 경고 컬럼이 있는 경우 특별 메시지 추가
                 toast_message = f"{len(selected_columns)}개 컬럼이 삭제되었습니다: {', '.join(selected_columns)}"
@@ -294,8 +282,7 @@ class DelColumn:
                 
                 # 업데이트된 컬럼 선택 목록 생성
                 updated_column_data = []
-                for col in updated_columnDefs:
-                    field = col.get("field")
+                for field in SSDF.dataframe.columns:
                     if field not in self.protected_columns:
                         # 경고 컬럼인 경우 표시 추가
                         if field in self.warning_columns:
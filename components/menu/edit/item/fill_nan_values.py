@@ -4,8 +4,10 @@ import dash_blueprint_components as dbpc
 from dash import Output, Input, State, Patch, html, no_update, exceptions, ctx, ALL
 from utils.data_processing import displaying_df
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
+from utils.column_profile import COLUMN_PROFILES
 from utils.logging_utils import logger
-from components.grid.dag.column_definitions import generate_column_definitions, SYSTEM_COLUMNS
+from components.grid.dag.column_definitions import patch_column_definitions, SYSTEM_COLUMNS
 from components.menu.edit.utils import find_tab_in_layout, handle_tab_button_click
 
 
@@ -162,13 +164,14 @@ class FillNanValues:
             if not selected_columns:
                 return dmc.Text("컬럼을 선택하세요", size="sm", c="dimmed")
 
-            df = SSDF.dataframe
+            profiles = COLUMN_PROFILES.get(selected_columns)
             info_components = []
 
             for col in selected_columns:
                 try:
-                    # 컬럼 데이터 타입 확인
-                    dtype = df[col].dtype
+                    # 캐시된 컬럼 프로파일 사용 (전체 컬럼을 한 번에 계산)
+                    profile = profiles[col]
+                    dtype = profile["dtype"]
 
                     # 사람이 읽기 쉬운 타입명 생성
                     readable_type = "알 수 없음"
@@ -191,15 +194,12 @@ class FillNanValues:
                         type_color = "pink"
 
                     # 컬럼의 NaN/Null 값 정보
-                    null_count = df[col].null_count()
+                    null_count = profile["null_count"]
                     nan_count = 0
                     
                     # -99999 값 (현재 대체되고 있는 NaN/Null) 개수 확인
-                    temp_neg_count = 0
-                    if dtype in [pl.Float64, pl.Float32, pl.Int64, pl.Int32, pl.UInt32, pl.UInt64]:
-                        temp_neg_count = df.filter(pl.col(col) == -99999).height
-                    
-                    total_count = len(df[col])
+                    temp_neg_count = profile["sentinel_count"]
+                    total_count = profile["total_count"]
                     missing_percent = ((null_count + nan_count + temp_neg_count) / total_count * 100) if total_count > 0 else 0
 
                     # 컬럼 정보 컴포넌트 생성
@@ -384,9 +384,10 @@ class FillNanValues:
                 State("fill-nan-value-input", "value"),
                 State("fill-nan-filtered-only", "checked"),
             ],
+            State("aggrid-table", "columnDefs"),
             prevent_initial_call=True,
         )
-        def apply_fill_nan(n_clicks, selected_columns, method, value, filtered_only):
+        def apply_fill_nan(n_clicks, selected_columns, method, value, filtered_only, columnDefs):
             """NaN/Null 값 대체 적용"""
             if not n_clicks or not selected_columns or not method:
                 raise exceptions.PreventUpdate
@@ -471,8 +472,10 @@ class FillNanValues:
 
                     # 일부 컬럼만 성공한 경우
                     if successful_columns:
+                        EDIT_HISTORY.record("Fill NaN Values", successful_columns)
                         SSDF.dataframe = df
-                        updated_columnDefs = generate_column_definitions(df)
+                        COLUMN_PROFILES.invalidate(successful_columns)
+                        updated_columnDefs = patch_column_definitions(df, columnDefs)
 
                         return (
                             [
@@ -500,8 +503,10 @@ class FillNanValues:
                         )
 
                 # 모든 컬럼 변환 성공
+                EDIT_HISTORY.record("Fill NaN Values", successful_columns)
                 SSDF.dataframe = df
-                updated_columnDefs = generate_column_definitions(df)
+                COLUMN_PROFILES.invalidate(successful_columns)
+                updated_columnDefs = patch_column_definitions(df, columnDefs)
                 
                 # 대체 방법 설명 텍스트 생성
                 method_text = {
@@ -6,8 +6,9 @@ from dash import Output, Input, State, Patch, html, no_update, exceptions, ctx,
 
 from utils.data_processing import displaying_df  
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
 from utils.logging_utils import logger
-from components.grid.dag.column_definitions import generate_column_definitions, SYSTEM_COLUMNS
+from components.grid.dag.column_definitions import patch_column_definitions, SYSTEM_COLUMNS
 from components.menu.edit.utils import find_tab_in_layout, handle_tab_button_click
 
 
@@ -460,9 +461,10 @@ class FindAndReplace:
                 State("find-replace-case-sensitive", "value"),
                 State("find-replace-filtered-only", "checked")
             ],
+            State("aggrid-table", "columnDefs"),
             prevent_initial_call=True
         )
-        def apply_find_replace(n_clicks, selected_columns, search_value, replace_value, mode, case_sensitive, filtered_only):
+        def apply_find_replace(n_clicks, selected_columns, search_value, replace_value, mode, case_sensitive, filtered_only, columnDefs):
             if not n_clicks or not selected_columns or not search_value:
                 raise exceptions.PreventUpdate
 
@@ -504,8 +506,9 @@ class FindAndReplace:
                     total_replacements += len(matches)
                 
                 # 데이터프레임 업데이트
+                EDIT_HISTORY.record("Find and Replace", selected_columns)
                 SSDF.dataframe = df
-                updated_columnDefs = generate_column_definitions(df)
+                updated_columnDefs = patch_column_definitions(df, columnDefs)
                 
                 # 초기화 - 검색/치환 값만 초기화, 컬럼 선택은 유지
                 return [
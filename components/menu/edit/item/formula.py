@@ -7,8 +7,9 @@ import re
 
 from utils.data_processing import displaying_df
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
 from utils.logging_utils import logger
-from components.grid.dag.column_definitions import generate_column_definitions
+from components.grid.dag.column_definitions import patch_column_definitions
 from components.menu.edit.utils import handle_tab_button_click
 
 class Formula:
@@ -717,9 +718,10 @@ class Formula:
                 State("formula-operation", "value"),
                 State({"type": "formula-input", "index": ALL}, "value")
             ],
+            State("aggrid-table", "columnDefs"),
             prevent_initial_call=True
         )
-        def apply_formula(n_clicks, column_name, operation_type, operation, input_values):
+        def apply_formula(n_clicks, column_name, operation_type, operation, input_values, columnDefs):
             """수식 적용"""
             if not n_clicks:
                 raise exceptions.PreventUpdate
@@ -729,10 +731,12 @@ class Formula:
                 polars_expr = self._create_polars_expression(operation_type, operation, input_values)
                 
                 # 새 컬럼 계산 및 추가
-                SSDF.dataframe = SSDF.dataframe.with_columns(polars_expr.alias(column_name))
+                df = SSDF.dataframe.with_columns(polars_expr.alias(column_name))
+                EDIT_HISTORY.record("Formula", [column_name])
+                SSDF.dataframe = df
                 
                 # 컬럼 정의 업데이트
-                updated_columnDefs = generate_column_definitions(SSDF.dataframe)
+                updated_columnDefs = patch_column_definitions(SSDF.dataframe, columnDefs)
                 
                 # 성공 메시지
                 operation_label = next((op["label"] for op in self.supported_operations.get(self._get_operation_category(operation_type), []) if op["value"] == operation), operation)
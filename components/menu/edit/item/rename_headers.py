@@ -1,10 +1,14 @@
+import re
 import polars as pl
+import dash_ag_grid as dag
 import dash_mantine_components as dmc
 import dash_blueprint_components as dbpc
+from collections import Counter
 from dash import Output, Input, State, Patch, html, no_update, exceptions, ctx, ALL
 
 from utils.data_processing import displaying_df
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
 from utils.logging_utils import logger
 from components.grid.dag.column_definitions import generate_column_definitions, SYSTEM_COLUMNS
 from components.menu.edit.utils import handle_tab_button_click
@@ -32,8 +36,29 @@ class RenameHeaders:
                     mb=15,
                 ),
                 
-                # 컬럼 선택 및 헤더 이름 변경 입력 영역
-                html.Div(id="rename-headers-inputs-container"),
+                # 정규식 일괄 변경 (예: 접두어 제거 '^pre_' → '')
+                dmc.Group([
+                    dmc.TextInput(id="rename-headers-pattern", label="Regex Pattern", placeholder="예: ^pre_", size="sm", style={"flex": 1}),
+                    dmc.TextInput(id="rename-headers-replacement", label="Replacement", placeholder="빈 값이면 제거", size="sm", style={"flex": 1}),
+                ], grow=True),
+                dmc.Space(h=5),
+                dmc.Group([
+                    dbpc.Button("Fill by Pattern", id="rename-headers-pattern-btn", outlined=True, small=True, icon="regex"),
+                ], justify="flex-end"),
+                dmc.Space(h=10),
+
+                # 컬럼 선택 및 헤더 이름 변경 입력 영역 (가상 스크롤)
+                dag.AgGrid(
+                    id="rename-headers-grid",
+                    rowData=[],
+                    columnDefs=[
+                        {"field": "current", "headerName": "현재 컬럼명", "editable": False},
+                        {"field": "new", "headerName": "새 컬럼명", "editable": True, "cellClass": "editable-column"},
+                    ],
+                    defaultColDef={"resizable": True, "filter": True, "flex": 1},
+                    dashGridOptions={"rowHeight": 28, "headerHeight": 30, "stopEditingWhenCellsLoseFocus": True},
+                    style={"height": "400px", "width": "100%"},
+                ),
                 
                 dmc.Space(h=20),
                 
@@ -65,139 +90,127 @@ class RenameHeaders:
 
 
         @app.callback(
-            Output("rename-headers-inputs-container", "children"),
+            Output("rename-headers-grid", "rowData"),
             Input("rename-headers-btn", "n_clicks"),
             State("aggrid-table", "columnDefs"),
             prevent_initial_call=True
         )
         def create_rename_inputs(n_clicks, columnDefs):
-            """컬럼 이름 변경을 위한 입력 필드 생성"""
+            """컬럼 이름 변경 목록 생성 (AG Grid가 보이는 행만 렌더링하므로 수백 개 컬럼도 빠르게 열림)"""
             if n_clicks is None or not columnDefs:
                 return []
-                
-            input_fields = []
-            
-            # 헤더 행 추가
-            input_fields.append(
-                dmc.Grid(
-                    [
-                        dmc.GridCol(dmc.Text("현재 컬럼명", w="bold"), span=5),
-                        dmc.GridCol(dmc.Text("새 컬럼명", w="bold"), span=7),
-                    ],
-                    mb=10
-                )
-            )
-            
-            # 각 컬럼에 대한 입력 필드 생성
-            for col in columnDefs:
-                field = col.get("field")
-                if field and field not in SYSTEM_COLUMNS:
-                    input_field = dmc.Grid(
-                        [
-                            dmc.GridCol(
-                                dmc.Text(
-                                    field, 
-                                    style={"overflow": "hidden", "textOverflow": "ellipsis", "whiteSpace": "nowrap"}
-                                ), 
-                                span=5
-                            ),
-                            dmc.GridCol(
-                                dmc.TextInput(
-                                    id={"type": "rename-header-input", "column": field},
-                                    placeholder=f"새 이름 입력",
-                                    value="",
-                                    style={"width": "100%"}
-                                ),
-                                span=7
-                            ),
-                        ],
-                        mb=10
-                    )
-                    input_fields.append(input_field)
-            
-            if not input_fields:
-                return dmc.Alert("변경 가능한 컬럼이 없습니다.", color="yellow", variant="light")
-                
-            # 스크롤 가능한 컨테이너에 입력 필드들 배치
-            return dmc.Paper(
-                children=input_fields,
-                style={"maxHeight": "400px", "overflow": "auto"},
-                p="sm",
-                withBorder=True
-            )
-            
+
+            return [{"current": col["field"], "new": ""} for col in columnDefs if col.get("field") and col["field"] not in SYSTEM_COLUMNS]
+
+        @app.callback(
+            Output("rename-headers-grid", "rowData", allow_duplicate=True),
+            Output("toaster", "toasts", allow_duplicate=True),
+            Input("rename-headers-pattern-btn", "n_clicks"),
+            State("rename-headers-pattern", "value"),
+            State("rename-headers-replacement", "value"),
+            State("rename-headers-grid", "rowData"),
+            prevent_initial_call=True
+        )
+        def apply_rename_pattern(n_clicks, pattern, replacement, row_data):
+            """정규식 패턴을 모든 컬럼명에 적용하여 새 이름 칸을 일괄 채움 (예: '^pre_' → '')"""
+            if not n_clicks or not row_data:
+                raise exceptions.PreventUpdate
+            if not pattern:
+                return no_update, [dbpc.Toast(message="정규식 패턴을 입력하세요.", intent="warning", icon="warning-sign")]
+
+            try:
+                regex = re.compile(pattern)
+            except re.error as e:
+                return no_update, [dbpc.Toast(message=f"잘못된 정규식입니다: {str(e)}", intent="warning", icon="warning-sign")]
+
+            matched = 0
+            for row in row_data:
+                new_name = regex.sub(replacement or "", row["current"])
+                if new_name != row["current"]:
+                    row["new"] = new_name
+                    matched += 1
+
+            return row_data, [dbpc.Toast(message=f"{matched}개 컬럼명에 패턴이 적용되었습니다. Apply를 눌러 확정하세요.", intent="primary", icon="info-sign", timeout=3000)]
+
         @app.callback(
             Output("toaster", "toasts", allow_duplicate=True),
             Output("aggrid-table", "columnDefs", allow_duplicate=True),
+            Output("rename-headers-grid", "rowData", allow_duplicate=True),
             Input("rename-headers-apply-btn", "n_clicks"),
-            State({"type": "rename-header-input", "column": ALL}, "id"),
-            State({"type": "rename-header-input", "column": ALL}, "value"),
+            State("rename-headers-grid", "rowData"),
+            State("aggrid-table", "columnDefs"),
             prevent_initial_call=True
         )
-        def apply_header_changes(n_clicks, input_ids, input_values):
-            """헤더 이름 변경 적용"""
+        def apply_header_changes(n_clicks, row_data, columnDefs):
+            """헤더 이름 변경 적용 - 한 번의 rename과 columnDefs 패치로 처리"""
             if not n_clicks:
                 raise exceptions.PreventUpdate
                 
             # 입력 값이 없는 경우
-            if not input_ids or not input_values:
-                return [dbpc.Toast(message=f"변경할 컬럼이 선택되지 않았습니다.", intent="warning", icon="warning-sign")], no_update
+            if not row_data:
+                return [dbpc.Toast(message=f"변경할 컬럼이 선택되지 않았습니다.", intent="warning", icon="warning-sign")], no_update, no_update
                 
             try:
                 # 키-값 매핑 생성
                 column_mapping = {}
-                for i, input_id in enumerate(input_ids):
-                    original_name = input_id.get("column")
-                    new_name = input_values[i].strip() if input_values[i] else ""
+                for row in row_data:
+                    original_name = row.get("current")
+                    new_name = row["new"].strip() if row.get("new") else ""
                     
                     # 새 이름이 입력된 경우만 처리
                     if new_name and new_name != original_name:
                         # 이름 유효성 검사 (영문자, 숫자, 언더스코어만 허용)
-                        import re
                         if not re.match(r"^[a-zA-Z0-9_]+$", new_name):
                             return [dbpc.Toast(
                                 message=f"컬럼명 '{new_name}'은(는) 유효하지 않습니다. 영문자, 숫자, 언더스코어(_)만 사용 가능합니다.",
                                 intent="warning",
                                 icon="warning-sign"
-                            )], no_update
-                            
-                        # 이미 존재하는 컬럼명 확인
-                        if new_name in SSDF.dataframe.columns:
-                            return [dbpc.Toast(
-                                message=f"컬럼명 '{new_name}'은(는) 이미 존재합니다. 다른 이름을 사용해주세요.",
-                                intent="warning", 
-                                icon="warning-sign"
-                            )], no_update
-                            
+                            )], no_update, no_update
+
                         # 유효한 매핑 추가
                         column_mapping[original_name] = new_name
+
+                # 변경 후 컬럼명 중복 확인 (변경되지 않는 기존 컬럼 + 새 이름)
+                final_columns = [column_mapping.get(col, col) for col in SSDF.dataframe.columns]
+                duplicated = sorted({col for col, count in Counter(final_columns).items() if count > 1})
+                if duplicated:
+                    return [dbpc.Toast(
+                        message=f"컬럼명 '{', '.join(duplicated)}'이(가) 중복됩니다. 다른 이름을 사용해주세요.",
+                        intent="warning", 
+                        icon="warning-sign"
+                    )], no_update, no_update
                 
                 # 변경할 컬럼이 없는 경우
                 if not column_mapping:
-                    return [dbpc.Toast(message=f"변경할 컬럼명이 없습니다.", intent="warning", icon="warning-sign")], no_update
-                
-                # 데이터프레임 컬럼 이름 변경
-                df = SSDF.dataframe
-                for old_name, new_name in column_mapping.items():
-                    df = df.rename({old_name: new_name})
+                    return [dbpc.Toast(message=f"변경할 컬럼명이 없습니다.", intent="warning", icon="warning-sign")], no_update, no_update
                 
+                # 데이터프레임 컬럼 이름 일괄 변경 (메타데이터만 변경)
+                df = SSDF.dataframe.rename(column_mapping)
+                EDIT_HISTORY.record_rename("Rename Headers", column_mapping)
                 SSDF.dataframe = df
                 
-                # 컬럼 정의 업데이트
-                updated_columnDefs = generate_column_definitions(df)
+                # 변경된 컬럼 정의만 패치
+                patched_columnDefs = Patch()
+                for i, col in enumerate(columnDefs):
+                    new_name = column_mapping.get(col.get("field"))
+                    if new_name:
+                        patched_columnDefs[i]["field"] = new_name
+                        patched_columnDefs[i]["headerName"] = new_name
                 
                 # 성공 메시지
                 changed_count = len(column_mapping)
-                column_list = ", ".join([f"'{old}' → '{new}'" for old, new in column_mapping.items()])
+                column_list = ", ".join([f"'{old}' → '{new}'" for old, new in list(column_mapping.items())[:10]])
+                if changed_count > 10:
+                    column_list += f" 외 {changed_count - 10}개"
                 
                 return [dbpc.Toast(
                     message=f"{changed_count}개 컬럼명 변경 완료: {column_list}",
                     intent="success", 
                     icon="endorsed",
                     timeout=4000
-                )], updated_columnDefs
+                )], patched_columnDefs, [{"current": column_mapping.get(row["current"], row["current"]), "new": ""} for row in row_data]
                 
             except Exception as e:
                 # 오류 처리
                 logger.error(f"컬럼명 변경 오류: {str(e)}")
-                return [dbpc.Toast(message=f"컬럼명 변경 오류: {str(e)}", intent="danger", icon="error")], no_update
\ No newline at end of file
+                return [dbpc.Toast(message=f"컬럼명 변경 오류: {str(e)}", intent="danger", icon="error")], no_update, no_update
\ No newline at end of file
@@ -5,8 +5,9 @@ from dash import Output, Input, State, Patch, html, no_update, exceptions, ctx,
 
 from utils.data_processing import displaying_df
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
 from utils.logging_utils import logger
-from components.grid.dag.column_definitions import generate_column_definitions
+from components.grid.dag.column_definitions import patch_column_definitions
 from components.menu.edit.utils import handle_tab_button_click
 
 class SplitColumn:
@@ -384,10 +385,11 @@ class SplitColumn:
                 State("split-column-keep-original", "checked"),
                 State("split-column-skip-empty", "checked")
             ],
+            State("aggrid-table", "columnDefs"),
             prevent_initial_call=True
         )
         def apply_split_column(n_clicks, source_column, delimiter_select, custom_delimiter, 
-                            naming_method, custom_names, keep_original, skip_empty):
+                            naming_method, custom_names, keep_original, skip_empty, columnDefs):
             """분할 적용"""
             if not n_clicks or not source_column:
                 raise exceptions.PreventUpdate
@@ -479,8 +481,9 @@ class SplitColumn:
                     df = df.drop(source_column)
                 
                 # 성공 메시지 및 변경된 데이터프레임 반영
+                EDIT_HISTORY.record("Split Column", [source_column] + column_names)
                 SSDF.dataframe = df
-                updated_columnDefs = generate_column_definitions(df)
+                updated_columnDefs = patch_column_definitions(df, columnDefs)
                 
                 # 구분자 표시 생성
                 delimiter_display = actual_delimiter.replace("\t", "\\t").replace(" ", "공백")
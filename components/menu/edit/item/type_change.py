@@ -5,8 +5,10 @@ from dash import Output, Input, State, Patch, html, no_update, exceptions, ctx,
 
 from utils.data_processing import displaying_df
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
+from utils.column_profile import COLUMN_PROFILES
 from utils.logging_utils import logger
-from components.grid.dag.column_definitions import generate_column_definitions, SYSTEM_COLUMNS
+from components.grid.dag.column_definitions import patch_column_definitions, SYSTEM_COLUMNS
 from components.menu.edit.utils import handle_tab_button_click
 
 class TypeChanges:
@@ -267,13 +269,14 @@ class TypeChanges:
             if not selected_columns:
                 return dmc.Text("컬럼을 선택하세요", size="sm", c="dimmed")
 
-            df = SSDF.dataframe
+            profiles = COLUMN_PROFILES.get(selected_columns)
             info_components = []
 
             for col in selected_columns:
                 try:
-                    # 컬럼 데이터 타입 확인
-                    dtype = df[col].dtype
+                    # 캐시된 컬럼 프로파일 사용 (전체 컬럼을 한 번에 계산)
+                    profile = profiles[col]
+                    dtype = profile["dtype"]
 
                     # 사람이 읽기 쉬운 타입명 생성
                     readable_type = "알 수 없음"
@@ -310,24 +313,24 @@ class TypeChanges:
                         type_icon = "⏰"
 
                     # 샘플 값 표시 (최대 1개)
-                    sample_values = []
-                    sample = df[col].drop_nulls().head(1)
-                    
-                    if len(sample) > 0:
-                        sample_values.append(str(sample[0]))
-                    
-                    sample_text = ", ".join(sample_values) if sample_values else "값 없음"
+                    sample_text = profile["sample"] if profile["sample"] is not None else "값 없음"
                         
-                    # 고유값 개수 계산 (최대 1000개 샘플에서)
-                    sample_size = min(1000, df.height)
-                    sample_df = df.slice(0, sample_size)
-                    unique_count = len(sample_df[col].unique())
+                    # 고유값 개수 (최대 1000개 샘플에서)
+                    unique_count = profile["sample_unique"]
                     
-                    # Null 값 정보 (최대 1000개 샘플에서)
-                    null_count = sample_df[col].null_count()
-                    total_count = len(sample_df)
+                    # Null 값 정보
+                    null_count = profile["null_count"]
+                    total_count = profile["total_count"]
                     null_percent = (null_count / total_count * 100) if total_count > 0 else 0
 
+                    # 문자열 컬럼의 숫자 변환 가능 비율
+                    summary_texts = [
+                        dmc.Text(f"Null 값: {null_count}/{total_count} ({null_percent:.1f}%)", size="xs"),
+                        dmc.Text(f"고유값: {unique_count}개", size="xs"),
+                    ]
+                    if profile["numeric_ratio"] is not None:
+                        summary_texts.append(dmc.Text(f"숫자 변환 가능: {profile['numeric_ratio'] * 100:.1f}%", size="xs"))
+
                     # 컬럼 정보 컴포넌트 생성
                     info_component = dmc.Paper(
                         withBorder=True, 
@@ -348,10 +351,7 @@ class TypeChanges:
                             dmc.SimpleGrid(
                                 cols=2,
                                 spacing="xs",
-                                children=[
-                                    dmc.Text(f"Null 값: {null_count}/{total_count} ({null_percent:.1f}%)", size="xs"),
-                                    dmc.Text(f"고유값: {unique_count}개", size="xs"),
-                                ]
+                                children=summary_texts
                             ),
                             
                             # 샘플 값 표시
@@ -645,10 +645,11 @@ class TypeChanges:
             State("type-changes-conversion-option", "value"), 
             State("type-changes-fail-option", "value"), 
             State("type-changes-default-value", "value")],
+            State("aggrid-table", "columnDefs"),
             prevent_initial_call=True
         )
         def apply_type_changes(n_clicks, selected_columns, target_type, conversion_option, 
-                            fail_option, default_value):
+                            fail_option, default_value, columnDefs):
             """타입 변환 적용 - 최적화"""
             if not n_clicks or not selected_columns or not target_type:
                 raise exceptions.PreventUpdate
@@ -741,8 +742,10 @@ class TypeChanges:
                     
                     if successful_columns:
                         # 일부 컬럼만 성공한 경우
+                        EDIT_HISTORY.record("Type Change", successful_columns)
                         SSDF.dataframe = df
-                        updated_columnDefs = generate_column_definitions(df)
+                        COLUMN_PROFILES.invalidate(successful_columns)
+                        updated_columnDefs = patch_column_definitions(df, columnDefs)
                         return ([dbpc.Toast(message=f"{len(successful_columns)}개 컬럼 변환 성공, {len(failed_columns)}개 실패\n{error_messages}", 
                                         intent="warning", icon="warning-sign", timeout=4000)], 
                             updated_columnDefs, False, [])  # 컬럼 선택 초기화
@@ -753,8 +756,10 @@ class TypeChanges:
                             no_update, False, no_update)  # 컬럼 선택 유지
                 
                 # 모든 컬럼 변환 성공
+                EDIT_HISTORY.record("Type Change", successful_columns)
                 SSDF.dataframe = df
-                updated_columnDefs = generate_column_definitions(df)
+                COLUMN_PROFILES.invalidate(successful_columns)
+                updated_columnDefs = patch_column_definitions(df, columnDefs)
                 
                 # 변환 타입 이름
                 target_type_name = {
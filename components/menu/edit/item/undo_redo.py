@@ -0,0 +1,51 @@
+import dash_mantine_components as dmc
+import dash_blueprint_components as dbpc
+from dash import Output, Input, State, no_update, exceptions, ctx
+
+from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
+from utils.column_profile import COLUMN_PROFILES
+from utils.logging_utils import logger
+from components.grid.dag.column_definitions import patch_column_definitions
+
+
+class UndoRedo:
+    def button_layout(self):
+        return dmc.Group([
+            dbpc.Button("Undo", id="edit-undo-btn", icon="undo", minimal=True, outlined=True),
+            dbpc.Button("Redo", id="edit-redo-btn", icon="redo", minimal=True, outlined=True),
+        ], gap=2)
+
+    def register_callbacks(self, app):
+        """콜백 함수 등록"""
+
+        @app.callback(
+            Output("toaster", "toasts", allow_duplicate=True),
+            Output("aggrid-table", "columnDefs", allow_duplicate=True),
+            Input("edit-undo-btn", "n_clicks"),
+            Input("edit-redo-btn", "n_clicks"),
+            State("aggrid-table", "columnDefs"),
+            prevent_initial_call=True
+        )
+        def handle_undo_redo(undo_clicks, redo_clicks, columnDefs):
+            """편집 이력 되돌리기/다시 실행"""
+            if not undo_clicks and not redo_clicks:
+                raise exceptions.PreventUpdate
+
+            is_undo = ctx.triggered_id == "edit-undo-btn"
+            action = "Undo" if is_undo else "Redo"
+
+            try:
+                entry = EDIT_HISTORY.undo() if is_undo else EDIT_HISTORY.redo()
+                if entry is None:
+                    return [dbpc.Toast(message=f"{action}할 작업이 없습니다", intent="warning", icon="warning-sign")], no_update
+
+                COLUMN_PROFILES.invalidate(entry["columns"] + list(entry.get("renames", {})))
+                return (
+                    [dbpc.Toast(message=f"{action}: {entry['label']} ({', '.join(entry['columns'])})", intent="success", icon="endorsed", timeout=3000)],
+                    patch_column_definitions(SSDF.dataframe, columnDefs),
+                )
+
+            except Exception as e:
+                logger.error(f"{action} 실패: {str(e)}")
+                return [dbpc.Toast(message=f"{action} 실패: {str(e)}", intent="danger", icon="error")], no_update
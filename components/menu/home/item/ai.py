@@ -4,6 +4,7 @@ import dash_mantine_components as dmc
 import dash_blueprint_components as dbpc
 from dash import Output, Input, State, Patch, html, dcc, no_update, exceptions, ctx, callback, ALL, DiskcacheManager, background_callback
 import dash_ag_grid as dag
+from dash.development.base_component import Component
 import base64
 import io
 import matplotlib.pyplot as plt
@@ -12,7 +13,9 @@ import uuid
 import os
 
 
-from utils.data_processing import displaying_df
+from utils.llm_context import CONTEXT_BUILDER, view_key, analysis_frame, build_messages, extract_code, run_analysis_code
+from utils.llm_stream import LLM_STREAM
+from utils.llm_cache import ANSWER_CACHE, schema_fingerprint
 from utils.db_management import SSDF
 from utils.logging_utils import logger
 from components.menu.edit.utils import handle_tab_button_click
@@ -28,10 +31,13 @@ class LLMAnalysis:
         ]
         self.default_model = "deepseek-ai/DeepSeek-R1-Distill-Qwen-32B"
         
-        # LLM 및 Agent 객체 초기화 (실제 연결은 나중에)
+        # 모델 및 세션 상태 (실제 연결은 나중에)
         self.llm_model = None
-        self.agent = None
-        self.pandas_df = None  # Pandas DataFrame 저장 변수 추가
+        self.context_key = None  # 데이터 요약을 만든 (데이터 버전, 보기 설정)
+        self.history = []  # 이전 질문/답변 (최근 memory_size개 유지)
+        self.memory_size = 10
+        self.last_answer = None  # Explain용 마지막 답변 {"prompt", "answer", "code"}
+        self.pending_views = {}  # 스트리밍 중인 요청별 (질문 시점의 보기 키, lazy plan) - 답변 코드는 이 plan에서 실행
         self.session_id = None
         
         # 기능 플래그
@@ -169,6 +175,8 @@ class LLMAnalysis:
                 dcc.Store(id="llm-current-model", data=self.default_model),
                 dcc.Store(id="llm-can-explain", data=False),
                 dcc.Store(id="llm-initialize", data=None),
+                dcc.Store(id="llm-stream-job", data=None),
+                dcc.Interval(id="llm-stream-interval", interval=300, disabled=True),
                 
                 # 도움말 섹션
                 dmc.Space(h=20),
@@ -197,45 +205,27 @@ class LLMAnalysis:
         )
 
     def initialize_system(self, model_name=None):
-        """LLM 및 Agent 초기화 (메인 스레드에서 호출)"""
+        """모델 선택 및 데이터 요약 준비 (메인 스레드에서 호출)"""
         try:
             # 모델 이름이 지정되지 않으면 현재 설정된 모델 사용
-            model_name = model_name or self.default_model
-            
-            # LLM 모델 초기화
-            logger.info(f"Initializing LLM model: {model_name}")
-            from pandasai.llm.local_llm import LocalLLM
-            self.llm_model = LocalLLM(
-                api_base=self.api_base,
-                model=model_name
-            )
-            logger.info("LLM model initialized successfully")
-            
-            # 필터링된 데이터프레임 가져오기
-            df = displaying_df(filtred_apply=True)
-            
-            if df is None or df.is_empty():
+            self.llm_model = model_name or self.default_model
+            logger.info(f"Initializing LLM model: {self.llm_model}")
+
+            # 데이터 전체 대신 요약(스키마/통계)만 프롬프트에 사용 - 같은 데이터/필터면 캐시 재사용
+            lf = analysis_frame()
+            if lf is None:
                 logger.warning("No data available for analysis")
                 self.is_initialized = True
                 self.is_session_active = False
                 return False, "No data available for analysis"
-            
-            # Polars DataFrame을 Pandas DataFrame으로 변환 (메인 스레드에서)
-            logger.info("Converting Polars DataFrame to Pandas DataFrame")
-            self.pandas_df = df.to_pandas()
-            
+            self.context_key = view_key()
+            CONTEXT_BUILDER.context(self.context_key, lf)
+
             # 세션 ID 생성
             self.session_id = str(uuid.uuid4())
-            
-            # Agent 생성 (메인 스레드에서)
-            logger.info("Creating Agent with LLM model")
-            from pandasai import Agent
-            self.agent = Agent(
-                [self.pandas_df], 
-                config={"llm": self.llm_model},
-                memory_size=10  # 대화 내역 유지 크기 
-            )
-            
+            self.history = []
+            self.last_answer = None
+
             self.is_initialized = True
             self.is_session_active = True
             return True, "System initialized successfully"
@@ -247,47 +237,72 @@ class LLMAnalysis:
             return False, str(e)
 
     def refresh_data(self):
-        """데이터 갱신 (필요할 때 호출)"""
+        """데이터 갱신 (필요할 때 호출) - 데이터/필터가 바뀐 경우에만 요약을 다시 계산"""
         try:
-            # 현재 LLM이 초기화되어 있지 않으면 먼저 초기화
             if not self.is_initialized or self.llm_model is None:
                 return False, "LLM not initialized"
-                
-            # 필터링된 데이터프레임 가져오기
-            df = displaying_df(filtred_apply=True)
-            
-            if df is None or df.is_empty():
+
+            lf = analysis_frame()
+            if lf is None:
                 return False, "No data available"
-            
-            # Polars DataFrame을 Pandas DataFrame으로 변환
-            self.pandas_df = df.to_pandas()
-            
-            # 기존 Agent가 있으면 데이터만 업데이트
-            if self.agent is not None:
-                # 현재 Agent 인스턴스는 데이터 업데이트를 지원하지 않으므로
-                # 새 Agent를 생성하고 기존 세션 ID 유지
-                self.agent = Agent(
-                    [self.pandas_df], 
-                    config={"llm": self.llm_model},
-                    memory_size=10
-                )
-                self.is_session_active = True
-                return True, "Data refreshed successfully"
-            else:
-                # Agent가 없으면 새로 생성
-                self.session_id = str(uuid.uuid4())
-                self.agent = Agent(
-                    [self.pandas_df], 
-                    config={"llm": self.llm_model},
-                    memory_size=10
-                )
-                self.is_session_active = True
-                return True, "New agent created with refreshed data"
+
+            key = view_key()
+            self.is_session_active = True
+            if key == self.context_key:
+                return True, "Data unchanged"
+            self.context_key = key
+            CONTEXT_BUILDER.context(key, lf)
+            return True, "Data refreshed successfully"
                 
         except Exception as e:
             logger.error(f"Failed to refresh data: {str(e)}")
             return False, str(e)
 
+    def start_analysis(self, prompt):
+        """데이터 요약으로 LLM 스트리밍 요청 시작 - (job id, 답변 캐시 키, 캐시된 답변, 질문 시점의 (보기 키, lazy plan)) 반환
+
+        같은 질문/스키마/모델의 답변이 캐시에 있으면 요청하지 않고 캐시된 답변을 반환합니다 (job id는 None).
+        """
+        lf = analysis_frame()
+        if lf is None:
+            return None, None, None, None
+        view = (view_key(), lf)
+        cache_key = ANSWER_CACHE.key(prompt, self.history, schema_fingerprint(lf), self.llm_model)
+        cached = ANSWER_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info(f"AI answer cache hit: {prompt}")
+            return None, cache_key, cached["answer"], view
+
+        self.context_key = view[0]
+        context = CONTEXT_BUILDER.context(self.context_key, lf)
+        job_id = LLM_STREAM.start(self.api_base, self.llm_model, build_messages(context, prompt, self.history))
+        self.pending_views[job_id] = view
+        while len(self.pending_views) > 10:
+            self.pending_views.pop(next(iter(self.pending_views)))
+        return job_id, cache_key, None, view
+
+    def finish_analysis(self, prompt, answer, cache_key=None, cached=False, view=None):
+        """받은 답변을 대화 내역에 추가하고, 답변의 코드를 질문 시점 보기(view)의 lazy plan에서 실행한 결과 반환
+
+        답변을 받는 동안 필터/데이터가 바뀌었으면 결과 위에 그 사실을 표시합니다.
+        새 답변은 코드가 정상 실행된 경우에만 답변 캐시에 저장합니다.
+        """
+        code = extract_code(answer)
+        self.last_answer = {"prompt": prompt, "answer": answer, "code": code}
+        self.history = (self.history + [{"role": "user", "content": prompt}, {"role": "assistant", "content": answer}])[-2 * self.memory_size :]
+        if code is None:
+            return answer
+        if view is None:
+            return "The data view this question was asked on is no longer available. Please ask again."
+        key, lf = view
+        result = run_analysis_code(code, lf, key)
+        if cache_key and not cached:
+            ANSWER_CACHE.set(cache_key, answer, code)
+        if key != view_key():
+            notice = dmc.Text("The data view changed while the answer was generated. Results are for the view at the time of the question.", size="xs", c="orange", mb="xs")
+            return html.Div([notice, self._format_assistant_response(result)])
+        return result
+
     def _format_chat_message(self, role, content, timestamp=None, is_explain=False):
         """채팅 메시지 포맷 생성"""
         timestamp = timestamp or datetime.now().strftime("%H:%M:%S")
@@ -338,6 +353,8 @@ class LLMAnalysis:
     
     def _format_assistant_response(self, content):
         """AI 응답 내용 포맷팅 (타입에 따라 다르게 표시)"""
+        if isinstance(content, pl.DataFrame):
+            content = content.to_pandas()
         if isinstance(content, pd.DataFrame):
             # DataFrame 응답
             return html.Div([
@@ -380,6 +397,10 @@ class LLMAnalysis:
                 logger.error(f"Failed to display plot: {str(e)}")
                 return dmc.Text(f"Failed to display chart: {str(e)}")
         
+        elif isinstance(content, Component):
+            # 이미 구성된 컴포넌트 (설명 + 코드)
+            return content
+
         else:
             # 텍스트 응답 (기본)
             return dmc.Text(str(content) if content else "No result returned.")
@@ -399,7 +420,7 @@ class LLMAnalysis:
             """LLM 버튼 클릭 시 우측 패널에 탭 추가 및 LLM 초기화"""
             model_update, toaster_update = handle_tab_button_click(n_clicks, current_model, "llm-tab", "AI Analysis")
             
-            # 탭이 추가되면 LLM 및 Agent 초기화 트리거
+            # 탭이 추가되면 LLM 및 데이터 요약 초기화 트리거
             # 실제 초기화는 다음 콜백에서 수행
             return model_update, toaster_update, n_clicks
             
@@ -411,11 +432,11 @@ class LLMAnalysis:
             prevent_initial_call=True
         )
         def initialize_on_tab_open(trigger, current_model):
-            """탭이 열릴 때 LLM 및 Agent 초기화"""
+            """탭이 열릴 때 LLM 및 데이터 요약 초기화"""
             if trigger is None:
                 raise exceptions.PreventUpdate
                 
-            # LLM 및 Agent 초기화 (메인 스레드에서)
+            # LLM 및 데이터 요약 초기화 (메인 스레드에서)
             success, message = self.initialize_system(current_model)
             
             if success:
@@ -549,7 +570,7 @@ class LLMAnalysis:
         def reset_session(n_clicks, current_model):
             """세션 초기화"""
             if n_clicks:
-                # 세션 관련 변수 초기화하고 새로운 Agent 생성
+                # 세션 관련 변수(대화 내역) 초기화
                 success, message = self.initialize_system(current_model)
                 
                 if success:
@@ -585,30 +606,25 @@ class LLMAnalysis:
                 return "", [], True, False
             raise exceptions.PreventUpdate
         
-        # 백그라운드 콜백으로 메인 AI 분석 실행
-        @callback(
-            output=[
-                Output("llm-chat-history-container", "children", allow_duplicate=True),
-                Output("llm-explain-btn", "disabled", allow_duplicate=True),
-                Output("llm-can-explain", "data", allow_duplicate=True)
-            ],
-            inputs=Input("llm-generate-btn", "n_clicks"),
-            state=[
-                State("llm-prompt-input", "value"),
-                State("llm-chat-history-container", "children"),
-            ],
-            background=True,
-            running=[
-                (Output("llm-generate-btn", "loading"), True, False),
-                (Output("llm-cancel-btn", "disabled"), False, True),
-            ],
-            cancel=[Input("llm-cancel-btn", "n_clicks")],
+        # AI 분석 요청 시작 - 답변은 llm-stream-interval 폴링으로 토큰이 도착하는 대로 표시
+        @app.callback(
+            Output("llm-chat-history-container", "children", allow_duplicate=True),
+            Output("llm-explain-btn", "disabled", allow_duplicate=True),
+            Output("llm-can-explain", "data", allow_duplicate=True),
+            Output("llm-stream-job", "data"),
+            Output("llm-stream-interval", "disabled"),
+            Output("llm-generate-btn", "loading"),
+            Output("llm-cancel-btn", "disabled"),
+            Input("llm-generate-btn", "n_clicks"),
+            State("llm-prompt-input", "value"),
+            State("llm-chat-history-container", "children"),
+            State("llm-stream-job", "data"),
             prevent_initial_call=True,
         )
-        def generate_analysis(n_clicks, prompt, chat_history):
-            """LLM 분석 생성 실행 (백그라운드)"""
-            if not n_clicks or not prompt:
-                return no_update, no_update, no_update
+        def generate_analysis(n_clicks, prompt, chat_history, stream_job):
+            """LLM 분석 요청 시작"""
+            if not n_clicks or not prompt or stream_job:
+                raise exceptions.PreventUpdate
             
             # 현재 타임스탬프
             current_time = datetime.now().strftime("%H:%M:%S")
@@ -619,40 +635,98 @@ class LLMAnalysis:
             
             try:
                 # 시스템이 초기화되었는지 확인
-                if not self.is_initialized or self.agent is None:
+                if not self.is_initialized or not self.is_session_active:
                     error_message = self._format_chat_message(
                         "assistant", 
                         "System not initialized. Please try resetting the session.", 
                         current_time
                     )
-                    return updated_chat + [error_message], True, False
+                    return updated_chat + [error_message], True, False, None, True, False, True
                 
-                # AI 응답 생성
                 logger.info(f"Running analysis with prompt: {prompt}")
-                result = self.agent.chat(prompt)
-                logger.info(f"Analysis completed, result type: {type(result)}")
-                
-                # AI 응답 메시지 추가
-                assistant_message = self._format_chat_message("assistant", result, current_time)
-                final_chat = updated_chat + [assistant_message]
+                job_id, cache_key, cached_answer, view = self.start_analysis(prompt)
+                if cached_answer is not None:
+                    # 캐시된 답변의 코드를 현재 데이터에 다시 실행 (모델 호출 없음)
+                    result = self.finish_analysis(prompt, cached_answer, cache_key, cached=True, view=view)
+                    assistant_message = self._format_chat_message("assistant", result, current_time)
+                    return updated_chat + [assistant_message], False, True, None, True, False, True
+                if job_id is None:
+                    error_message = self._format_chat_message("assistant", "No data available for analysis", current_time)
+                    return updated_chat + [error_message], True, False, None, True, False, True
 
-                # 결과 반환 (설명 버튼 활성화)
-                return final_chat, False, True
+                # 답변 자리 표시 후 폴링 시작
+                pending_message = self._format_chat_message("assistant", "...", current_time)
+                stream_job = {"id": job_id, "prompt": prompt, "time": current_time, "cache_key": cache_key}
+                return updated_chat + [pending_message], True, False, stream_job, False, True, False
                 
             except Exception as e:
                 logger.error(f"Analysis failed: {str(e)}")
-                
-                # 오류 메시지 추가
                 error_message = self._format_chat_message(
                     "assistant", 
                     f"Error during analysis: {str(e)}", 
                     current_time
                 )
-                
-                # 세션을 유지하도록 변경 (오류가 있어도 재설정 안 함)
-                # 필요시 사용자가 Reset Session 버튼을 통해 직접 초기화 가능
+                return updated_chat + [error_message], True, False, None, True, False, True
+
+        @app.callback(
+            Output("llm-chat-history-container", "children", allow_duplicate=True),
+            Output("llm-explain-btn", "disabled", allow_duplicate=True),
+            Output("llm-can-explain", "data", allow_duplicate=True),
+            Output("llm-stream-job", "data", allow_duplicate=True),
+            Output("llm-stream-interval", "disabled", allow_duplicate=True),
+            Output("llm-generate-btn", "loading", allow_duplicate=True),
+            Output("llm-cancel-btn", "disabled", allow_duplicate=True),
+            Input("llm-stream-interval", "n_intervals"),
+            State("llm-stream-job", "data"),
+            State("llm-chat-history-container", "children"),
+            prevent_initial_call=True,
+        )
+        def poll_analysis(n_intervals, stream_job, chat_history):
+            """도착한 토큰까지의 답변 표시, 완료되면 답변의 코드를 실행해 최종 결과 표시"""
+            if not stream_job:
+                return no_update, no_update, no_update, None, True, False, True
+            status = LLM_STREAM.status(stream_job["id"])
+            if status is None:
+                self.pending_views.pop(stream_job["id"], None)
+                return no_update, no_update, no_update, None, True, False, True
+
+            current_time = stream_job["time"]
+            if status["state"] == "running":
+                partial_message = self._format_chat_message("assistant", f"{status['text']} ▌", current_time)
+                return chat_history[:-1] + [partial_message], no_update, no_update, no_update, no_update, no_update, no_update
+
+            can_explain = False
+            view = self.pending_views.pop(stream_job["id"], None)
+            if status["state"] == "done":
+                try:
+                    result = self.finish_analysis(stream_job["prompt"], status["text"], stream_job.get("cache_key"), view=view)
+                    logger.info(f"Analysis completed, result type: {type(result)}")
+                    can_explain = True
+                except Exception as e:
+                    logger.error(f"Analysis failed: {str(e)}")
+                    result = f"Error during analysis: {str(e)}"
+            elif status["state"] == "cancelled":
+                result = f"{status['text']}\n(Request cancelled)"
+            else:
+                result = f"Error during analysis: {status['error']}"
+
+            # 세션을 유지하도록 변경 (오류가 있어도 재설정 안 함)
+            # 필요시 사용자가 Reset Session 버튼을 통해 직접 초기화 가능
+            final_message = self._format_chat_message("assistant", result, current_time)
+            return chat_history[:-1] + [final_message], not can_explain, can_explain, None, True, False, True
 
-                return updated_chat + [error_message], True, False
+        @app.callback(
+            Output("llm-cancel-btn", "disabled", allow_duplicate=True),
+            Input("llm-cancel-btn", "n_clicks"),
+            State("llm-stream-job", "data"),
+            prevent_initial_call=True,
+        )
+        def cancel_analysis(n_clicks, stream_job):
+            """진행 중인 LLM 요청의 연결을 닫아 중단 (최종 표시는 poll_analysis에서)"""
+            if not n_clicks or not stream_job:
+                raise exceptions.PreventUpdate
+            LLM_STREAM.cancel(stream_job["id"])
+            return True
         
         # 입력 후 입력창 초기화
         @app.callback(
@@ -668,39 +742,30 @@ class LLMAnalysis:
             raise exceptions.PreventUpdate
             
         # 설명 요청 처리
-        @callback(
-            output=Output("llm-chat-history-container", "children", allow_duplicate=True),
-            inputs=Input("llm-explain-btn", "n_clicks"),
-            state=[
-                State("llm-chat-history-container", "children"),
-                State("llm-can-explain", "data")
-            ],
-            background=True,
-            running=[
-                (Output("llm-explain-btn", "loading"), True, False),
-                (Output("llm-cancel-btn", "disabled"), False, True),
-            ],
-            cancel=[Input("llm-cancel-btn", "n_clicks")],
+        @app.callback(
+            Output("llm-chat-history-container", "children", allow_duplicate=True),
+            Input("llm-explain-btn", "n_clicks"),
+            State("llm-chat-history-container", "children"),
+            State("llm-can-explain", "data"),
             prevent_initial_call=True,
         )
         def explain_analysis(n_clicks, chat_history, can_explain):
             """분석 결과 설명 가져오기"""
-            if not n_clicks or not can_explain or self.agent is None:
+            if not n_clicks or not can_explain or self.last_answer is None:
                 return no_update
             
             # 현재 타임스탬프
             current_time = datetime.now().strftime("%H:%M:%S")
             
             try:
-                # 설명 요청
-                logger.info("Requesting explanation from Agent")
-                explanation = self.agent.explain()
-                logger.info("Explanation received")
-                
-                # 설명 메시지 추가
+                # 마지막 답변의 설명과 실행한 코드 표시 (추가 모델 호출 없음)
+                answer = self.last_answer["answer"]
+                explanation = [dmc.Text(answer.split("```")[0].strip() or "No explanation returned.")]
+                if self.last_answer["code"]:
+                    explanation.append(dmc.Code(self.last_answer["code"], block=True, mt="xs"))
                 explanation_message = self._format_chat_message(
                     "assistant", 
-                    explanation, 
+                    html.Div(explanation), 
                     current_time,
                     is_explain=True
                 )
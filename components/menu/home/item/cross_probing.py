@@ -1,10 +1,11 @@
 import re
-import socket
 import polars as pl
 import dash_mantine_components as dmc
 import dash_blueprint_components as dbpc
 from dash import Input, Output, State, no_update
 from utils.db_management import SSDF
+from utils.config import CONFIG
+from utils.cp_client import CrossProbeClient
 from utils.logging_utils import logger
 
 
@@ -12,20 +13,10 @@ class CrossProber:
 
     def __init__(self):
         self.CP = SSDF.cp
-        self.CP_socket = self.create_connection() if all(self.CP.values()) else False
+        self.CP_client = CrossProbeClient(self.CP["host"], self.CP["port"]) if all(self.CP.values()) else None
         self.current_view = ""
         self.history = []
-
-    def create_connection(self):
-        try:
-            client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            client_socket.settimeout(5)
-            client_socket.connect((self.CP["host"], self.CP["port"]))
-            logger.info("Successfully connected to CP server.")
-            return client_socket
-        except (socket.error, socket.timeout) as e:
-            logger.error(f"Failed to connect to CP server: {e}")
-            return False
+        self.hier_cache = {}
 
     def cp_connected_layout(self):
         return dmc.Group(
@@ -81,37 +72,68 @@ class CrossProber:
 
     def layout(self):
         return dbpc.FormGroup(
-            children=(self.cp_connected_layout() if self.CP_socket else self.cp_disconnected_layout()),
+            children=(self.cp_connected_layout() if self.CP_client else self.cp_disconnected_layout()),
             label=dmc.Text("CrossProbe: ", fw=500, size="sm", c="gray"),
             inline=True,
         )
 
-    def send_cp_message(self, message):
+    def send_cp_message(self, messages, coalesce=True):
         # Usage:
         # select -obj inst -hier top1.top2.top3 -name object_names
         # pushDesign -top true -hier top1.path1.path2
         # selectCurObject -obj net(or inst) -name object_names
-        try:
-            self.CP_socket.sendall(message.encode())
-            logger.info(f"CP message: {message}")
+        # 전송은 CP_client의 송신 스레드가 수행 - 콜백은 큐에 넣고 바로 반환
+        if isinstance(messages, str):
+            messages = [messages]
+        if not isinstance(messages, list) or not all(isinstance(message, str) for message in messages):
+            return messages
+        self.CP_client.send(messages, coalesce=coalesce)
+        summary = messages[0].strip()[:300] + (f" ... ({len(messages)} commands)" if len(messages) > 1 else "")
+        if self.CP_client.connected:
             return [
                 dbpc.Toast(
-                    message=f"CP command: {message}",
+                    message=f"CP command: {summary}",
                     intent="success",
                     icon="send-message",
                 )
             ]
-
-        except Exception as e:
-            logger.error(f"Failed to send message: {e}")
-            return [dbpc.Toast(message=f"{str(e)}", intent="danger", icon="error")]
+        return [
+            dbpc.Toast(
+                message=f"CP server disconnected, reconnecting... (queued: {summary})",
+                intent="warning",
+                icon="warning-sign",
+            )
+        ]
+
+    def select_messages(self, command, names):
+        """'-name' 앞부분(command)과 이름 목록으로 CONFIG.CP_MAX_MESSAGE_BYTES 이하의 명령 목록 생성
+
+        첫 명령은 선택을 교체하고, 이후 명령은 CONFIG.CP_APPEND_OPTION을 붙여 기존 선택에 추가합니다.
+        송신 스레드가 순서대로 보내므로 큰 그룹도 앞쪽 이름부터 바로 선택됩니다.
+        """
+        names = list(dict.fromkeys(name for name in names if name))
+        if not CONFIG.CP_APPEND_OPTION:
+            return [f"{command} -name {','.join(names)}\n"]
+
+        # 추가 옵션이 붙는 뒤쪽 명령 기준으로 이름에 쓸 수 있는 바이트 계산
+        budget = CONFIG.CP_MAX_MESSAGE_BYTES - len(f"{command} {CONFIG.CP_APPEND_OPTION} -name \n".encode())
+        chunks, chunk, size = [], [], 0
+        for name in names:
+            name_size = len(name.encode()) + 1
+            if chunk and size + name_size > budget:
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(name)
+            size += name_size
+        if chunk:
+            chunks.append(chunk)
+        messages = [f"{command} -name {','.join(chunks[0])}\n"] if chunks else []
+        messages += [f"{command} {CONFIG.CP_APPEND_OPTION} -name {','.join(chunk)}\n" for chunk in chunks[1:]]
+        return messages
 
     def close_connection(self):
-        if self.CP_socket:
-            try:
-                self.CP_socket.close()
-            except Exception as e:
-                logger.error(f"Error closing connection: {e}")
+        if self.CP_client:
+            self.CP_client.close()
 
     def remove_initial_x(self, s):
         s = re.sub(r"^[xX]{2}(?!or)", "x", s, flags=re.IGNORECASE)
@@ -148,6 +170,37 @@ class CrossProber:
                 selected_name = selected_name[1:]
         return selected_name
 
+    def remove_initial_x_expr(self, expr):
+        """remove_initial_x의 polars 표현식 버전 (Rust regex는 lookahead를 지원하지 않아 조건으로 분리)"""
+        return (
+            pl.when(expr.str.contains(r"(?i)^xx") & ~expr.str.contains(r"(?i)^xxor"))
+            .then(expr.str.slice(2))
+            .when(expr.str.contains(r"(?i)^x"))
+            .then(expr.str.slice(1))
+            .otherwise(expr)
+        )
+
+    def remove_init_r_m_expr(self, obj, expr):
+        if obj != "inst":
+            return expr
+        return pl.when((expr.str.len_chars() > 1) & expr.str.contains(r"^[rm]")).then(expr.str.slice(1)).otherwise(expr)
+
+    def hierarchy_columns(self, cp_col, obj):
+        """cp_col 전체의 (hier_path, name)을 hier_name/remove_init_r_m과 같은 규칙의 문자열 표현식으로 한 번에 계산
+
+        SSDF.version 단위로 캐시하므로 같은 데이터에서 그룹 CrossProbing을 반복하면 필터 + unique만 수행합니다.
+        """
+        cache_key = (SSDF.version, cp_col, obj)
+        if cache_key not in self.hier_cache:
+            value = pl.col(cp_col).cast(pl.Utf8).fill_null("").str.split("@").list.first().str.replace_all("/", ".", literal=True).str.replace(r"\.main$", "")
+            parts = value.str.split(".").list.eval(self.remove_initial_x_expr(pl.element()))
+            derived = SSDF.dataframe.select(
+                parts.list.slice(0, parts.list.len() - 1).list.join(".").alias("hier_path"),
+                self.remove_init_r_m_expr(obj, parts.list.last()).alias("name"),
+            )
+            self.hier_cache = {cache_key: derived}
+        return self.hier_cache[cache_key]
+
     def preprocess_d_name(obj, name):
         if obj == "inst" and len(name) > 1:
             # 'd'로 시작하지 않으면 원래 이름 반환
@@ -187,30 +240,26 @@ class CrossProber:
 
         # Group CrossProbing
         if groupBy:
-            dff = SSDF.dataframe
-            for gc in groupBy:
-                dff = dff.filter(pl.col(gc) == selected_row[gc])
-
-            names = set([selected_name])
-            for group_value in dff[cp_col]:
-                group_hier_path, group_hier_name = self.hier_name(group_value)
-                if group_hier_path == selected_hier_path:
-                    name = self.remove_init_r_m(obj, group_hier_name)
-                    # name = self.preprocess_d_name(obj, name)
-                    names.add(name)
-
-                elif group_hier_path.startswith(selected_hier_path):
-                    group_hier_path = group_hier_path.replace(selected_hier_path, "")
-                    if len(group_hier_path) and group_hier_path[0] == ".":
-                        name = self.remove_init_r_m(obj, group_hier_path.split(".")[1])
-                        # name = self.preprocess_d_name(obj, name)
-                        names.add(name)
+            dff = pl.concat([SSDF.dataframe.select(groupBy), self.hierarchy_columns(cp_col, obj)], how="horizontal")
+            dff = dff.filter(pl.all_horizontal([pl.col(gc) == selected_row[gc] for gc in groupBy]))
+
+            # 같은 계층의 이름 + 하위 계층은 바로 아래 인스턴스 이름
+            sub_hier_name = pl.col("hier_path").str.slice(len(selected_hier_path) + 1).str.split(".").list.first()
+            group_names = dff.select(
+                pl.when(pl.col("hier_path") == selected_hier_path)
+                .then(pl.col("name"))
+                .when(pl.col("hier_path").str.starts_with(f"{selected_hier_path}."))
+                .then(self.remove_init_r_m_expr(obj, sub_hier_name))
+                .drop_nulls()
+                .unique(maintain_order=True)
+            ).to_series()
+            names = [selected_name, *group_names.to_list()]
 
             if self.current_view == selected_hier_path:
                 # Single Instance CrossProbing
-                msg = f"selectCurObject -obj {obj} -name {','.join(names)}\n"
+                msg = self.select_messages(f"selectCurObject -obj {obj}", names)
             else:
-                msg = f"select -obj {obj} -hier {selected_hier_path} -name {','.join(names)}\n"
+                msg = self.select_messages(f"select -obj {obj} -hier {selected_hier_path}", names)
         else:
             # if save view hierarchy
             if self.current_view == selected_hier_path:
@@ -228,7 +277,7 @@ class CrossProber:
 
     def register_callbacks(self, app):
 
-        if self.CP_socket:
+        if self.CP_client:
 
             @app.callback(
                 Output("cp-column-select", "data"),
@@ -285,7 +334,7 @@ class CrossProber:
                 if event.get("button") != 1:
                     logger.info("btn1")
                     return no_update
-                elif self.CP_socket:
+                elif self.CP_client:
                     if not cp_col:
                         cp_col = event.get("srcElement.attributes.col-id.nodeValue")
                     msg = self.cross_probing(selected_rows, obj, cp_col)
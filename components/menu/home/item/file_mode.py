@@ -1,21 +1,34 @@
 import os
 import dash_mantine_components as dmc
+import dash_blueprint_components as dbpc
 from dash import Input, Output, State, html, exceptions, ctx, no_update
 from components.grid.dag.column_definitions import *
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
 from utils.config import CONFIG
 from utils.data_processing import *
 from utils.file_operations import get_lock_status
+from utils.file_probe import FILE_PROBE
+from utils.incremental_reload import INCREMENTAL_RELOAD
+
+
+def release_current_lock():
+    """보유 중인 lock을 해제하고, 탐색기가 이전 lock 상태를 보여주지 않도록 FILE_PROBE 캐시 제거"""
+    if SSDF.lock:
+        FILE_PROBE.invalidate(SSDF.lock.lock_file[: -len(".lock")])
+    SSDF.release_lock()
 
 
 def enter_edit_mode(file_path):
     logger.debug("enter_edit_mode")
-    SSDF.release_lock()
-    return SSDF.acquire_lock(file_path)
+    release_current_lock()
+    acquired = SSDF.acquire_lock(file_path)
+    FILE_PROBE.invalidate(file_path)
+    return acquired
 
 
 def exit_edit_mode(file_path):
-    SSDF.release_lock()
+    release_current_lock()
 
 
 class FileMode:
@@ -44,10 +57,11 @@ class FileMode:
                         dmc.Space(h=10),
                         dmc.Checkbox(
                             id="remain-edited-waiver",
-                            label="Read Mode 에서 수행한 waiver 정보를 가져가기(개발 중)",
+                            # 행을 맞출 자연 키(RV_WAIVER_MERGE_KEY)가 설정된 경우에만 사용 가능
+                            label="Read Mode 에서 수행한 waiver 정보를 가져가기" + ("" if CONFIG.WAIVER_MERGE_KEY else "(개발 중)"),
                             checked=False,
                             color="red",
-                            disabled=True,
+                            disabled=not CONFIG.WAIVER_MERGE_KEY,
                         ),
                         dmc.Group([dmc.Button("Yes", id="enter-edit-btn")], justify="flex-end"),
                     ],
@@ -109,6 +123,7 @@ class FileMode:
             Output("enter-edit-modal", "opened", allow_duplicate=True),
             Output("aggrid-table", "columnDefs", allow_duplicate=True),
             Output("remain-edited-waiver", "checked"),
+            Output("purge-refresh", "data", allow_duplicate=True),
             Input("enter-edit-btn", "n_clicks"),
             State("flex-layout", "model"),
             State("remain-edited-waiver", "checked"),
@@ -120,32 +135,37 @@ class FileMode:
             file_path = file_path.replace("WORKSPACE", CONFIG.WORKSPACE)
             lock, locked_by = get_lock_status(file_path)
             if lock:
-                return no_update, [], False, no_update, False
+                return no_update, [], False, no_update, False, no_update
 
             if enter_edit_mode(file_path):
                 try:
                     df_workspace = validate_df(file_path)
+                    INCREMENTAL_RELOAD.record(file_path, df_workspace)
                 except:
-                    return no_update, [], False, no_update, False
+                    return no_update, [], False, no_update, False, no_update
+                toasts = []
                 if checked and ("waiver" in df_workspace.columns):
-                    df_local = SSDF.dataframe
-                    df_local = df_local.select("waiver", "user").rename({"waiver": "waiver_local", "user": "user_local"})
-                    dff = pl.concat([df_workspace, df_local], how="horizontal")
-                    conditions_expr = (
-                        (pl.col("waiver") != pl.col("waiver_local"))
-                        & (pl.col("user_local").str.starts_with(CONFIG.USERNAME))
-                        & ((pl.col("user") == CONFIG.USERNAME) | ((pl.col("waiver_local") != "Result") & (pl.col("waiver") != "Fixed")))
-                    )
-                    update_waiver_column = pl.when(conditions_expr).then(pl.col("waiver_local")).otherwise(pl.col("waiver")).alias("waiver")
-                    update_user_column = pl.when(conditions_expr).then(pl.col("user_local")).otherwise(pl.col("user")).alias("user")
-                    dff = dff.with_columns(update_waiver_column, update_user_column)
-                    df_workspace = dff.select(pl.exclude(["waiver_local", "user_local"]))
+                    try:
+                        df_workspace, conflicts = merge_local_waivers(df_workspace, SSDF.dataframe)
+                    except Exception as e:
+                        logger.error(f"로컬 waiver 병합 실패: {e}")
+                        conflicts = pl.DataFrame()
+                        toasts.append(dbpc.Toast(message=f"로컬 waiver를 가져오지 못했습니다: {e}", intent="danger", icon="error"))
+                    if conflicts.height:
+                        toasts.append(
+                            dbpc.Toast(
+                                message=f"{conflicts.height:,}건은 워크스페이스에서 먼저 수정되어 로컬 waiver가 반영되지 않았습니다",
+                                intent="warning",
+                                icon="warning-sign",
+                            )
+                        )
 
                 SSDF.dataframe = df_workspace
+                EDIT_HISTORY.clear()
                 updated_columnDefs = generate_column_definitions(df_workspace)
-                return "edit", [], no_update, updated_columnDefs, False
+                return "edit", toasts, no_update, updated_columnDefs, False, file_path
             else:
-                return no_update, [], False, no_update, False
+                return no_update, [], False, no_update, False, no_update
 
         @app.callback(
             Output("file-mode-control", "value", allow_duplicate=True),
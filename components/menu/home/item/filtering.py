@@ -1,10 +1,10 @@
-import os
-import yaml
 import dash_mantine_components as dmc
 import dash_blueprint_components as dbpc
 
-from dash import Input, Output, State, exceptions, no_update, dcc, html, ctx
-from utils.data_processing import displaying_df
+from dash import Input, Output, State, exceptions, no_update, dcc, html, ctx, ALL
+from utils.db_management import SSDF
+from utils.filter_library import FILTER_LIBRARY, filter_columns
+from components.grid.dag.SSRM.apply_filter import invert_model
 from utils.logging_utils import logger
 from utils.config import CONFIG
 
@@ -27,18 +27,9 @@ class FilterInfo:
 
 class Filter:
     def __init__(self) -> None:
-        # self.filter_yaml = os.path.join(CONFIG.USER_RV_DIR, "filters.yaml")
-        self.filter_yaml = "filters.yaml"
-
-    def load_filters(self):
-        if os.path.exists(self.filter_yaml):
-            with open(self.filter_yaml, "r") as file:
-                return yaml.safe_load(file) or {}
-        return {}
-
-    def save_filters(self, filters):
-        with open(self.filter_yaml, "w") as file:
-            yaml.dump(filters, file)
+        # 저장된 필터는 SQLite 라이브러리에 (application, name) 키로 저장 (기존 filters.yaml은 처음 한 번 가져옴)
+        self.library = FILTER_LIBRARY
+        self.default_application = "Common"
 
     def layout(self):
         return dmc.Group(
@@ -64,6 +55,7 @@ class Filter:
                 self.filter_manager(),
                 dcc.Store(id="filter-model-store"),
                 dcc.Store(id="selected-filter-store"),
+                dcc.Store(id="inverse-filter-store"),
             ],
             gap=2,
         )
@@ -110,8 +102,8 @@ class Filter:
                                             id="input-group-3",
                                             leftIcon="search-template",
                                         ),
-                                        # Filter Cards
-                                        self._render_filter_cards(),
+                                        # Filter Cards (매니저를 열 때 다시 그림)
+                                        html.Div(id="filter-cards"),
                                     ],
                                     span=9,
                                 ),
@@ -134,12 +126,16 @@ class Filter:
         )
 
     def _render_filter_cards(self):
-        filters = self.load_filters()
-        current_columns = self._get_current_columns()
+        filters = self.library.list()
+        df = SSDF.dataframe
+        # 현재 스키마로 컴파일해 적용 가능 여부를 확인하고, 모든 필터의 일치 행 수를 한 번에 계산
+        counts = self.library.match_counts(filters, df) if filters else []
         cards = []
-        for name, filter_data in filters.items():
+        for filter_data, count in zip(filters, counts):
             filter_info = FilterInfo(**filter_data)
-            is_applicable = all(col in current_columns for col in filter_info.columns)
+            name, application = filter_info.name, filter_info.application
+            expr, missing = self.library.compile(filter_data, df.schema)
+            is_applicable = expr is not None
             cards.append(
                 dmc.Card(
                     children=[
@@ -158,6 +154,11 @@ class Filter:
                                             color="green" if is_applicable else "red",
                                             variant="dot",
                                         ),
+                                        dmc.Badge(
+                                            f"{count:,} rows" if count is not None else f"Missing: {', '.join(missing)}" if missing else "-",
+                                            color="gray",
+                                            variant="outline",
+                                        ),
                                     ]
                                 ),
                                 dbpc.ButtonGroup(
@@ -165,13 +166,13 @@ class Filter:
                                         dbpc.Button(
                                             icon="edit",
                                             minimal=True,
-                                            id={"type": "edit-filter", "name": name},
+                                            id={"type": "edit-filter", "name": name, "application": application},
                                         ),
                                         dbpc.Button(
                                             icon="trash",
                                             minimal=True,
                                             intent="danger",
-                                            id={"type": "delete-filter", "name": name},
+                                            id={"type": "delete-filter", "name": name, "application": application},
                                         ),
                                     ]
                                 ),
@@ -196,7 +197,7 @@ class Filter:
                         ),
                         dbpc.Button(
                             "Apply Filter",
-                            id={"type": "apply-filter", "name": name},
+                            id={"type": "apply-filter", "name": name, "application": application},
                             disabled=not is_applicable,
                             fill=True,
                         ),
@@ -210,8 +211,7 @@ class Filter:
         return dmc.Stack(cards, gap="sm")
 
     def _get_current_columns(self) -> List[str]:
-        df = displaying_df()
-        return list(df.columns) if df is not None else []
+        return [col for col in SSDF.dataframe.columns if col not in ("uniqid", "childCount")]
 
     def _get_applications(self) -> List[str]:
         # TODO: Implement getting list of Signoff Applications
@@ -243,7 +243,7 @@ class Filter:
                 return f"({join_type.join(expressions)})"
             else:
                 operator = operator_map.get(condition["type"], condition["type"])
-                filter_value = f'"{condition["filter"]}"' if isinstance(condition["filter"], str) else condition["filter"]
+                filter_value = f'"{condition.get("filter", "")}"' if isinstance(condition.get("filter", ""), str) else condition["filter"]
                 return f"[{condition['colId']}] {operator} {filter_value}"
 
         return build_expression(filter_model)
@@ -312,116 +312,41 @@ class Filter:
 
     def register_callbacks(self, app):
 
+        # 역필터: 현재 Advanced Filter Model을 서버로 보내 역조건(De Morgan)으로 바꾼 뒤 그리드에 적용
+        # 서버 필터는 캐시된 원래 조건의 mask를 NOT 해서 사용하므로 다시 계산하지 않음
         app.clientside_callback(
             """
-        function(n_clicks, grid_id) {
-            if (!n_clicks) return window.dash_clientside.no_update;
-            
-            console.log("n_clicks:", n_clicks);
-
-            var grid = dash_ag_grid.getApi(grid_id);
-            if (!grid) {
-                console.error("Grid API not found");
-                return window.dash_clientside.no_update;
-            }
-            
-            console.log("grid:", grid);
-
-            const filterModel = grid.getAdvancedFilterModel();
-
-            console.log("filterModel:", filterModel);
-            
-            if (!filterModel) return window.dash_clientside.no_update;
-            
-            // Advanced Filter Model을 inverse 변환하는 함수
-            function inverseFilterModel(model) {
-                
-                // Join type filter (AND/OR 결합)
-                if (model.filterType === 'join') {
-                    return {
-                        filterType: 'join',
-                        // AND <-> OR 변환 (De Morgan's Law)
-                        type: model.type === 'AND' ? 'OR' : 'AND',
-                        // 재귀적으로 모든 조건에 대해 inverse 적용
-                        conditions: model.conditions.map(condition => inverseFilterModel(condition))
-                    };
-                }
-                
-                // 기본 구조 복사
-                const inversedModel = { ...model };
-
-                // 데이터 타입별 inverse 매핑 처리
-                switch (model.filterType) {
-                    case 'text':
-                    case 'object':
-                        // 텍스트/오브젝트 타입 필터 inverse
-                        const textInverseMap = {
-                            'equals': 'notEqual',
-                            'notEqual': 'equals',
-                            'contains': 'notContains', 
-                            'notContains': 'contains',
-                            'startsWith': 'notStartsWith',
-                            'notStartsWith': 'startsWith', 
-                            'endsWith': 'notEndsWith',
-                            'notEndsWith': 'endsWith',
-                            'blank': 'notBlank',
-                            'notBlank': 'blank'
-                        };
-                        inversedModel.type = textInverseMap[model.type] || model.type;
-                        break;
-
-                    case 'number':
-                    case 'date':
-                    case 'dateString':
-                        // 숫자/날짜 타입 필터 inverse 
-                        const scalarInverseMap = {
-                            'equals': 'notEqual',
-                            'notEqual': 'equals',
-                            'lessThan': 'greaterThanOrEqual',
-                            'lessThanOrEqual': 'greaterThan', 
-                            'greaterThan': 'lessThanOrEqual',
-                            'greaterThanOrEqual': 'lessThan',
-                            'blank': 'notBlank',
-                            'notBlank': 'blank',
-                            'inRange': 'notInRange',
-                            'notInRange': 'inRange'
-                        };
-                        inversedModel.type = scalarInverseMap[model.type] || model.type;
-                        break;
-
-                    case 'boolean':
-                        // 불리언 타입 필터 inverse
-                        inversedModel.type = model.type === 'true' ? 'false' : 'true';
-                        break;
-
-                    default:
-                        console.warn(`Unknown filter type: ${model.filterType}`);
-                        return model;
+            function(n_clicks, grid_id) {
+                if (!n_clicks) return window.dash_clientside.no_update;
+                const grid = dash_ag_grid.getApi(grid_id);
+                if (!grid) {
+                    console.error("Grid API not found");
+                    return window.dash_clientside.no_update;
                 }
-
-                return inversedModel;
-            }
-
-            try {
-                console.log('Original Filter Model:', filterModel);
-                const inversedModel = inverseFilterModel(filterModel);
-                console.log('Inversed Filter Model:', inversedModel);
-                
-                grid.setAdvancedFilterModel(inversedModel);
-                return window.dash_clientside.no_update;
-            } catch (error) {
-                console.error('Error inverting filter model:', error);
-                return window.dash_clientside.no_update;
+                const filterModel = grid.getAdvancedFilterModel();
+                if (!filterModel) return window.dash_clientside.no_update;
+                return filterModel;
             }
-
-        }
-        """,
-            Output("inverse-filter-btn", "children"),
+            """,
+            Output("inverse-filter-store", "data"),
             Input("inverse-filter-btn", "n_clicks"),
             State("aggrid-table", "id"),
             prevent_initial_call=True,
         )
 
+        @app.callback(
+            Output("selected-filter-store", "data", allow_duplicate=True),
+            Output("filter-toaster", "toasts", allow_duplicate=True),
+            Input("inverse-filter-store", "data"),
+            prevent_initial_call=True,
+        )
+        def inverse_filter(filter_model):
+            inversed_model = invert_model(filter_model)
+            if inversed_model is None:
+                logger.error(f"역필터 변환 불가: {filter_model}")
+                return no_update, [dbpc.Toast(message="This filter cannot be inverted", intent="warning", icon="warning-sign")]
+            return inversed_model, no_update
+
         app.clientside_callback(
             """
             function(n_clicks, grid_id) {
@@ -450,10 +375,79 @@ class Filter:
 
         @app.callback(
             Output("filter-manager-modal", "isOpen"),
+            Output("filter-cards", "children"),
             Input("open-filter-manager", "n_clicks"),
             prevent_initial_call=True,
         )
         def open_filter_storage(n_clicks):
             if n_clicks is None or n_clicks == 0:
                 raise exceptions.PreventUpdate
-            return True
+            return True, self._render_filter_cards()
+
+        @app.callback(
+            Output("filter-toaster", "toasts"),
+            Input("filter-model-store", "data"),
+            prevent_initial_call=True,
+        )
+        def save_current_filter(filter_model_json):
+            """현재 Advanced Filter를 필터 라이브러리에 저장 (이름은 조건식)"""
+            if not filter_model_json:
+                raise exceptions.PreventUpdate
+            try:
+                filter_model = json.loads(filter_model_json)
+                name = self.filter_model_to_expression(filter_model)
+                self.library.save(
+                    {
+                        "name": name,
+                        "description": "",
+                        "application": self.default_application,
+                        "columns": filter_columns(filter_model),
+                        "filter_model": filter_model,
+                        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "created_by": CONFIG.USERNAME,
+                    }
+                )
+                return [dbpc.Toast(message=f"Filter saved: {name}", intent="success", icon="tick")]
+            except Exception as e:
+                logger.error(f"필터 저장 실패: {e}")
+                return [dbpc.Toast(message=f"Failed to save filter: {e}", intent="danger", icon="error")]
+
+        @app.callback(
+            Output("selected-filter-store", "data"),
+            Output("filter-manager-modal", "isOpen", allow_duplicate=True),
+            Input({"type": "apply-filter", "name": ALL, "application": ALL}, "n_clicks"),
+            prevent_initial_call=True,
+        )
+        def apply_saved_filter(n_clicks_list):
+            if not any(n_clicks_list) or ctx.triggered_id is None:
+                raise exceptions.PreventUpdate
+            filter_info = self.library.get(ctx.triggered_id["name"], ctx.triggered_id["application"])
+            if filter_info is None:
+                raise exceptions.PreventUpdate
+            return filter_info["filter_model"], False
+
+        app.clientside_callback(
+            """
+            function(filterModel, grid_id) {
+                const grid = dash_ag_grid.getApi(grid_id);
+                if (!grid || !filterModel) return window.dash_clientside.no_update;
+                grid.setAdvancedFilterModel(filterModel);
+                return window.dash_clientside.no_update;
+            }
+            """,
+            Output("selected-filter-store", "id"),
+            Input("selected-filter-store", "data"),
+            State("aggrid-table", "id"),
+            prevent_initial_call=True,
+        )
+
+        @app.callback(
+            Output("filter-cards", "children", allow_duplicate=True),
+            Input({"type": "delete-filter", "name": ALL, "application": ALL}, "n_clicks"),
+            prevent_initial_call=True,
+        )
+        def delete_saved_filter(n_clicks_list):
+            if not any(n_clicks_list) or ctx.triggered_id is None:
+                raise exceptions.PreventUpdate
+            self.library.delete(ctx.triggered_id["name"], ctx.triggered_id["application"])
+            return self._render_filter_cards()
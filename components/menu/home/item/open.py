@@ -8,6 +8,7 @@ from components.menu.home.item.workspace_explorer import WorkspaceExplorer
 from utils.config import CONFIG
 from utils.db_management import SSDF
 from utils.data_processing import file2df
+from utils.incremental_reload import INCREMENTAL_RELOAD
 
 
 class Opener:
@@ -219,6 +220,7 @@ class Opener:
             Output("file-mode-control", "disabled", allow_duplicate=True),
             Output("file-mode-control", "value", allow_duplicate=True),
             Output("pre-defined-view", "data", allow_duplicate=True),
+            Output("purge-refresh", "data", allow_duplicate=True),
             Input("open-csv-local-btn", "n_clicks"),
             State("open-csv-path-input", "value"),
             prevent_initial_call=True,
@@ -240,6 +242,7 @@ class Opener:
                 value_fileMode_control = no_update
             try:
                 df = file2df(file_path)
+                INCREMENTAL_RELOAD.record(file_path, df)
 
                 patched_dashGridOptions = Patch()
                 patched_dashGridOptions["treeData"] = False
@@ -271,6 +274,7 @@ class Opener:
                     disable_fileMode_control,
                     value_fileMode_control,
                     ret_pre_defined_value,
+                    mod_time,
                 )
 
             except Exception as e:
@@ -287,4 +291,5 @@ class Opener:
                     no_update,
                     no_update,
                     no_update,
+                    no_update,
                 )
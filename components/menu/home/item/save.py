@@ -2,9 +2,11 @@ import os
 import subprocess
 import dash_mantine_components as dmc
 import dash_blueprint_components as dbpc
-from dash import Output, Input, State, no_update, html, exceptions
-from utils.data_processing import displaying_df
-from utils.file_operations import backup_file
+from dash import Output, Input, State, no_update, html, dcc, exceptions
+from utils.data_processing import displaying_df, export_displaying_df
+from utils.file_operations import backup_parquet_dedup
+from utils.file_probe import FILE_PROBE
+from utils.background_writer import BACKGROUND_WRITER, write_parquet
 from utils.config import CONFIG
 from utils.db_management import SSDF
 from utils.logging_utils import logger
@@ -12,7 +14,16 @@ from utils.logging_utils import logger
 
 class Saver:
     def layout(self):
-        return html.Div([self.save_menu(), self.local_saver_modal(), self.workspace_saver_modal()])
+        return html.Div(
+            [
+                self.save_menu(),
+                self.local_saver_modal(),
+                self.workspace_saver_modal(),
+                dcc.Store(id="save-jobs", data=[]),
+                dcc.Interval(id="save-jobs-interval", interval=1000, disabled=True),
+                dmc.Text(id="save-job-status", size="xs", c="dimmed"),
+            ]
+        )
 
     def save_menu(self):
         return dmc.Menu(
@@ -77,6 +88,11 @@ class Saver:
                             checked=False,
                             id="filtered-save-as",
                         ),
+                        dmc.Checkbox(
+                            label="gzip (.csv.gz)",
+                            checked=False,
+                            id="gzip-save-as",
+                        ),
                         dbpc.Button(
                             "local Save (Download)",
                             id="save-csv-local-btn",
@@ -192,9 +208,9 @@ class Saver:
                 if not os.access(save_dir, os.W_OK):
                     return True, f"디렉토리에 쓰기 권한이 없습니다: {save_dir}"
 
-                # 3. 파일 확장자 확인 (.csv 또는 .parquet)
-                if not save_path.endswith((".csv", ".parquet")):
-                    return True, "파일 확장자는 .csv 또는 .parquet이어야 합니다."
+                # 3. 파일 확장자 확인 (.csv, .csv.gz 또는 .parquet)
+                if not save_path.endswith((".csv", ".csv.gz", ".parquet")):
+                    return True, "파일 확장자는 .csv, .csv.gz 또는 .parquet이어야 합니다."
 
                 # 4. 기존 파일 존재 여부 확인
                 if os.path.exists(save_path):
@@ -218,21 +234,26 @@ class Saver:
         @app.callback(
             Output("toaster", "toasts", allow_duplicate=True),
             Output("local-file-save-modal", "isOpen", allow_duplicate=True),
+            Output("save-jobs", "data", allow_duplicate=True),
+            Output("save-jobs-interval", "disabled", allow_duplicate=True),
             Input("save-csv-local-btn", "n_clicks"),
             State("save-csv-path-input", "value"),
             State("filtered-save-as", "checked"),
+            State("gzip-save-as", "checked"),
+            State("save-jobs", "data"),
             prevent_initial_call=True,
         )
-        def save_local(save_n, save_path, filtered_save_as):
-            df_to_save = displaying_df(filtred_apply=filtered_save_as)
+        def save_local(save_n, save_path, filtered_save_as, gzip_save_as, save_jobs):
             if save_path:
-                if save_path.endswith(".parquet"):
-                    df_to_save.write_parquet(save_path)
-                else:
-                    df_to_save.write_csv(save_path)
-
+                if gzip_save_as and save_path.endswith(".csv"):
+                    save_path += ".gz"
+                # 필터/정렬 결과를 배치 단위로 파일에 이어 쓰는 작업을 백그라운드로 실행 (저장 요청 시점의 보기를 스냅샷)
+                df, request, hide_waiver = SSDF.dataframe, dict(SSDF.request or {}), SSDF.hide_waiver
+                job_id = BACKGROUND_WRITER.submit(f"Local 저장: {save_path}", self._export_local_file, save_path, filtered_save_as, df, request, hide_waiver)
                 return (
-                    [dbpc.Toast(message=f"File saved to {save_path}", icon="endorsed")],
+                    [dbpc.Toast(message=f"Saving to {save_path} ...", icon="saved", timeout=2000)],
+                    False,
+                    (save_jobs or []) + [job_id],
                     False,
                 )
             return (
@@ -244,6 +265,8 @@ class Saver:
                     )
                 ],
                 False,
+                no_update,
+                no_update,
             )
 
         @app.callback(
@@ -342,11 +365,14 @@ class Saver:
         @app.callback(
             Output("toaster", "toasts", allow_duplicate=True),
             Output("workspace-file-save-modal", "isOpen", allow_duplicate=True),
+            Output("save-jobs", "data", allow_duplicate=True),
+            Output("save-jobs-interval", "disabled", allow_duplicate=True),
             Input("save-csv-workspace-btn", "n_clicks"),
             State("workspace-save-target-path", "value"),
+            State("save-jobs", "data"),
             prevent_initial_call=True,
         )
-        def save_csv_workspace(n, save_path):
+        def save_csv_workspace(n, save_path, save_jobs):
             if not n:
                 raise exceptions.PreventUpdate
 
@@ -359,21 +385,14 @@ class Saver:
             save_target_path = save_path.replace("WORKSPACE", CONFIG.WORKSPACE)
 
             try:
-                file_exists = os.path.isfile(save_target_path)
-                if file_exists:
-                    backup_file(os.path.dirname(save_target_path), save_target_path)
-
+                # 현재 시점의 스냅샷을 넘기고 백업/쓰기는 백그라운드 스레드에서 수행
                 df_to_save = displaying_df()
-                df_to_save.write_parquet(save_target_path)
-                # os.chmod(save_target_path, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+                job_id = BACKGROUND_WRITER.submit(f"Workspace 저장: {save_path}", self._write_workspace_file, df_to_save, save_target_path)
 
                 return (
-                    [
-                        dbpc.Toast(
-                            message=f"Saved to Workspace {save_path.replace(CONFIG.WORKSPACE, "WORKSPACE")}",
-                            icon="endorsed",
-                        )
-                    ],
+                    [dbpc.Toast(message=f"Saving to Workspace {save_path} ...", icon="cloud-upload", timeout=2000)],
+                    False,
+                    (save_jobs or []) + [job_id],
                     False,
                 )
 
@@ -381,4 +400,50 @@ class Saver:
                 return (
                     [dbpc.Toast(message=f"{str(e)}", intent="danger", icon="error")],
                     False,
+                    no_update,
+                    no_update,
                 )
+
+        @app.callback(
+            Output("toaster", "toasts", allow_duplicate=True),
+            Output("save-jobs", "data", allow_duplicate=True),
+            Output("save-jobs-interval", "disabled", allow_duplicate=True),
+            Output("save-job-status", "children"),
+            Input("save-jobs-interval", "n_intervals"),
+            State("save-jobs", "data"),
+            prevent_initial_call=True,
+        )
+        def poll_save_jobs(n_intervals, save_jobs):
+            """백그라운드 저장 작업의 진행률 표시 및 완료/실패 알림"""
+            if not save_jobs:
+                return no_update, [], True, ""
+
+            toasts, pending, progress_text = [], [], []
+            for job in BACKGROUND_WRITER.statuses(save_jobs):
+                if job["state"] == "done":
+                    rows = f" ({job['result']:,} rows)" if isinstance(job["result"], int) else ""
+                    toasts.append(dbpc.Toast(message=f"Saved - {job['label']}{rows}", icon="endorsed"))
+                elif job["state"] == "failed":
+                    toasts.append(dbpc.Toast(message=f"Save failed - {job['label']}: {job['error']}", intent="danger", icon="error"))
+                else:
+                    pending.append(job["id"])
+                    progress_text.append(f"{job['label']} ({job['progress'] * 100:.0f}%)")
+
+            return toasts or no_update, pending, not pending, " / ".join(progress_text)
+
+    @staticmethod
+    def _export_local_file(progress, save_path, filtered_save_as, df, request, hide_waiver):
+        """백그라운드 작업: 저장 요청 시점의 보기 스냅샷을 파일로 기록"""
+        rows = export_displaying_df(save_path, filtred_apply=filtered_save_as, progress=progress, dff=df, request=request, hide_waiver=hide_waiver)
+        FILE_PROBE.invalidate(save_path)
+        return rows
+
+    @staticmethod
+    def _write_workspace_file(progress, df_to_save, save_target_path):
+        """백그라운드 작업: 기존 파일을 row group 단위 중복 제거 백업으로 남긴 뒤 임시 파일 + rename으로 교체"""
+        if os.path.isfile(save_target_path):
+            backup_parquet_dedup(os.path.dirname(save_target_path), save_target_path)
+        write_parquet(df_to_save, save_target_path, progress=progress)
+        FILE_PROBE.invalidate(save_target_path)
+        # os.chmod(save_target_path, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+        return save_target_path
@@ -3,10 +3,12 @@ import shutil
 import datetime
 import dash_mantine_components as dmc
 from pathlib import Path
+from collections import OrderedDict
 from dash import html, Output, Input, State, no_update, ctx, ALL, Patch, dcc, exceptions
 from components.grid.dag.column_definitions import generate_column_definitions
 
-from utils.file_operations import get_file_owner, get_lock_status
+from utils.file_probe import FILE_PROBE
+from utils.workspace_index import WORKSPACE_INDEX
 from utils.data_processing import file2df
 from utils.logging_utils import logger
 from utils.db_management import SSDF
@@ -15,7 +17,14 @@ from utils.config import CONFIG
 
 class WorkspaceExplorer:
     def __init__(self, id_prefix=""):
+        self.id_prefix = id_prefix
+        self.datetime_format = "%b %d, %Y %H:%M"
         self.files = []
+        self.search_results = None
+        self.dir_cache = OrderedDict()
+        self.dir_cache_size = 32
+        self.lock_names = set()
+        WORKSPACE_INDEX.start()
 
     def layout(self) -> html.Div:
         return html.Div(
@@ -65,17 +74,155 @@ class WorkspaceExplorer:
         )
 
     def search_files(self, root_dir, pattern):
+        # 인덱스가 준비되면 trigram 인덱스 검색, 첫 크롤링이 끝나기 전에는 직접 탐색
+        if WORKSPACE_INDEX.ready:
+            return WORKSPACE_INDEX.search(pattern, root_dir)
+
         matched_files = []
         for root, dirs, files in os.walk(root_dir):
             for file in files:
                 if pattern.lower() in file.lower():
-                    full_path = os.path.join(root, file)
-                    matched_files.append(self.get_file_details(full_path))
+                    matched_files.append({"path": os.path.join(root, file)})
         return matched_files
 
-    def get_file_details(self, file_path):
+    def search_result_details(self, entry):
+        return self.get_file_details(entry["path"], self.index_entry_info(entry) if "size" in entry else None)
+
+    def list_directory(self, cwd):
+        """디렉토리 항목 (index, 이름, 디렉토리 여부)을 이름순으로 반환
+
+        os.scandir의 dirent 정보만으로 정렬하고(stat 없음), 디렉토리 mtime이 같으면 이전 목록을 재사용합니다.
+        """
+        try:
+            mtime = os.stat(cwd).st_mtime
+        except OSError:
+            return []
+
+        cached = self.dir_cache.get(cwd)
+        if cached and cached[0] == mtime:
+            entries, self.lock_names = cached[1], cached[2]
+            self.dir_cache.move_to_end(cwd)
+        else:
+            with os.scandir(cwd) as it:
+                entries = sorted(((entry.name, entry.is_dir()) for entry in it), key=lambda entry: entry[0].lower())
+            self.lock_names = {name for name, _ in entries if name.endswith(".lock")}
+            self.dir_cache[cwd] = (mtime, entries, self.lock_names)
+            while len(self.dir_cache) > self.dir_cache_size:
+                self.dir_cache.popitem(last=False)
+
+        self.files = [os.path.join(cwd, name).replace(CONFIG.WORKSPACE, "WORKSPACE") for name, _ in entries]
+        return [(i, name, is_dir) for i, (name, is_dir) in enumerate(entries) if not name.endswith(".lock")]
+
+    def directory_entry_details(self, cwd, item):
+        i, file, is_dir = item
+        full_path = os.path.join(cwd, file)
+        details = self.file_info(Path(full_path))
+
+        if is_dir:
+            details["filename"] = html.A(
+                file,
+                href="#",
+                id={"type": f"listed_file", "index": i},
+                title=full_path.replace(CONFIG.WORKSPACE, "WORKSPACE"),
+                style={"fontWeight": "bold", "fontSize": 15},
+            )
+            # details["icon"] = get_icon("bx-folder")
+        else:
+            details["filename"] = html.A(
+                file,
+                href="#",
+                id={"type": f"open-workspace-file", "index": full_path},
+                title=full_path.replace(CONFIG.WORKSPACE, "WORKSPACE"),
+                n_clicks=0,
+            )
+            if not self.id_prefix:
+                details["option"] = self.listing_file_options(full_path, file)
+            # details["icon"] = get_icon("bx-file")
+
+        return details
+
+    def listing_file_options(self, full_path, file):
+        return dmc.ButtonGroup(
+            [
+                dcc.Store(
+                    id={
+                        "type": f"refresh-flag",
+                        "index": full_path,
+                    },
+                    data=False,
+                ),
+                dmc.Tooltip(
+                    dmc.ActionIcon(
+                        # get_icon("copy"),
+                        variant="transparent",
+                        id={
+                            "type": f"copy-workspace-file",
+                            "index": full_path,
+                        },
+                        n_clicks=0,
+                    ),
+                    label="Copy",
+                    openDelay=500,
+                ),
+                dmc.Menu(
+                    [
+                        dmc.MenuTarget(
+                            dmc.Tooltip(
+                                dmc.ActionIcon(
+                                    # get_icon("rename"),
+                                    variant="subtle",
+                                    id={
+                                        "type": f"rename-workspace-file",
+                                        "index": full_path,
+                                    },
+                                    n_clicks=0,
+                                ),
+                                label="Rename",
+                                openDelay=500,
+                            )
+                        ),
+                        dmc.MenuDropdown(
+                            [
+                                dmc.MenuLabel(
+                                    dmc.TextInput(
+                                        value=file,
+                                        id={
+                                            "type": f"rename-workspace-file-newfilename",
+                                            "index": full_path,
+                                        },
+                                    )
+                                ),
+                                dmc.MenuItem(
+                                    "Confirm",
+                                    n_clicks=0,
+                                    id={
+                                        "type": f"rename-workspace-file-confirm-btn",
+                                        "index": full_path,
+                                    },
+                                ),
+                            ]
+                        ),
+                    ]
+                ),
+                dmc.Tooltip(
+                    dmc.ActionIcon(
+                        # get_icon("remove"),
+                        variant="subtle",
+                        id={
+                            "type": f"remove-workspace-file",
+                            "index": full_path,
+                        },
+                        n_clicks=0,
+                    ),
+                    label="Remove",
+                    openDelay=500,
+                ),
+            ]
+        )
+
+    def get_file_details(self, file_path, details=None):
         path = Path(file_path)
-        details = self.file_info(path)
+        details = details or self.file_info(path)
         details["filename"] = html.A(
             path.name,
             href="#",
@@ -87,14 +234,13 @@ class WorkspaceExplorer:
         # details["icon"] = get_icon("bx-file")
 
         if not self.id_prefix:
-            details["option"] = self.create_file_options(file_path, path.name)
+            details["option"] = self.create_file_options(file_path, path.name, details["owner"], details["locked"])
 
         return details
 
-    def create_file_options(self, file_path, file_name):
-        file_owner = get_file_owner(file_path)
-        lock, locked_by = get_lock_status(file_path)
-        has_permission = (file_owner == CONFIG.USERNAME) and not lock
+    def create_file_options(self, file_path, file_name, owner, locked_by):
+        # owner/lock 상태는 이미 조회한 행 정보(디렉토리 목록은 FILE_PROBE, 검색 결과는 인덱스 항목)를 사용
+        has_permission = (owner == CONFIG.USERNAME) and not locked_by
 
         return dmc.ButtonGroup(
             [
@@ -166,19 +312,30 @@ class WorkspaceExplorer:
         )
 
     def file_info(self, path):
-        owner = get_file_owner(path)
-        is_locked, locked_by = get_lock_status(path)
-        file_stat = path.stat()
-        size = self._format_size(file_stat.st_size)
+        # 페이지 단위로 미리 병렬 조회(FILE_PROBE.probe)했으면 캐시에서 바로 반환됨
+        probed = FILE_PROBE.probe([path])[str(path)]
+        file_stat = probed["stat"]
 
         return {
             "icon": path.suffix if not path.name.startswith(".") else path.name,
             "filename": "",
             "option": "",
-            "locked": locked_by if is_locked and not self.id_prefix else "",
-            "size": size,
-            "owner": owner,
-            "created": datetime.datetime.fromtimestamp("%b %d, %Y %H:%M").strftime(self.datetime_format),
+            "locked": probed["locked_by"] if probed["locked_by"] and not self.id_prefix else "",
+            "size": self._format_size(file_stat.st_size) if file_stat else "",
+            "owner": probed["owner"],
+            "created": datetime.datetime.fromtimestamp(file_stat.st_mtime).strftime(self.datetime_format) if file_stat else "",
+        }
+
+    def index_entry_info(self, entry):
+        """WORKSPACE 인덱스 항목으로 file_info와 같은 형식을 만듦 (stat 호출 없음)"""
+        return {
+            "icon": Path(entry["name"]).suffix if not entry["name"].startswith(".") else entry["name"],
+            "filename": "",
+            "option": "",
+            "locked": entry["locked_by"] if entry["locked_by"] and not self.id_prefix else "",
+            "size": self._format_size(entry["size"]),
+            "owner": entry["owner"],
+            "created": datetime.datetime.fromtimestamp(entry["mtime"]).strftime(self.datetime_format),
         }
 
     def _format_size(self, size: int) -> str:
@@ -228,127 +385,27 @@ class WorkspaceExplorer:
             else:
                 cwd = ""
 
+            items_per_page = 20
             if ctx.triggered_id == f"search_button" and search_pattern:
-                all_file_details = self.search_files(cwd, search_pattern)
+                self.search_results = self.search_files(cwd, search_pattern)
+            elif ctx.triggered_id != f"pagination":
+                self.search_results = None
+
+            if self.search_results is not None:
+                items = self.search_results
+                build_details = self.search_result_details
+                page_items = items[(page - 1) * items_per_page : page * items_per_page]
+                # 인덱스 검색 결과는 메타데이터를 포함하므로, 직접 탐색한 결과만 조회
+                FILE_PROBE.probe([item["path"] for item in page_items if "size" not in item])
             else:
-                path = Path(cwd)
-                all_file_details = []
-                if path.is_dir():
-                    files = sorted(os.listdir(path), key=str.lower)
-                    self.files = []
-                    for i, file in enumerate(files):
-
-                        filepath = Path(file)
-                        full_path = os.path.join(cwd, filepath.as_posix())
-
-                        self.files.append(full_path.replace(CONFIG.WORKSPACE, "WORKSPACE"))
-                        if file.endswith(".lock"):
-                            continue
-
-                        is_dir = Path(full_path).is_dir()
-                        details = self.file_info(Path(full_path))
-
-                        if is_dir:
-                            details["filename"] = html.A(
-                                file,
-                                href="#",
-                                id={"type": f"listed_file", "index": i},
-                                title=full_path.replace(CONFIG.WORKSPACE, "WORKSPACE"),
-                                style={"fontWeight": "bold", "fontSize": 15},
-                            )
-                            # details["icon"] = get_icon("bx-folder")
-                        else:
-
-                            details["filename"] = html.A(
-                                file,
-                                href="#",
-                                id={"type": f"open-workspace-file", "index": full_path},
-                                title=full_path.replace(CONFIG.WORKSPACE, "WORKSPACE"),
-                                n_clicks=0,
-                            )
+                items = self.list_directory(cwd)
+                build_details = lambda item: self.directory_entry_details(cwd, item)
+                page_items = items[(page - 1) * items_per_page : page * items_per_page]
+                # lock 여부는 디렉토리 목록으로 판단하므로 .lock 파일을 따로 stat하지 않음
+                FILE_PROBE.probe([os.path.join(cwd, item[1]) for item in page_items], lock_names=self.lock_names)
 
-                            if not self.id_prefix:
-                                details["option"] = dmc.ButtonGroup(
-                                    [
-                                        dcc.Store(
-                                            id={
-                                                "type": f"refresh-flag",
-                                                "index": full_path,
-                                            },
-                                            data=False,
-                                        ),
-                                        dmc.Tooltip(
-                                            dmc.ActionIcon(
-                                                # get_icon("copy"),
-                                                variant="transparent",
-                                                id={
-                                                    "type": f"copy-workspace-file",
-                                                    "index": full_path,
-                                                },
-                                                n_clicks=0,
-                                            ),
-                                            label="Copy",
-                                            openDelay=500,
-                                        ),
-                                        dmc.Menu(
-                                            [
-                                                dmc.MenuTarget(
-                                                    dmc.Tooltip(
-                                                        dmc.ActionIcon(
-                                                            # get_icon("rename"),
-                                                            variant="subtle",
-                                                            id={
-                                                                "type": f"rename-workspace-file",
-                                                                "index": full_path,
-                                                            },
-                                                            n_clicks=0,
-                                                        ),
-                                                        label="Rename",
-                                                        openDelay=500,
-                                                    )
-                                                ),
-                                                dmc.MenuDropdown(
-                                                    [
-                                                        dmc.MenuLabel(
-                                                            dmc.TextInput(
-                                                                value=file,
-                                                                id={
-                                                                    "type": f"rename-workspace-file-newfilename",
-                                                                    "index": full_path,
-                                                                },
-                                                            )
-                                                        ),
-                                                        dmc.MenuItem(
-                                                            "Confirm",
-                                                            n_clicks=0,
-                                                            id={
-                                                                "type": f"rename-workspace-file-confirm-btn",
-                                                                "index": full_path,
-                                                            },
-                                                        ),
-                                                    ]
-                                                ),
-                                            ]
-                                        ),
-                                        dmc.Tooltip(
-                                            dmc.ActionIcon(
-                                                # get_icon("remove"),
-                                                variant="subtle",
-                                                id={
-                                                    "type": f"remove-workspace-file",
-                                                    "index": full_path,
-                                                },
-                                                n_clicks=0,
-                                            ),
-                                            label="Remove",
-                                            openDelay=500,
-                                        ),
-                                    ]
-                                )
-
-                            # details["icon"] = get_icon("bx-file")
-
-                        all_file_details.append(details)
+            # 현재 페이지 항목만 위젯 생성 (메타데이터는 위에서 병렬 조회한 캐시 사용)
+            paginated_files = [build_details(item) for item in page_items]
 
             table_header = [
                 dmc.TableThead(
@@ -365,12 +422,6 @@ class WorkspaceExplorer:
                     )
                 )
             ]
-            # 페이지네이션 로직
-            items_per_page = 20
-            start = (page - 1) * items_per_page
-            end = start + items_per_page
-            paginated_files = all_file_details[start:end]
-
             table_body = [
                 dmc.TableTr(
                     [
@@ -387,7 +438,7 @@ class WorkspaceExplorer:
             ]
 
             table = dmc.Table(table_header + table_body, striped=True, highlightOnHover=True)
-            total_pages = -(-len(all_file_details) // items_per_page)  # 올림 나눗셈
+            total_pages = -(-len(items) // items_per_page)  # 올림 나눗셈
 
             return table, total_pages
 
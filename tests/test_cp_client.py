@@ -0,0 +1,124 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from utils.cp_client import CrossProbeClient
+from utils.cp_stub_server import StubCPServer
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_for(predicate, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return
+        time.sleep(0.02)
+    raise AssertionError("timed out")
+
+
+@pytest.fixture
+def offline():
+    """아직 서버가 없는 포트로 연결하는 클라이언트 - server()로 나중에 서버를 띄움"""
+    port = free_port()
+    clients, servers = [], []
+
+    def client(**kwargs):
+        clients.append(CrossProbeClient("127.0.0.1", port, connect_timeout=1.0, max_backoff=0.1, **kwargs))
+        return clients[-1]
+
+    def server():
+        servers.append(StubCPServer(port=port, verbose=False).start())
+        return servers[-1]
+
+    yield client, server
+    for item in clients:
+        item.close()
+    for item in servers:
+        item.close()
+
+
+def test_sends_in_order():
+    server = StubCPServer(verbose=False).start()
+    client = CrossProbeClient(server.host, server.port)
+    try:
+        client.send("first\n", coalesce=False)
+        client.send(["second\n", "third\n"], coalesce=False)
+        wait_for(lambda: len(server.received) == 3)
+        assert server.received == ["first", "second", "third"]
+        wait_for(lambda: client.metrics()["sent"] == 2)
+    finally:
+        client.close()
+        server.close()
+
+
+def test_reconnects_and_delivers_queued_commands(offline):
+    make_client, make_server = offline
+    client = make_client()
+    client.send("zoom\n", coalesce=False)
+    wait_for(lambda: client.metrics()["reconnects"] > 0)
+    assert not client.connected
+
+    server = make_server()
+    wait_for(lambda: server.received == ["zoom"])
+    assert client.connected
+
+
+def test_coalesces_pending_selections(offline):
+    make_client, make_server = offline
+    client = make_client()
+    client.send("select 1\n")
+    client.send("fit\n", coalesce=False)
+    client.send("select 2\n")
+    client.send("select 3\n")
+
+    server = make_server()
+    wait_for(lambda: client.metrics()["queued"] == 0 and len(server.received) == 2)
+    assert server.received == ["fit", "select 3"]
+    assert client.metrics()["coalesced"] == 2
+
+
+def test_overflow_keeps_the_newest_commands(offline):
+    make_client, make_server = offline
+    client = make_client(max_queue=3)
+    for i in range(6):
+        client.send(f"command {i}\n", coalesce=False)
+    assert client.metrics()["queued"] <= 3
+
+    server = make_server()
+    wait_for(lambda: client.metrics()["queued"] == 0 and len(server.received) == 3)
+    assert server.received == ["command 3", "command 4", "command 5"]
+    assert client.metrics()["dropped"] == 3
+
+
+def test_failed_command_does_not_push_out_newer_ones(offline, monkeypatch):
+    make_client, make_server = offline
+    in_flight, release = threading.Event(), threading.Event()
+    original = CrossProbeClient._connect
+    calls = []
+
+    def gated_connect(self):
+        calls.append(None)
+        if len(calls) == 2:  # command 0을 꺼낸 뒤의 연결 시도
+            in_flight.set()
+            release.wait(5)
+        return original(self)
+
+    monkeypatch.setattr(CrossProbeClient, "_connect", gated_connect)
+    client = make_client(max_queue=3)
+    client.send("command 0\n", coalesce=False)
+    assert in_flight.wait(5)
+    for i in range(1, 4):
+        client.send(f"command {i}\n", coalesce=False)
+    release.set()
+    wait_for(lambda: client.metrics()["dropped"] == 1)
+
+    server = make_server()
+    wait_for(lambda: client.metrics()["queued"] == 0 and len(server.received) == 3)
+    assert server.received == ["command 1", "command 2", "command 3"]
@@ -0,0 +1,59 @@
+import os
+
+import polars as pl
+import pytest
+
+from utils.db_management import SSDF
+from utils.edit_history import EditHistory
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = EditHistory(memory_budget=0)  # 모든 항목을 디스크로 내보냄
+    history.spill_path = str(tmp_path)
+    SSDF.dataframe = pl.DataFrame({"uniqid": [0, 1, 2], "waiver": ["Result", "Result", "Result"]})
+    yield history
+    history.clear()
+
+
+def edit_waiver(value):
+    SSDF.dataframe = SSDF.dataframe.with_columns(pl.lit(value).alias("waiver"))
+
+
+def test_failed_undo_keeps_the_entry(history):
+    history.record("Fill", ["waiver"])
+    edit_waiver("Waiver")
+    spill_file = history._undo[-1]["spill_file"]
+    assert spill_file and os.path.exists(spill_file)
+
+    edited = SSDF.dataframe
+    SSDF.dataframe = edited.head(2)
+    with pytest.raises(ValueError):
+        history.undo()
+    assert history.can_undo and not history.can_redo
+    assert os.path.exists(spill_file)
+
+    SSDF.dataframe = edited
+    entry = history.undo()
+    assert entry["label"] == "Fill"
+    assert SSDF.dataframe["waiver"].to_list() == ["Result"] * 3
+    assert not os.path.exists(spill_file)
+    history.redo()
+    assert SSDF.dataframe["waiver"].to_list() == ["Waiver"] * 3
+
+
+def test_rename_is_undoable(history):
+    history.record("Fill", ["waiver"])
+    edit_waiver("Fixed")
+    history.record_rename("Rename Headers", {"waiver": "status"})
+    SSDF.dataframe = SSDF.dataframe.rename({"waiver": "status"})
+
+    assert history.undo()["renames"] == {"status": "waiver"}
+    assert SSDF.dataframe.columns == ["uniqid", "waiver"]
+    history.undo()
+    assert SSDF.dataframe["waiver"].to_list() == ["Result"] * 3
+
+    history.redo()
+    history.redo()
+    assert SSDF.dataframe.columns == ["uniqid", "status"]
+    assert SSDF.dataframe["status"].to_list() == ["Fixed"] * 3
@@ -0,0 +1,25 @@
+import os
+
+import polars as pl
+
+from utils.config import CONFIG
+
+from utils.file_operations import backup_parquet_dedup, list_parquet_backups, restore_parquet_backup
+
+
+def test_backups_in_the_same_second_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(CONFIG, "WORKSPACE", str(tmp_path))
+    file_path = str(tmp_path / "report.parquet")
+    versions = [pl.DataFrame({"uniqid": [0, 1], "waiver": [waiver, "Result"]}) for waiver in ("Result", "Waiver", "Fixed")]
+    mtime = os.path.getmtime(tmp_path)
+    manifests = []
+    for df in versions:
+        df.write_parquet(file_path)
+        os.utime(file_path, (mtime, mtime))  # 같은 초에 저장된 것처럼
+        manifests.append(backup_parquet_dedup(str(tmp_path), file_path))
+
+    assert len(set(manifests)) == 3
+    assert sorted(list_parquet_backups(file_path)) == sorted(manifests)
+    for manifest, df in zip(manifests, versions):
+        restore_parquet_backup(manifest, str(tmp_path / "restored.parquet"))
+        assert pl.read_parquet(tmp_path / "restored.parquet").equals(df)
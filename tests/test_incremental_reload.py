@@ -0,0 +1,217 @@
+import polars as pl
+import pytest
+
+from utils.config import CONFIG
+from utils.data_processing import validate_df
+from utils import incremental_reload
+from utils.incremental_reload import IncrementalReloader
+
+
+def write_csv(path, rows, waiver=False):
+    header = "name,value,waiver,user" if waiver else "name,value"
+    lines = [header] + [f"n{i},{i}" + (",Result," if waiver else "") for i in range(rows)]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def open_file(reloader, path):
+    df = validate_df(str(path))
+    reloader.record(str(path), df).join()
+    return df
+
+
+@pytest.fixture(autouse=True)
+def no_merge_key(monkeypatch):
+    monkeypatch.setattr(CONFIG, "WAIVER_MERGE_KEY", [])
+
+
+def test_reload_appended_rows_without_waiver_column(tmp_path):
+    path = tmp_path / "report.csv"
+    write_csv(path, 10)
+    reloader = IncrementalReloader()
+    local = open_file(reloader, path)
+
+    write_csv(path, 15)
+    df, message, intent = reloader.reload_with_local_waivers(str(path), local)
+
+    assert intent == "success"
+    assert df.height == 15
+    assert df["uniqid"].to_list() == list(range(15))
+    assert df["name"][-1] == "n14"
+
+
+def test_reload_appended_rows_with_waiver_column_and_no_merge_key(tmp_path):
+    path = tmp_path / "report.csv"
+    write_csv(path, 10, waiver=True)
+    reloader = IncrementalReloader()
+    local = open_file(reloader, path)
+    local = local.with_columns(
+        pl.when(pl.col("uniqid") == 3).then(pl.lit("Waiver")).otherwise(pl.col("waiver")).alias("waiver"),
+        pl.when(pl.col("uniqid") == 3).then(pl.lit(CONFIG.USERNAME)).otherwise(pl.col("user")).alias("user"),
+    )
+
+    write_csv(path, 15, waiver=True)
+    df, message, intent = reloader.reload_with_local_waivers(str(path), local)
+
+    # 행 위치로는 병합할 수 없으므로 파일 내용을 그대로 불러오고 경고
+    assert intent == "warning"
+    assert "local waivers not kept" in message
+    assert df.height == 15
+    assert df["waiver"].to_list() == ["Result"] * 15
+
+
+def test_reload_same_rows_keeps_local_waivers_by_position(tmp_path):
+    path = tmp_path / "report.csv"
+    write_csv(path, 10, waiver=True)
+    reloader = IncrementalReloader()
+    local = open_file(reloader, path)
+    local = local.with_columns(
+        pl.when(pl.col("uniqid") == 3).then(pl.lit("Waiver")).otherwise(pl.col("waiver")).alias("waiver"),
+        pl.when(pl.col("uniqid") == 3).then(pl.lit(CONFIG.USERNAME)).otherwise(pl.col("user")).alias("user"),
+    )
+
+    path.write_text(path.read_text().replace("n9,9", "n9,99"))
+    df, message, intent = reloader.reload_with_local_waivers(str(path), local)
+
+    assert intent == "success"
+    assert df["waiver"][3] == "Waiver"
+    assert df["value"][9] == 99
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """작은 파일도 여러 블록으로 나뉘도록 블록 크기를 줄임 (한 블록 약 8행)"""
+    monkeypatch.setattr(incremental_reload, "BLOCK_SIZE", 64)
+
+
+def edit_line(path, old, new):
+    path.write_text(path.read_text().replace(f"\n{old}\n", f"\n{new}\n"))
+
+
+def test_appended_rows_parse_only_the_tail(tmp_path, small_blocks):
+    path = tmp_path / "report.csv"
+    write_csv(path, 100)
+    reloader = IncrementalReloader()
+    open_file(reloader, path)
+
+    write_csv(path, 120)
+    df, stats = reloader.reload(str(path))
+
+    assert 80 <= stats["kept_rows"] < 100
+    assert stats["kept_rows"] + stats["parsed_rows"] == 120
+    assert df.equals(validate_df(str(path)))
+
+
+def test_edited_middle_block_keeps_the_prefix(tmp_path, small_blocks):
+    path = tmp_path / "report.csv"
+    write_csv(path, 100)
+    reloader = IncrementalReloader()
+    open_file(reloader, path)
+
+    edit_line(path, "n50,50", "n50,5000")
+    df, stats = reloader.reload(str(path))
+
+    assert 0 < stats["kept_rows"] <= 50
+    assert df["value"][50] == 5000
+    assert df.equals(validate_df(str(path)))
+
+    # 새 프레임 기준으로 다시 기록되므로 이어지는 reload도 증분으로 처리
+    edit_line(path, "n90,90", "n90,9000")
+    df, stats = reloader.reload(str(path))
+    assert stats["kept_rows"] > 50
+    assert df["value"].to_list()[50::40] == [5000, 9000]
+
+
+def test_truncated_file_drops_rows(tmp_path, small_blocks):
+    path = tmp_path / "report.csv"
+    write_csv(path, 100)
+    reloader = IncrementalReloader()
+    open_file(reloader, path)
+
+    write_csv(path, 40)
+    df, stats = reloader.reload(str(path))
+
+    assert df.height == 40
+    assert df.equals(validate_df(str(path)))
+
+
+def test_unchanged_file_reuses_the_loaded_frame(tmp_path, small_blocks):
+    path = tmp_path / "report.csv"
+    write_csv(path, 100)
+    reloader = IncrementalReloader()
+    loaded = open_file(reloader, path)
+
+    df, stats = reloader.reload(str(path))
+    assert df is loaded and stats == {"kept_rows": 100, "parsed_rows": 0}
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda path: path.write_text(path.read_text().replace("name,value", "name,value2", 1)),  # 헤더 변경
+        lambda path: edit_line(path, "n90,90", "n90,abc"),  # 뒤쪽 블록의 타입 변경
+    ],
+    ids=["header", "dtype"],
+)
+def test_falls_back_to_full_read(tmp_path, small_blocks, change):
+    path = tmp_path / "report.csv"
+    write_csv(path, 100)
+    reloader = IncrementalReloader()
+    local = open_file(reloader, path)
+
+    change(path)
+    assert reloader.reload(str(path)) is None
+
+    df, message, intent = reloader.reload_with_local_waivers(str(path), local)
+    assert intent == "success" and message == "Reloaded 100 rows"
+    assert df.equals(validate_df(str(path)))
+
+
+def test_unrecorded_file_is_read_in_full(tmp_path):
+    path = tmp_path / "report.csv"
+    write_csv(path, 10)
+    reloader = IncrementalReloader()
+    assert reloader.reload(str(path)) is None
+
+    open_file(reloader, path)
+    other = tmp_path / "other.csv"
+    write_csv(other, 10)
+    open_file(reloader, other)
+    assert reloader.reload(str(path)) is None  # 다른 파일을 열면 이전 파일의 기록은 버림
+
+
+def test_parquet_appended_row_groups(tmp_path):
+    path = tmp_path / "report.parquet"
+    rows = pl.DataFrame({"name": [f"n{i}" for i in range(30)], "value": list(range(30))})
+    rows.head(20).write_parquet(path, row_group_size=10)
+    reloader = IncrementalReloader()
+    open_file(reloader, path)
+
+    rows.write_parquet(path, row_group_size=10)
+    df, stats = reloader.reload(str(path))
+
+    assert stats == {"kept_rows": 20, "parsed_rows": 10}
+    assert df.equals(validate_df(str(path)))
+
+
+def test_reload_merges_local_waivers_by_natural_key(tmp_path, small_blocks, monkeypatch):
+    monkeypatch.setattr(CONFIG, "WAIVER_MERGE_KEY", ["name"])
+    path = tmp_path / "report.csv"
+    write_csv(path, 100, waiver=True)
+    reloader = IncrementalReloader()
+    local = open_file(reloader, path)
+    edited = pl.col("name").is_in(["n10", "n95"])
+    local = local.with_columns(
+        pl.when(edited).then(pl.lit("Waiver")).otherwise(pl.col("waiver")).alias("waiver"),
+        pl.when(edited).then(pl.lit(CONFIG.USERNAME)).otherwise(pl.col("user")).alias("user"),
+    )
+
+    # 뒤쪽에 행이 추가되고 중간 행이 바뀌어도 waiver는 이름으로 따라감
+    write_csv(path, 110, waiver=True)
+    edit_line(path, "n95,95,Result,", "n95,950,Result,")
+    df, message, intent = reloader.reload_with_local_waivers(str(path), local)
+
+    assert intent == "success" and "incrementally" in message
+    assert df.height == 110
+    assert df.filter(pl.col("waiver") == "Waiver")["name"].to_list() == ["n10", "n95"]
+    assert df.filter(pl.col("name") == "n95")["value"].to_list() == [950]
+    assert df["waiver"].to_list().count("Result") == 108
@@ -0,0 +1,66 @@
+import os
+import stat
+import time
+
+import polars as pl
+import pytest
+
+from utils.config import CONFIG
+from utils.llm_cache import AnswerCache, normalize_prompt, schema_fingerprint
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnswerCache(str(tmp_path / "llm"))
+
+
+def test_equivalent_prompts_share_a_key():
+    assert normalize_prompt("  How many   rows?") == normalize_prompt("how many rows")
+    fingerprint = schema_fingerprint(pl.LazyFrame({"a": [1]}))
+    key = AnswerCache.key("How many rows?", [], fingerprint, "model")
+    assert AnswerCache.key("how many rows", [], fingerprint, "model") == key
+    assert AnswerCache.key("how many rows", [], fingerprint, "other-model") != key
+    assert AnswerCache.key("how many rows", [], schema_fingerprint(pl.LazyFrame({"a": ["x"]})), "model") != key
+
+
+def test_cache_directory_and_secret_are_private(tmp_path, cache):
+    assert stat.S_IMODE(os.stat(tmp_path / "llm").st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(tmp_path / "llm" / "secret").st_mode) == 0o600
+
+
+def test_round_trip(cache):
+    cache.set("k", "answer", "result = 1")
+    assert cache.get("k")["code"] == "result = 1"
+    assert cache.get("missing") is None
+
+
+def test_tampered_entry_is_rejected_and_deleted(cache):
+    cache.set("k", "answer", "result = 1")
+    entry = cache.cache.get("k")
+    entry["code"] = "result = lf"
+    cache.cache.set("k", entry)
+
+    assert cache.get("k") is None
+    assert "k" not in cache.cache
+
+
+def test_entry_signed_with_another_secret_is_rejected(tmp_path, cache):
+    cache.set("k", "answer", "result = 1")
+    os.remove(tmp_path / "llm" / "secret")
+    assert AnswerCache(str(tmp_path / "llm")).get("k") is None
+
+
+def test_entries_expire_after_ttl(cache, monkeypatch):
+    monkeypatch.setattr(CONFIG, "LLM_CACHE_TTL", 1)
+    cache.set("k", "answer", None)
+    assert cache.get("k") is not None
+    time.sleep(1.2)
+    assert cache.get("k") is None
+
+
+def test_oldest_entries_are_evicted(cache, monkeypatch):
+    monkeypatch.setattr(CONFIG, "LLM_CACHE_MAX_ENTRIES", 2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key, None)
+    assert cache.get("a") is None
+    assert cache.get("b")["answer"] == "b" and cache.get("c")["answer"] == "c"
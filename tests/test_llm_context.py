@@ -0,0 +1,73 @@
+import polars as pl
+import pytest
+
+from utils.db_management import SSDF
+from utils.llm_context import ContextBuilder, analysis_frame, build_messages, extract_code
+
+
+@pytest.fixture
+def report():
+    df = pl.DataFrame(
+        {
+            "uniqid": [0, 1, 2, 3, 4],
+            "cell": ["INV", "INV", "NAND", "NOR", "INV"],
+            "slack": [-0.5, 0.25, 1.0, -2.0, 0.75],
+            "waiver": ["Result", "Waiver.", "Fixed.", "Result", "Waiver"],
+        }
+    )
+    SSDF.dataframe = df
+    SSDF.hide_waiver = False
+    SSDF.request = {}
+    yield df
+    SSDF.request = {}
+
+
+def test_extract_code_takes_last_python_block():
+    answer = "Try this:\n```python\nresult = 1\n```\nor better:\n```py\nresult = lf.select(pl.len())\n```"
+    assert extract_code(answer) == "result = lf.select(pl.len())"
+    assert extract_code("No code here.") is None
+
+
+def test_build_messages_puts_profile_in_system_prompt():
+    messages = build_messages("PROFILE", "How many rows?", [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}])
+    assert messages[0]["role"] == "system" and "PROFILE" in messages[0]["content"]
+    assert [message["role"] for message in messages[1:]] == ["user", "assistant", "user"]
+    assert messages[-1]["content"] == "How many rows?"
+
+
+def test_profile_summarizes_columns_and_groups(report):
+    SSDF.request = {"rowGroupCols": [{"id": "cell"}]}
+    profile = ContextBuilder(top_k=2).profile(report.lazy().drop("uniqid"))
+
+    assert profile["rows"] == 5 and profile["total_columns"] == 3
+    columns = {info["name"]: info for info in profile["columns"]}
+    assert columns["slack"]["min"] == -2.0 and columns["slack"]["max"] == 1.0
+    assert columns["cell"]["top"] == [("INV", 3), ("NAND", 1)] or columns["cell"]["top"][0] == ("INV", 3)
+    assert columns["cell"]["unique"] == 3
+    assert profile["groups"]["by"] == ["cell"] and profile["groups"]["top"][0] == ("INV", 3)
+
+    text = ContextBuilder.profile_text(profile)
+    assert "5 rows, 3 columns" in text and "waiver status distribution" in text
+
+
+def test_context_is_cached_per_view_key(report):
+    builder = ContextBuilder()
+    first = builder.context("key", report.lazy())
+    assert builder.context("key", report.lazy().head(1)) == first
+    assert builder.context("other", report.lazy().head(1)) != first
+
+
+def test_analysis_frame_applies_filter_and_waiver_display(report):
+    SSDF.hide_waiver = True
+    SSDF.request = {"filterModel": {"filterType": "number", "colId": "slack", "type": "greaterThan", "filter": 0}}
+    df = analysis_frame().collect()
+    assert "uniqid" not in df.columns
+    assert df["waiver"].to_list() == ["Waiver", "Fixed", "Waiver"]
+
+
+def test_stub_answer_code_runs_in_sandbox(report):
+    from utils.llm_context import run_analysis_code
+    from utils.llm_stub_server import DEFAULT_ANSWER
+
+    result = run_analysis_code(extract_code(DEFAULT_ANSWER), analysis_frame(), key="stub")
+    assert result["rows"].to_list() == [5]
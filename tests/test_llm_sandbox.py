@@ -0,0 +1,95 @@
+import os
+
+import polars as pl
+import pytest
+
+from utils import llm_sandbox
+from utils.llm_sandbox import FrameStore, UnsafeCodeError, run_sandboxed, safe_polars, validate_code
+
+
+@pytest.fixture
+def lf():
+    return pl.DataFrame({"a": [1, 2, 3], "w": ["x", "y", "x"]}).lazy()
+
+
+@pytest.fixture
+def secret_csv(tmp_path):
+    path = tmp_path / "leak.csv"
+    path.write_text("secret\nvalue\n")
+    return path
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import os",
+        "from os import path",
+        "result = __import__('os')",
+        "result = lf.__class__",
+        "result = pl.read_csv('{path}')",
+        "result = pl.scan_csv('{path}').collect()",
+        "result = pl.read_parquet('{path}')",
+        "lf.collect().write_csv('{path}')",
+        "lf.sink_parquet('{path}')",
+        "result = pl.sql(\"SELECT * FROM read_csv('{path}')\").collect()",
+        "result = pl.SQLContext().execute(\"SELECT * FROM read_csv('{path}')\").collect()",
+        "result = lf.sql(\"SELECT * FROM read_csv('{path}')\")",
+        "result = pl.sql_expr('a')",
+        "result = pl.Config",
+    ],
+)
+def test_rejects_unsafe_code(code, lf, secret_csv):
+    code = code.format(path=secret_csv)
+    with pytest.raises(UnsafeCodeError):
+        validate_code(code)
+    with pytest.raises(UnsafeCodeError):
+        run_sandboxed(code, lf, timeout=30, row_limit=1000)
+
+
+def test_safe_polars_hides_io_sql_and_modules():
+    names = vars(safe_polars())
+    for name in ("sql", "sql_expr", "SQLContext", "read_csv", "scan_parquet", "Config", "Catalog", "os", "io"):
+        assert name not in names
+    assert "col" in names and "DataFrame" in names
+
+
+@pytest.mark.parametrize("code", ["result = open('{path}').read()", "result = eval('1')", "result = exec('x = 1')", "result = compile('1', 'x', 'eval')"])
+def test_dangerous_builtins_are_missing(code, lf, secret_csv):
+    with pytest.raises(RuntimeError, match="NameError"):
+        run_sandboxed(code.format(path=secret_csv), lf, timeout=30, row_limit=1000)
+
+
+def test_runs_polars_code_and_limits_rows(lf):
+    result = run_sandboxed('result = lf.group_by("w").len().sort("w")', lf, timeout=30, row_limit=1000)
+    assert result.to_dicts() == [{"w": "x", "len": 2}, {"w": "y", "len": 1}]
+    assert run_sandboxed("result = lf", lf, timeout=30, row_limit=2).height == 2
+    assert run_sandboxed('result = lf.select(pl.col("a").sum()).collect().item()', lf, timeout=30, row_limit=1000) == 6
+
+
+def test_rejects_non_frame_results(lf):
+    with pytest.raises(RuntimeError, match="result"):
+        run_sandboxed("result = [1, 2]", lf, timeout=30, row_limit=1000)
+
+
+def test_timeout(lf):
+    with pytest.raises(TimeoutError):
+        run_sandboxed("while True:\n    pass", lf, timeout=2, row_limit=1000)
+
+
+def test_frame_file_is_written_once_per_view_key(lf):
+    store = FrameStore(max_frames=2)
+    first = store.path(("view", 1), lf)
+    assert store.path(("view", 1), lf) == first
+    assert pl.read_ipc(first).height == 3
+
+    store.path(("view", 2), lf)
+    store.path(("view", 3), lf)
+    assert not os.path.exists(first)  # 가장 오래된 보기 파일은 삭제
+
+
+def test_run_reuses_view_file(lf, monkeypatch):
+    store = FrameStore()
+    monkeypatch.setattr(llm_sandbox, "FRAME_STORE", store)
+    run_sandboxed("result = lf", lf.filter(pl.col("a") > 1), timeout=30, row_limit=1000, key="view")
+    # 같은 키면 다시 기록하지 않으므로 이후 lf가 달라도 처음 기록한 보기로 실행
+    assert run_sandboxed("result = lf", lf, timeout=30, row_limit=1000, key="view").height == 2
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from utils.llm_stream import LLMStreamer
+from utils.llm_stub_server import DEFAULT_ANSWER, serve
+
+
+def start_server(**kwargs):
+    server = serve(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v1"
+
+
+def wait_for(streamer, job_id, predicate, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = streamer.status(job_id)
+        if predicate(status):
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f"timed out: {streamer.status(job_id)}")
+
+
+@pytest.fixture
+def stub():
+    server, api_base = start_server(token_delay=0.001)
+    yield server, api_base
+    server.shutdown()
+    server.server_close()
+
+
+def test_streams_answer_tokens(stub):
+    server, api_base = stub
+    streamer = LLMStreamer()
+    job_id = streamer.start(api_base, "stub-model", [{"role": "user", "content": "rows?"}])
+
+    status = wait_for(streamer, job_id, lambda status: status["state"] != "running")
+    assert status["state"] == "done"
+    assert status["text"] == DEFAULT_ANSWER
+    request = server.RequestHandlerClass.requests[-1]
+    assert request["stream"] is True and request["model"] == "stub-model"
+
+
+def test_cancel_closes_the_stream():
+    answer = " ".join(f"token{i}" for i in range(200))
+    server, api_base = start_server(answer=answer, token_delay=0.05)
+    try:
+        streamer = LLMStreamer()
+        job_id = streamer.start(api_base, "stub-model", [{"role": "user", "content": "long"}])
+        wait_for(streamer, job_id, lambda status: status["text"])
+        streamer.cancel(job_id)
+
+        status = wait_for(streamer, job_id, lambda status: status["state"] != "running")
+        assert status["state"] == "cancelled"
+        assert 0 < len(status["text"]) < len(answer)
+        assert status["error"] is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unreachable_server_fails():
+    server, api_base = start_server()
+    server.shutdown()
+    server.server_close()
+
+    streamer = LLMStreamer()
+    job_id = streamer.start(api_base, "stub-model", [{"role": "user", "content": "rows?"}])
+    status = wait_for(streamer, job_id, lambda status: status["state"] != "running")
+    assert status["state"] == "failed" and status["error"]
+
+
+def test_finished_jobs_are_pruned(stub):
+    _, api_base = stub
+    streamer = LLMStreamer(max_finished=2)
+    job_ids = []
+    for _ in range(4):
+        job_ids.append(streamer.start(api_base, "stub-model", [{"role": "user", "content": "rows?"}]))
+        wait_for(streamer, job_ids[-1], lambda status: status["state"] == "done")
+    assert streamer.status(job_ids[0]) is None
+    assert streamer.status(job_ids[-1])["state"] == "done"
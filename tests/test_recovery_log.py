@@ -0,0 +1,17 @@
+import polars as pl
+
+from utils.recovery_log import RecoveryLog
+
+
+def test_release_drops_reference_but_keeps_log(tmp_path):
+    log = RecoveryLog(str(tmp_path / "report_recovery"))
+    df = pl.DataFrame({"uniqid": [0, 1, 2], "waiver": ["Result", "Result", "Result"]})
+    assert log.checkpoint(df, 1) == "base"
+    edited = df.with_columns(pl.when(pl.col("uniqid") == 1).then(pl.lit("Waiver")).otherwise(pl.col("waiver")).alias("waiver"))
+    assert log.checkpoint(edited, 2) == "delta"
+
+    log.release()
+    assert log._reference is None and log.version is None
+    assert log.load().equals(edited)
+    assert log.checkpoint(edited, 2) == "base"
+    assert log.load().equals(edited)
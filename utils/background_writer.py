@@ -0,0 +1,118 @@
+import os
+import uuid
+import time
+import queue
+import threading
+import polars as pl
+from typing import Dict, Any, List, Callable, Optional
+from utils.config import CONFIG
+from utils.file_operations import fsync_path
+from utils.logging_utils import logger
+
+
+def write_parquet(df: pl.DataFrame, file_path: str, progress: Optional[Callable[[float], None]] = None, **options) -> None:
+    """CONFIG.PARQUET_OPTIONS(코덱/레벨/row group 크기/통계)로 parquet 기록
+
+    row group 단위로 나누어 쓰면서 progress(0~1)를 보고하고, 임시 파일에 다 쓰고 fsync한 뒤 os.replace로 교체합니다.
+    쓰는 도중 중단되어도 기존 파일은 그대로 남습니다.
+    """
+    options = {**CONFIG.PARQUET_OPTIONS, **options}
+    row_group_size = max(1, options.pop("row_group_size"))
+    tmp_path = f"{file_path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        try:
+            import pyarrow.parquet as pq
+
+            table = df.to_arrow()
+            with pq.ParquetWriter(
+                tmp_path,
+                table.schema,
+                compression=options["compression"],
+                compression_level=options["compression_level"],
+                write_statistics=options["statistics"],
+            ) as writer:
+                for offset in range(0, max(table.num_rows, 1), row_group_size):
+                    writer.write_table(table.slice(offset, row_group_size))
+                    if progress:
+                        progress(min(1.0, (offset + row_group_size) / max(table.num_rows, 1)))
+        except ImportError:
+            # pyarrow가 없으면 polars 기본 writer 사용 (진행률은 완료 시점에만 보고)
+            df.write_parquet(tmp_path, row_group_size=row_group_size, **options)
+        fsync_path(tmp_path)
+        os.replace(tmp_path, file_path)
+        fsync_path(os.path.dirname(os.path.abspath(file_path)))
+        if progress:
+            progress(1.0)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class BackgroundWriter:
+    """파일 쓰기 작업을 요청 스레드 밖의 단일 작업 스레드에서 순서대로 실행
+
+    콜백은 submit()으로 작업을 넘기고 곧바로 반환하며, UI는 status()를 주기적으로 조회해
+    진행률과 완료/실패를 표시합니다. 작업에는 polars DataFrame(불변) 스냅샷을 넘기므로
+    쓰는 도중 SSDF.dataframe이 교체되어도 영향이 없습니다.
+    """
+
+    def __init__(self, max_finished: int = 100):
+        self.max_finished = max_finished
+        self._queue: queue.Queue = queue.Queue()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, label: str, task: Callable[..., Any], *args, **kwargs) -> str:
+        """task(progress, *args, **kwargs)를 작업 큐에 넣고 job id 반환"""
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._jobs[job_id] = {"id": job_id, "label": label, "state": "queued", "progress": 0.0, "result": None, "error": None, "submitted": time.time()}
+            self._prune()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((job_id, task, args, kwargs))
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def statuses(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        return [job for job in (self.status(job_id) for job_id in job_ids) if job]
+
+    def is_pending(self, job_id: str) -> bool:
+        job = self.status(job_id)
+        return job is not None and job["state"] in ("queued", "running")
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _run(self) -> None:
+        while True:
+            job_id, task, args, kwargs = self._queue.get()
+            self._update(job_id, state="running")
+            try:
+                result = task(lambda fraction: self._update(job_id, progress=fraction), *args, **kwargs)
+                self._update(job_id, state="done", progress=1.0, result=result, finished=time.time())
+            except Exception as e:
+                logger.error(f"백그라운드 쓰기 실패 ({self._jobs.get(job_id, {}).get('label')}): {e}")
+                self._update(job_id, state="failed", error=str(e), finished=time.time())
+            finally:
+                self._queue.task_done()
+
+    def _prune(self) -> None:
+        """끝난 작업 기록이 너무 많아지면 오래된 것부터 삭제"""
+        finished = sorted(
+            (job for job in self._jobs.values() if job["state"] in ("done", "failed")),
+            key=lambda job: job["submitted"],
+        )
+        for job in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job["id"]]
+
+
+BACKGROUND_WRITER = BackgroundWriter()
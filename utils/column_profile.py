@@ -0,0 +1,113 @@
+import threading
+import polars as pl
+from typing import Dict, Any, List, Optional, Iterable
+from utils.db_management import SSDF
+from utils.logging_utils import logger
+
+
+NUMERIC_DTYPES = [pl.Float64, pl.Float32, pl.Int64, pl.Int32, pl.UInt32, pl.UInt64]
+SENTINEL_VALUE = -99999
+UNIQUE_SAMPLE_SIZE = 1000
+
+
+class ColumnProfileService:
+    """컬럼별 통계(null, -99999 임시값, 변환 가능 비율, 샘플 등)를 한 번의 select로 계산하고
+    SSDF.version 단위로 캐시합니다. 컬럼 단위 편집 후에는 invalidate()로 해당 컬럼만 재계산합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._dirty: set = set()
+
+    def get(self, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """요청한 컬럼의 프로파일 반환 (캐시가 없거나 오래된 컬럼만 재계산)"""
+        df = SSDF.dataframe
+        if df is None or df.is_empty():
+            return {}
+
+        with self._lock:
+            if self._version != SSDF.version:
+                self._profiles.clear()
+                self._dirty.clear()
+                self._version = SSDF.version
+
+            for col in [col for col in self._profiles if col not in df.columns]:
+                del self._profiles[col]
+
+            stale = [
+                col
+                for col in df.columns
+                if col != "uniqid" and (col not in self._profiles or col in self._dirty or self._profiles[col]["dtype"] != df[col].dtype)
+            ]
+            if stale:
+                self._profiles.update(self._compute(df, stale))
+            self._dirty.clear()
+
+            targets = df.columns if columns is None else columns
+            return {col: self._profiles[col] for col in targets if col in self._profiles}
+
+    def invalidate(self, columns: Optional[Iterable[str]] = None) -> None:
+        """SSDF.dataframe 교체 직후 호출 - 변경된 컬럼만 다음 조회 시 재계산
+
+        캐시가 직전 버전이 아니면(중간에 추적되지 않은 변경이 있었으면) 전체를 다시 계산합니다.
+        """
+        with self._lock:
+            if columns is None or self._version != SSDF.version - 1:
+                self._profiles.clear()
+                self._dirty.clear()
+                self._version = None
+                return
+            self._dirty.update(columns)
+            self._version = SSDF.version
+
+    @staticmethod
+    def _column_exprs(col: str, dtype) -> List[pl.Expr]:
+        exprs = [
+            pl.col(col).null_count().alias(f"{col}\x00null_count"),
+            pl.col(col).drop_nulls().first().cast(pl.Utf8).alias(f"{col}\x00sample"),
+            pl.col(col).head(UNIQUE_SAMPLE_SIZE).n_unique().alias(f"{col}\x00sample_unique"),
+        ]
+        if dtype in NUMERIC_DTYPES:
+            exprs.append((pl.col(col) == SENTINEL_VALUE).sum().alias(f"{col}\x00sentinel_count"))
+        elif dtype in [pl.Utf8, pl.String]:
+            exprs.append(pl.col(col).cast(pl.Float64, strict=False).is_not_null().sum().alias(f"{col}\x00numeric_count"))
+        return exprs
+
+    def _compute(self, df: pl.DataFrame, columns: List[str]) -> Dict[str, Dict[str, Any]]:
+        """모든 대상 컬럼의 통계 표현식을 한 번의 select로 병렬 실행"""
+        schema = df.schema
+        try:
+            row = df.select([expr for col in columns for expr in self._column_exprs(col, schema[col])]).row(0, named=True)
+        except Exception as e:
+            # 일부 컬럼 표현식 실패 시 컬럼 단위로 분리하여 나머지는 계속 계산
+            logger.error(f"컬럼 프로파일 일괄 계산 실패, 컬럼별로 재시도: {e}")
+            row = {}
+            for col in columns:
+                try:
+                    row.update(df.select(self._column_exprs(col, schema[col])).row(0, named=True))
+                except Exception as col_error:
+                    logger.error(f"컬럼 {col} 프로파일 계산 실패: {col_error}")
+
+        profiles = {}
+        total_count = df.height
+        for col in columns:
+            if f"{col}\x00null_count" not in row:
+                continue
+            null_count = row[f"{col}\x00null_count"]
+            non_null_count = total_count - null_count
+            numeric_count = row.get(f"{col}\x00numeric_count")
+            profiles[col] = {
+                "dtype": schema[col],
+                "total_count": total_count,
+                "null_count": null_count,
+                "sentinel_count": row.get(f"{col}\x00sentinel_count", 0) or 0,
+                "numeric_ratio": (numeric_count / non_null_count if non_null_count else 0.0) if numeric_count is not None else None,
+                "sample": row[f"{col}\x00sample"],
+                "sample_size": min(UNIQUE_SAMPLE_SIZE, total_count),
+                "sample_unique": row[f"{col}\x00sample_unique"],
+            }
+        return profiles
+
+
+COLUMN_PROFILES = ColumnProfileService()
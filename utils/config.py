@@ -13,6 +13,24 @@ class Config:
         self.SCRIPT = os.getenv("SCRIPT_PATH", "/user/verifier14/deepwonwoo/Release/scripts")
         self.USER_RV_DIR, self.APPCACHE = self.get_user_rv_dir(self.USERNAME)
         self.CP_CFG = "/user/signoff.dev/lsj/CP/.sorv_cp.cfg"
+        # CrossProbe 명령 하나의 최대 크기와, 두 번째 명령부터 기존 선택에 추가할 때 붙이는 옵션 (비어 있으면 나누지 않음)
+        # 추가 옵션은 받는 툴의 select 명령이 지원하는 것을 확인한 환경에서만 설정 (예: RV_CP_APPEND_OPTION=-add)
+        self.CP_MAX_MESSAGE_BYTES = int(os.getenv("RV_CP_MAX_MESSAGE_BYTES", str(64 * 1024)))
+        self.CP_APPEND_OPTION = os.getenv("RV_CP_APPEND_OPTION", "")
+        self.PARQUET_OPTIONS = {
+            "compression": os.getenv("RV_PARQUET_COMPRESSION", "zstd"),
+            "compression_level": int(os.getenv("RV_PARQUET_COMPRESSION_LEVEL", "3")),
+            "row_group_size": int(os.getenv("RV_PARQUET_ROW_GROUP_SIZE", str(512 * 1024))),
+            "statistics": True,
+        }
+        # waiver 병합 시 행을 맞추는 자연 키 (쉼표 구분, 비어 있으면 uniqid 사용)
+        self.WAIVER_MERGE_KEY = [col for col in os.getenv("RV_WAIVER_MERGE_KEY", "").split(",") if col]
+        # AI Analysis 답변 캐시 (사용자 전용 디렉터리에 저장) 위치, 유지 시간(초)과 최대 개수
+        self.LLM_CACHE_DIR = os.getenv("RV_LLM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ResultViewer", "llm"))
+        self.LLM_CACHE_TTL = int(os.getenv("RV_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+        self.LLM_CACHE_MAX_ENTRIES = int(os.getenv("RV_LLM_CACHE_MAX_ENTRIES", "500"))
+        # AI Analysis 생성 코드 실행 제한 시간(초)
+        self.LLM_CODE_TIMEOUT = float(os.getenv("RV_LLM_CODE_TIMEOUT", "60"))
 
     def get_user_rv_dir(self, username=os.getenv("USER")) -> str:
         def make_cache_dir(dir_path: str) -> dc.Cache:
@@ -0,0 +1,138 @@
+import time
+import socket
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Union
+from utils.logging_utils import logger
+
+
+class CrossProbeClient:
+    """CrossProbe(CP) 서버로 명령을 보내는 백그라운드 송신기
+
+    콜백은 send()로 큐에 넣고 바로 반환하며, 송신 스레드 하나가 연결을 유지하면서 순서대로 보냅니다.
+    - 연결이 끊기면 지수 백오프(최대 max_backoff초)로 재연결하고, 보내던 명령은 한 번 다시 시도합니다.
+    - coalesce=True 명령(행 선택)은 아직 보내지 않은 이전 선택을 대체하므로 연속 클릭 시 마지막 선택만 전송됩니다.
+    - 큐는 max_queue개로 제한되며 넘치면 가장 오래된 명령을 버립니다. 재시도로 되돌리는 명령은 큐의 어떤 명령보다 오래되었으므로
+      큐가 가득 차 있거나 그 뒤에 새 선택이 들어와 있으면 되돌리지 않고 버립니다.
+    """
+
+    def __init__(self, host: str, port: int, connect_timeout: float = 5.0, max_backoff: float = 30.0, max_queue: int = 64):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.max_backoff = max_backoff
+        self.max_queue = max_queue
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._socket: Optional[socket.socket] = None
+        self._closed = False
+        self._metrics: Dict[str, Any] = {"sent": 0, "coalesced": 0, "dropped": 0, "failed": 0, "reconnects": 0, "last_latency_ms": None, "avg_latency_ms": None}
+        self._thread = threading.Thread(target=self._run, name="cp-sender", daemon=True)
+        self._thread.start()
+
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._condition:
+            return {**self._metrics, "queued": len(self._queue), "connected": self.connected}
+
+    def send(self, messages: Union[str, List[str]], coalesce: bool = True) -> None:
+        """명령(또는 순서대로 나눠 보낼 명령 묶음)을 송신 큐에 추가"""
+        if isinstance(messages, str):
+            messages = [messages]
+        with self._condition:
+            if coalesce:
+                stale = [item for item in self._queue if item["coalesce"]]
+                for item in stale:
+                    self._queue.remove(item)
+                self._metrics["coalesced"] += len(stale)
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self._metrics["dropped"] += 1
+            self._queue.append({"messages": messages, "coalesce": coalesce, "enqueued": time.monotonic(), "retried": False})
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._disconnect()
+
+    def _connect(self) -> bool:
+        try:
+            client_socket = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._socket = client_socket
+            logger.info("Successfully connected to CP server.")
+            return True
+        except OSError as e:
+            logger.error(f"Failed to connect to CP server: {e}")
+            return False
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError as e:
+                logger.error(f"Error closing connection: {e}")
+            self._socket = None
+
+    def _run(self) -> None:
+        backoff = 0.5
+        self._connect()
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                item = self._queue.popleft()
+
+            if self._socket is None and not self._connect():
+                with self._condition:
+                    self._requeue(item)
+                    self._metrics["reconnects"] += 1
+                    self._condition.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = 0.5
+
+            try:
+                for i, message in enumerate(item["messages"]):
+                    if i and item["coalesce"] and self._superseded():
+                        # 나눠 보내는 중 새 선택이 들어오면 남은 명령은 버림
+                        logger.info(f"CP batch superseded after {i}/{len(item['messages'])} chunk(s)")
+                        break
+                    self._socket.sendall(message.encode())
+                self._record_latency(item)
+                logger.info(f"CP message: {item['messages'][0].strip()[:200]} ({len(item['messages'])} chunk(s))")
+            except OSError as e:
+                logger.error(f"Failed to send message: {e}")
+                self._disconnect()
+                with self._condition:
+                    self._metrics["failed"] += 1
+                    if not item["retried"]:
+                        item["retried"] = True
+                        self._requeue(item)
+
+    def _requeue(self, item: Dict[str, Any]) -> None:
+        """보내지 못한 명령을 큐 맨 앞으로 되돌림 (self._condition을 잡은 상태에서 호출)"""
+        if item["coalesce"] and any(queued["coalesce"] for queued in self._queue):
+            self._metrics["coalesced"] += 1
+        elif len(self._queue) >= self.max_queue:
+            self._metrics["dropped"] += 1
+        else:
+            self._queue.appendleft(item)
+
+    def _superseded(self) -> bool:
+        with self._condition:
+            return any(item["coalesce"] for item in self._queue)
+
+    def _record_latency(self, item: Dict[str, Any]) -> None:
+        latency = (time.monotonic() - item["enqueued"]) * 1000
+        with self._condition:
+            sent = self._metrics["sent"] + 1
+            average = self._metrics["avg_latency_ms"] or 0.0
+            self._metrics.update(sent=sent, last_latency_ms=round(latency, 1), avg_latency_ms=round(average + (latency - average) / sent, 1))
@@ -0,0 +1,75 @@
+"""CrossProbe 서버 대용 로컬 TCP 서버 (레이아웃 툴 없이 CrossProbe 동작 확인용)
+
+사용법:
+    python -m utils.cp_stub_server --port 5555 --delay 0.2
+    python app.py -csv report.csv -host 127.0.0.1 -port 5555 -lib LIB -cell CELL -tool TOOL
+
+받은 명령을 한 줄씩 출력하며, --delay로 느린 툴의 명령 처리 시간을 흉내 냅니다.
+"""
+import time
+import socket
+import argparse
+import threading
+from typing import List
+
+
+class StubCPServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, verbose: bool = True):
+        self.delay = delay
+        self.verbose = verbose
+        self.received: List[str] = []
+        self._server = socket.create_server((host, port))
+        self.host, self.port = self._server.getsockname()[:2]
+        self._thread = threading.Thread(target=self._serve, name="cp-stub-server", daemon=True)
+
+    def start(self) -> "StubCPServer":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.close()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: socket.socket) -> None:
+        buffer = b""
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                buffer += data
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    command = line.decode(errors="replace")
+                    self.received.append(command)
+                    if self.verbose:
+                        print(f"[CP] {command[:200]}{' ...' if len(command) > 200 else ''} ({len(line):,} bytes)", flush=True)
+                    if self.delay:
+                        time.sleep(self.delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CrossProbe stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", default=5555, type=int)
+    parser.add_argument("--delay", default=0.0, type=float, help="명령 하나당 처리 지연(초)")
+    args = parser.parse_args()
+
+    server = StubCPServer(args.host, args.port, args.delay).start()
+    print(f"CP stand-in server listening on {server.host}:{server.port}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
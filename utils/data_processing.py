@@ -1,3 +1,6 @@
+import os
+import gzip
+import uuid
 import polars as pl
 from collections import Counter
 from components.grid.dag.server_side_operations import (
@@ -5,7 +8,9 @@ from components.grid.dag.server_side_operations import (
     apply_group,
     apply_sort,
 )
+from components.grid.dag.SSRM.apply_filter import filter_expression
 from utils.db_management import SSDF
+from utils.edit_history import EDIT_HISTORY
 from utils.logging_utils import logger
 from utils.config import CONFIG
 
@@ -14,6 +19,7 @@ def file2df(csv_file_path):
     try:
         df = validate_df(csv_file_path)
         SSDF.dataframe = df
+        EDIT_HISTORY.clear()
         SSDF.release_lock()
         return df
     except Exception as e:
@@ -21,44 +27,93 @@ def file2df(csv_file_path):
         raise
 
 
-def validate_df(filename):
+def detect_separator(file_path, sample_lines=10):
+    possible_separators = [",", ";", "\t", " ", "|"]
+    separator_counts = Counter()
+    with open(file_path, "r") as file:
+        for _ in range(sample_lines):
+            line = file.readline()
+            if not line:
+                break
+            line = line.strip()
+            for sep in possible_separators:
+                separator_counts[sep] += line.count(sep)
+    return separator_counts.most_common(1)[0][0]
+
+
+def process_dataframe(df, schema=None):
+    """CSV 원본(모두 문자열)을 정리 - 전부 숫자로 변환되는 컬럼은 Float64, 나머지는 문자열
 
-    def detect_separator(file_path, sample_lines=10):
-        possible_separators = [",", ";", "\t", " ", "|"]
-        separator_counts = Counter()
-        with open(file_path, "r") as file:
-            for _ in range(sample_lines):
-                line = file.readline()
-                if not line:
-                    break
-                line = line.strip()
-                for sep in possible_separators:
-                    separator_counts[sep] += line.count(sep)
-        return separator_counts.most_common(1)[0][0]
-
-    def try_convert(df, col_name):
-        float_col = df[col_name].cast(pl.Float64, strict=False)
-        if float_col.null_count() == 0:
-            return float_col
-        return df[col_name]
-
-    def process_dataframe(df):
-        df = df.rename({col: col.strip().replace(".", "_") for col in df.columns})
-        df = df.select([col for col in df.columns if col != ""])
-        for col in df.columns:
+    schema가 주어지면(증분 reload로 파일 일부만 다시 읽을 때) 기존 컬럼 타입을 따르고,
+    기존 숫자 컬럼에 숫자가 아닌 값이 들어오면 ValueError를 발생시킵니다.
+    컬럼별 정리 표현식을 묶음 단위의 select로 실행해 polars가 여러 코어에서 컬럼을 병렬 처리하며
+    (float 변환은 판별과 정리에 한 번만 계산), 실패한 컬럼은 따로 처리해 로그를 남기고 나머지는 그대로 정리합니다.
+    """
+    df = df.rename({col: col.strip().replace(".", "_") for col in df.columns})
+    df = df.select([col for col in df.columns if col != ""])
+    df = df.with_columns(pl.col([col for col, dtype in df.schema.items() if dtype == pl.Utf8]).str.strip_chars())
+
+    def run_isolated(exprs, label):
+        """exprs(컬럼 -> 표현식)를 한 번의 select로 실행하고, 실패하면 컬럼별로 실행해 실패한 컬럼만 제외"""
+        try:
+            return df.select(list(exprs.values()))
+        except Exception as e:
+            logger.error(f"{label} 일괄 처리 실패, 컬럼별로 처리: {e}")
+        frames = []
+        for col, expr in exprs.items():
             try:
-                if df[col].dtype == pl.Utf8:
-                    df = df.with_columns(pl.col(col).str.strip_chars().alias(col))
+                frames.append(df.select(expr))
+            except Exception as e:
+                logger.error(f"{label} 실패 ({col}): {e}")
+        return pl.concat(frames, how="horizontal") if frames else pl.DataFrame()
 
-                df = df.with_columns(try_convert(df, col).alias(col))
-                df = df.with_columns(pl.col(col).replace(float("inf"), -99999).fill_null(-99999).fill_nan(-99999).alias(col))
+    # 숫자 컬럼: 변환 실패(null)가 없으면 inf/NaN -> -99999 로 정리한 Float64 사용
+    # float 변환은 묶음 단위로 한 번만 계산하고 묶음 안에서만 메모리에 두어, 컬럼이 많아도 최대 메모리가 늘지 않게 함
+    candidates = df.columns if schema is None else [col for col in df.columns if schema.get(col) == pl.Float64]
+    batch_size = max(8, 4 * (os.cpu_count() or 1))
+    numeric = []
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start : start + batch_size]
+        converted = run_isolated({col: pl.col(col).cast(pl.Float64, strict=False) for col in batch}, "숫자 변환")
+        valid = [col for col in converted.columns if converted[col].null_count() == 0]
+        if schema is not None and len(valid) < len(batch):
+            invalid = next(col for col in batch if col not in valid)
+            raise ValueError(f"{invalid}: 숫자 컬럼에 숫자가 아닌 값이 추가됨")
+        numeric += converted.select(
+            [pl.when(pl.col(col) == float("inf")).then(-99999.0).otherwise(pl.col(col)).fill_nan(-99999).alias(col) for col in valid]
+        ).get_columns()
+
+    # 문자열 컬럼: null -> ""
+    numeric_names = {series.name for series in numeric}
+    strings = run_isolated({col: pl.col(col).fill_null("") for col in df.columns if col not in numeric_names}, "문자열 정리")
+    return df.with_columns([*numeric, *strings.get_columns()])
+
+
+def read_csv_source(source, separator):
+    """validate_df와 같은 옵션으로 CSV 읽기 (source는 경로 또는 bytes 버퍼)"""
+    try:
+        return pl.read_csv(
+            source,
+            ignore_errors=True,
+            infer_schema_length=0,
+            separator=separator,
+            null_values="-",
+        )
+    except pl.PolarsError as e:
+        if "truncate_ragged_lines=True" in str(e):
+            if hasattr(source, "seek"):
+                source.seek(0)
+            return pl.read_csv(
+                source,
+                ignore_errors=True,
+                infer_schema_length=0,
+                truncate_ragged_lines=True,
+                null_values="-",
+            )
+        raise
 
-            except Exception:
-                try:
-                    df = df.with_columns(pl.col(col).fill_null(""))
-                except Exception as e:
-                    logger.error(f"Error: {e}")
-        return df
+
+def validate_df(filename):
 
     if filename.startswith("WORKSAPCE"):
         filename = filename.replace("WORKSPACE", CONFIG.WORKSPACE)
@@ -71,33 +126,67 @@ def validate_df(filename):
         except Exception as e:
             logger.error(f"Fail to read parquet: {e}")
     else:
-        try:
-            df = pl.read_csv(
-                filename,
-                ignore_errors=True,
-                infer_schema_length=0,
-                separator=detect_separator(filename),
-                null_values="-",
-            )
-        except pl.PolarsError as e:
-            if "truncate_ragged_lines=True" in str(e):
-                df = pl.read_csv(
-                    filename,
-                    ignore_errors=True,
-                    infer_schema_length=0,
-                    truncate_ragged_lines=True,
-                    null_values="-",
-                )
+        df = read_csv_source(filename, detect_separator(filename))
     return process_dataframe(df).with_row_index("uniqid")
 
 
+class PositionalMergeError(ValueError):
+    """자연 키 없이 행 위치로 waiver를 병합할 수 없음 (두 데이터의 행 수가 다름)"""
+
+
+def merge_local_waivers(df_workspace, df_local, key=None):
+    """워크스페이스 최신본에 로컬에서 수정한 waiver/user를 반영하고 (병합 결과, 충돌 행) 반환
+
+    Edit 모드 진입의 remain-edited-waiver 규칙: 내가 수정했고 워크스페이스 값과 다르며,
+    워크스페이스 작성자가 나이거나 Fixed 처리되지 않은 행만 로컬 값으로 덮어씁니다.
+    내가 수정했지만 규칙상 워크스페이스 값이 유지된 행은 충돌로 반환합니다.
+
+    행은 key(기본 CONFIG.WAIVER_MERGE_KEY)로 맞추므로, 자연 키가 설정되어 있으면 행 순서가 바뀌거나 다시 추출된 리포트도 병합할 수 있습니다.
+    키가 없으면 행 위치(uniqid)로 맞추므로 같은 리포트에만 안전하며, 두 데이터의 행 수가 다르면 PositionalMergeError로 병합을 거부합니다.
+    waiver/user 컬럼이 없으면 병합할 것이 없으므로 df_workspace를 그대로 반환합니다.
+    로컬에서 같은 키가 여러 행이면 어느 행인지 알 수 없으므로 병합하지 않습니다. 전체가 하나의 lazy plan으로 실행됩니다.
+    """
+    key = key or CONFIG.WAIVER_MERGE_KEY or ["uniqid"]
+    columns = {"waiver", "user", *key}
+    if not columns <= set(df_workspace.columns) or not columns <= set(df_local.columns):
+        return df_workspace, pl.DataFrame()
+    if key == ["uniqid"] and df_workspace.height != df_local.height:
+        raise PositionalMergeError(
+            f"행 수가 달라({df_local.height:,} → {df_workspace.height:,}) 행 위치로 waiver를 병합할 수 없습니다. RV_WAIVER_MERGE_KEY에 자연 키를 설정하세요"
+        )
+
+    local = (
+        df_local.lazy()
+        .select(*key, pl.col("waiver").alias("waiver_local"), pl.col("user").alias("user_local"))
+        .filter(pl.len().over(key) == 1)
+    )
+    edited_expr = (pl.col("waiver") != pl.col("waiver_local")) & pl.col("user_local").str.starts_with(CONFIG.USERNAME)
+    conditions_expr = edited_expr & ((pl.col("user") == CONFIG.USERNAME) | ((pl.col("waiver_local") != "Result") & (pl.col("waiver") != "Fixed")))
+
+    merged = (
+        df_workspace.lazy()
+        .with_row_index("__order")
+        .join(local, on=key, how="left")
+        .sort("__order")
+        .with_columns(conditions_expr.fill_null(False).alias("__apply"), (edited_expr & ~conditions_expr).fill_null(False).alias("__conflict"))
+        .with_columns(
+            pl.when(pl.col("__apply")).then(pl.col("waiver_local")).otherwise(pl.col("waiver")).alias("waiver"),
+            pl.when(pl.col("__apply")).then(pl.col("user_local")).otherwise(pl.col("user")).alias("user"),
+        )
+        .collect()
+    )
+    conflicts = merged.filter(pl.col("__conflict")).select(*key, "waiver", "user", "waiver_local", "user_local")
+    return merged.select(df_workspace.columns), conflicts
+
+
 def validate_js(json_file):
     return pl.read_parquet(json_file) if json_file.endswith(".parquet") else pl.read_json(json_file)
 
 
-def displaying_df(filtred_apply=False):
-    dff = SSDF.dataframe
-    hide_waiver = SSDF.hide_waiver
+def displaying_df(filtred_apply=False, dff=None, request=None, hide_waiver=None):
+    """현재 보기(waiver 표시, 필터/정렬/그룹)를 적용한 데이터 - dff/request/hide_waiver를 주면 SSDF 대신 그 스냅샷 사용"""
+    dff = SSDF.dataframe if dff is None else dff
+    hide_waiver = SSDF.hide_waiver if hide_waiver is None else hide_waiver
     if dff.is_empty():
         return None
     try:
@@ -106,7 +195,7 @@ def displaying_df(filtred_apply=False):
             update_waiver_column = pl.when(conditions_expr).then(pl.col("waiver").str.strip_chars(".")).otherwise(pl.col("waiver")).alias("waiver")
             dff = dff.with_columns(update_waiver_column)
         if filtred_apply:
-            request = SSDF.request
+            request = SSDF.request if request is None else request
             request["groupKeys"] = []
             dff = apply_filters(dff, request)
             dff = apply_sort(dff, request)
@@ -118,3 +207,96 @@ def displaying_df(filtred_apply=False):
         if col in dff.columns:
             dff = dff.drop(col)
     return dff
+
+
+def export_displaying_df(save_path, filtred_apply=False, progress=None, batch_size=200_000, dff=None, request=None, hide_waiver=None):
+    """displaying_df와 같은 내용을 배치 단위로 파일에 기록하고 기록한 행 수를 반환
+
+    필터/정렬은 행 번호만 계산하는 lazy plan으로 실행하고(필요한 컬럼만 읽음), 원본에서 배치 단위로 행을 가져와
+    CSV(.csv.gz이면 gzip)/parquet에 이어 씁니다. 필터 결과 전체를 한 번에 만들지 않으므로 최대 메모리가 원본 수준에 머뭅니다.
+    그룹 보기는 결과가 그룹 요약 행이라 작으므로 기존 displaying_df 결과를 그대로 씁니다.
+    백그라운드에서 실행할 때는 저장을 요청한 시점의 dff/request/hide_waiver 스냅샷을 넘겨 그 보기를 기록합니다.
+    """
+    dff = SSDF.dataframe if dff is None else dff
+    hide_waiver = SSDF.hide_waiver if hide_waiver is None else hide_waiver
+    if dff.is_empty():
+        return 0
+
+    request = dict((SSDF.request if request is None else request) or {}) if filtred_apply else {}
+    columns = [col for col in dff.columns if col not in ("childCount", "uniqid")]
+    waiver_expr = None
+    if hide_waiver and "waiver" in dff.columns:
+        conditions_expr = pl.col("waiver").is_in(["Waiver.", "Fixed."])
+        waiver_expr = pl.when(conditions_expr).then(pl.col("waiver").str.strip_chars(".")).otherwise(pl.col("waiver")).alias("waiver")
+
+    indices = None
+    source = dff
+    if request.get("rowGroupCols"):
+        source = displaying_df(filtred_apply=True, dff=dff, request=request, hide_waiver=hide_waiver)
+        columns = source.columns
+        waiver_expr = None
+    else:
+        filter_expr = filter_expression(request.get("filterModel"))
+        sort_model = [sort for sort in request.get("sortModel") or [] if sort["colId"] in dff.columns]
+        if filter_expr is not None or sort_model:
+            lf = dff.lazy()
+            if waiver_expr is not None:
+                lf = lf.with_columns(waiver_expr)
+            lf = lf.with_row_index("__row")
+            if filter_expr is not None:
+                lf = lf.filter(filter_expr)
+            if sort_model:
+                lf = lf.sort([sort["colId"] for sort in sort_model], descending=[sort["sort"] == "desc" for sort in sort_model])
+            indices = lf.select("__row").collect()["__row"]
+
+    total = source.height if indices is None else len(indices)
+
+    def batches():
+        for offset in range(0, total, batch_size):
+            if indices is None:
+                batch = source.slice(offset, batch_size).select(columns)
+            else:
+                batch = source.select(pl.col(columns).gather(indices.slice(offset, batch_size)))
+            if waiver_expr is not None:
+                batch = batch.with_columns(waiver_expr)
+            yield offset, batch
+
+    tmp_path = f"{save_path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        if save_path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            options = CONFIG.PARQUET_OPTIONS
+            writer = None
+            try:
+                for offset, batch in batches():
+                    table = batch.to_arrow()
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            tmp_path,
+                            table.schema,
+                            compression=options["compression"],
+                            compression_level=options["compression_level"],
+                            write_statistics=options["statistics"],
+                        )
+                    writer.write_table(table, row_group_size=options["row_group_size"])
+                    if progress:
+                        progress(min(1.0, (offset + batch_size) / total))
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is None:
+                source.clear().select(columns).write_parquet(tmp_path)
+        else:
+            with (gzip.open(tmp_path, "wb", compresslevel=6) if save_path.endswith(".gz") else open(tmp_path, "wb")) as f:
+                if total == 0:
+                    source.clear().select(columns).write_csv(f)
+                for offset, batch in batches():
+                    batch.write_csv(f, include_header=offset == 0)
+                    if progress:
+                        progress(min(1.0, (offset + batch_size) / total))
+        os.replace(tmp_path, save_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return total
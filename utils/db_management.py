@@ -15,6 +15,7 @@ class DataFrameManager:
             "df": pl.DataFrame(),
             "lock": None,
             "readonly": True,
+            "version": 0,
         }
         self._row_counter: Dict[str, int] = {"filtered": 0, "groupby": 0}
         self._cache: Dict[str, Any] = {
@@ -37,6 +38,18 @@ class DataFrameManager:
     @dataframe.setter
     def dataframe(self, value: Any) -> None:
         self._data["df"] = value
+        self._data["version"] += 1
+        self._data["snapshot"] = (value, self._data["version"])
+
+    @property
+    def version(self) -> int:
+        """dataframe이 교체될 때마다 증가하는 버전 (캐시 무효화 기준)"""
+        return self._data.get("version", 0)
+
+    @property
+    def snapshot(self) -> tuple:
+        """(dataframe, version)을 한 번에 읽음 - 따로 읽으면 그 사이 교체된 프레임과 버전이 섞일 수 있음"""
+        return self._data.get("snapshot", (self._data.get("df"), self._data.get("version", 0)))
 
     @property
     def is_readonly(self) -> bool:
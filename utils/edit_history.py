@@ -0,0 +1,179 @@
+import os
+import uuid
+import threading
+import polars as pl
+from collections import deque
+from typing import Dict, Any, List, Optional
+from utils.config import CONFIG
+from utils.db_management import SSDF
+from utils.logging_utils import logger
+
+
+class EditHistory:
+    """편집 메뉴 작업의 Undo/Redo 스택
+
+    각 항목은 작업 전 영향받은 컬럼의 Series만 보관합니다 (polars Series는 버퍼를 공유하므로 프레임 전체 복사 없음).
+    컬럼명 변경은 데이터 없이 되돌릴 이름 매핑만 보관합니다.
+    메모리 예산을 넘으면 오래된 항목부터 parquet 파일로 내보내고, 되돌릴 때 다시 읽어옵니다.
+    """
+
+    def __init__(self, max_entries: int = 30, memory_budget: int = 2 * 1024**3):
+        self.max_entries = max_entries
+        self.memory_budget = memory_budget
+        self.spill_path = os.path.join(CONFIG.USER_RV_DIR, "history")
+        self._lock = threading.Lock()
+        self._undo: deque = deque()
+        self._redo: deque = deque()
+
+    def record(self, label: str, columns: List[str]) -> None:
+        """SSDF.dataframe을 교체하기 직전에 호출 - 영향받을 컬럼의 현재 상태를 저장"""
+        df = SSDF.dataframe
+        if df is None or df.is_empty():
+            return
+        with self._lock:
+            self._undo.append(self._snapshot(label, df, columns))
+            while self._redo:
+                self._discard(self._redo.pop())
+            while len(self._undo) > self.max_entries:
+                self._discard(self._undo.popleft())
+            self._enforce_budget()
+
+    def record_rename(self, label: str, mapping: Dict[str, str]) -> None:
+        """SSDF.dataframe.rename(mapping) 직전에 호출 - 되돌릴 때 적용할 역방향 매핑을 저장"""
+        df = SSDF.dataframe
+        if df is None or not mapping:
+            return
+        with self._lock:
+            self._undo.append(self._rename_entry(label, df, {new: old for old, new in mapping.items()}))
+            while self._redo:
+                self._discard(self._redo.pop())
+            while len(self._undo) > self.max_entries:
+                self._discard(self._undo.popleft())
+
+    def undo(self) -> Optional[Dict[str, Any]]:
+        return self._move(self._undo, self._redo)
+
+    def redo(self) -> Optional[Dict[str, Any]]:
+        return self._move(self._redo, self._undo)
+
+    def clear(self) -> None:
+        """새 파일 로드 등으로 기존 이력이 의미 없어졌을 때 호출"""
+        with self._lock:
+            for stack in (self._undo, self._redo):
+                while stack:
+                    self._discard(stack.pop())
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def _move(self, source: deque, target: deque) -> Optional[Dict[str, Any]]:
+        """source 스택의 마지막 항목을 적용하고, 적용 직전 상태를 target 스택에 쌓음
+
+        적용에 실패하면 항목을 source 스택에 되돌려 놓으므로 (디스크로 내보낸 데이터 포함) 이력이 사라지지 않습니다.
+        """
+        with self._lock:
+            if not source:
+                return None
+            entry = source.pop()
+            df = SSDF.dataframe
+            try:
+                if entry.get("renames"):
+                    reverse = self._rename_entry(entry["label"], df, {new: old for old, new in entry["renames"].items()})
+                    restored = df.rename(entry["renames"])
+                else:
+                    self._load(entry)
+                    if df.height != entry["height"]:
+                        raise ValueError(f"행 수가 변경되어 되돌릴 수 없습니다 ({entry['height']} → {df.height})")
+                    reverse = self._snapshot(entry["label"], df, entry["columns"])
+                    restored = self._restore(df, entry)
+            except Exception:
+                if entry["spill_file"] is not None:
+                    entry["series"] = {col: None for col in entry["series"]}
+                source.append(entry)
+                raise
+            target.append(reverse)
+            SSDF.dataframe = restored
+            self._discard(entry)
+            self._enforce_budget()
+            return entry
+
+    @staticmethod
+    def _snapshot(label: str, df: pl.DataFrame, columns: List[str]) -> Dict[str, Any]:
+        columns = list(dict.fromkeys(columns))
+        series = {col: df[col] for col in columns if col in df.columns}
+        return {
+            "label": label,
+            "columns": columns,
+            "series": series,
+            "order": df.columns,
+            "height": df.height,
+            "size": sum(s.estimated_size() for s in series.values()),
+            "spill_file": None,
+        }
+
+    @staticmethod
+    def _rename_entry(label: str, df: pl.DataFrame, renames: Dict[str, str]) -> Dict[str, Any]:
+        """적용할 이름 매핑(현재 이름 → 되돌릴 이름)만 보관하는 항목"""
+        return {
+            "label": label,
+            "columns": list(renames.values()),
+            "renames": renames,
+            "series": {},
+            "order": df.columns,
+            "height": df.height,
+            "size": 0,
+            "spill_file": None,
+        }
+
+    @staticmethod
+    def _restore(df: pl.DataFrame, entry: Dict[str, Any]) -> pl.DataFrame:
+        """저장된 컬럼으로 교체하고, 작업 당시 없던 컬럼은 제거한 뒤 컬럼 순서를 복원"""
+        series = entry["series"]
+        added = [col for col in entry["columns"] if col not in series and col in df.columns]
+        df = df.drop(added).with_columns(list(series.values()))
+        order = [col for col in entry["order"] if col in df.columns]
+        return df.select(order + [col for col in df.columns if col not in order])
+
+    def _enforce_budget(self) -> None:
+        """메모리에 남은 항목의 합이 예산을 넘으면 가장 오래된 항목부터 디스크로 내보냄"""
+        in_memory = sum(entry["size"] for entry in self._undo + self._redo if entry["spill_file"] is None)
+        for entry in list(self._undo) + list(self._redo):
+            if in_memory <= self.memory_budget:
+                break
+            if entry["spill_file"] is not None or not entry["series"]:
+                continue
+            try:
+                os.makedirs(self.spill_path, mode=0o777, exist_ok=True)
+                spill_file = os.path.join(self.spill_path, f"{uuid.uuid4().hex}.parquet")
+                pl.DataFrame(list(entry["series"].values())).write_parquet(spill_file)
+                entry["spill_file"] = spill_file
+                entry["series"] = {col: None for col in entry["series"]}
+                in_memory -= entry["size"]
+            except Exception as e:
+                logger.error(f"편집 이력 디스크 저장 실패: {e}")
+                break
+
+    @staticmethod
+    def _load(entry: Dict[str, Any]) -> None:
+        if entry["spill_file"] is None:
+            return
+        spilled = pl.read_parquet(entry["spill_file"])
+        entry["series"] = {col: spilled[col] for col in entry["series"]}
+
+    @staticmethod
+    def _discard(entry: Dict[str, Any]) -> None:
+        spill_file = entry.get("spill_file")
+        if spill_file and os.path.exists(spill_file):
+            try:
+                os.remove(spill_file)
+            except Exception as e:
+                logger.error(f"편집 이력 파일 삭제 실패: {e}")
+        entry["spill_file"] = None
+
+
+EDIT_HISTORY = EditHistory()
@@ -2,7 +2,8 @@ import os
 
 # import pwd
 import json
-import shutil
+import uuid
+import hashlib
 from datetime import datetime
 from utils.config import CONFIG
 from utils.logging_utils import logger
@@ -79,14 +80,142 @@ def make_dirs_with_permissions(path):
                 os.chmod(current_path, 0o777)
 
 
-def backup_file(dir_path, file_path):
+def fsync_path(path):
+    """파일(또는 rename 결과를 확정하기 위한 디렉토리)을 디스크에 flush"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # 일부 파일시스템은 디렉토리 fsync를 지원하지 않음
+    finally:
+        os.close(fd)
+
+
+def backup_parquet_dedup(dir_path, file_path):
+    """기존 parquet 파일을 row group 단위 content-addressed 백업으로 저장하고 manifest 경로 반환
+
+    row group의 원본 바이트 sha256을 키로 backup/objects/에 한 번만 저장하므로,
+    대부분 그대로인 파일을 반복 저장해도 바뀐 row group만큼만 디스크를 사용합니다.
+    백업은 원본을 옮기지 않고 읽기만 하므로 이후 새 파일 쓰기가 실패해도 현재 파일이 남습니다.
+    """
+    import pyarrow.parquet as pq
+
     backup_dir = os.path.join(dir_path, "backup")
-    make_dirs_with_permissions(backup_dir)
-    file_owner = get_file_owner(file_path)
-    file_timestamp = datetime.datetime.fromtimestamp(os.path.getmtime(file_path)).strftime("%Y%m%d_%H%M")
-    dir_path, filename = os.path.split(file_path)
-    name, ext = os.path.splitext(filename)
-    backup_filename = f"{name}_{file_timestamp}_{file_owner}{ext}"
-    backup_filepath = os.path.join(backup_dir, backup_filename)
-    shutil.move(file_path, backup_filepath)
-    return backup_filepath
+    objects_dir = os.path.join(backup_dir, "objects")
+    make_dirs_with_permissions(objects_dir)
+
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+    row_groups = []
+    with open(file_path, "rb") as f:
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            chunks = [row_group.column(j) for j in range(row_group.num_columns)]
+            start = min(chunk.dictionary_page_offset or chunk.data_page_offset for chunk in chunks)
+            end = max((chunk.dictionary_page_offset or chunk.data_page_offset) + chunk.total_compressed_size for chunk in chunks)
+            f.seek(start)
+            digest = hashlib.sha256(f.read(end - start)).hexdigest()
+
+            object_path = os.path.join(objects_dir, f"{digest}.parquet")
+            if not os.path.exists(object_path):
+                tmp_path = f"{object_path}.{uuid.uuid4().hex[:8]}.tmp"
+                try:
+                    pq.write_table(parquet_file.read_row_group(i), tmp_path)
+                    fsync_path(tmp_path)
+                    os.replace(tmp_path, object_path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+            row_groups.append({"object": digest, "num_rows": row_group.num_rows})
+
+    # 같은 초 안에 여러 번 저장해도 이전 manifest를 덮어쓰지 않도록 이름이 겹치면 번호를 붙임
+    file_timestamp = datetime.fromtimestamp(os.path.getmtime(file_path)).strftime("%Y%m%d_%H%M%S")
+    prefix = f"{os.path.splitext(os.path.basename(file_path))[0]}_{file_timestamp}_{get_file_owner(file_path)}"
+    manifest_path = os.path.join(backup_dir, f"{prefix}.manifest.json")
+    counter = 1
+    while os.path.exists(manifest_path):
+        manifest_path = os.path.join(backup_dir, f"{prefix}_{counter}.manifest.json")
+        counter += 1
+    tmp_path = f"{manifest_path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"source": os.path.basename(file_path), "row_groups": row_groups}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, manifest_path)
+    fsync_path(backup_dir)
+    return manifest_path
+
+
+def list_parquet_backups(file_path):
+    """file_path에 대해 backup_parquet_dedup이 만든 manifest 경로 목록 (오래된 것부터)"""
+    backup_dir = os.path.join(os.path.dirname(file_path), "backup")
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    if not os.path.isdir(backup_dir):
+        return []
+    manifests = []
+    for entry in os.listdir(backup_dir):
+        if entry.startswith(f"{name}_") and entry.endswith(".manifest.json"):
+            manifest_path = os.path.join(backup_dir, entry)
+            try:
+                with open(manifest_path, "r") as f:
+                    if json.load(f).get("source") == os.path.basename(file_path):
+                        manifests.append(manifest_path)
+            except (OSError, ValueError):
+                continue
+    return sorted(manifests, key=os.path.getmtime)
+
+
+def restore_parquet_backup(manifest_path, target_path):
+    """backup_parquet_dedup으로 만든 manifest의 row group들을 이어 붙여 parquet 파일로 복원 (임시 파일에 쓴 뒤 교체)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    objects_dir = os.path.join(os.path.dirname(manifest_path), "objects")
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    tables = [pq.read_table(os.path.join(objects_dir, f"{entry['object']}.parquet")) for entry in manifest["row_groups"]]
+    tmp_path = f"{target_path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        pq.write_table(pa.concat_tables(tables), tmp_path)
+        fsync_path(tmp_path)
+        os.replace(tmp_path, target_path)
+        fsync_path(os.path.dirname(os.path.abspath(target_path)))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return target_path
+
+
+def main():
+    """WORKSPACE 저장 백업(backup/*.manifest.json) 목록 조회와 복원
+
+    사용법:
+        python -m utils.file_operations list <parquet 파일>
+        python -m utils.file_operations restore <manifest> <복원할 경로> [--force]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List or restore deduplicated workspace parquet backups")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="파일의 백업 manifest 목록")
+    list_parser.add_argument("file")
+    restore_parser = subparsers.add_parser("restore", help="manifest로 parquet 파일 복원")
+    restore_parser.add_argument("manifest")
+    restore_parser.add_argument("target")
+    restore_parser.add_argument("--force", action="store_true", help="이미 있는 파일을 덮어씀")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for manifest_path in list_parquet_backups(args.file):
+            with open(manifest_path, "r") as f:
+                rows = sum(entry["num_rows"] for entry in json.load(f)["row_groups"])
+            print(f"{manifest_path}\t{rows:,} rows")
+    else:
+        if os.path.exists(args.target) and not args.force:
+            parser.error(f"{args.target} already exists (use --force to overwrite)")
+        restore_parquet_backup(args.manifest, args.target)
+        print(f"Restored {args.manifest} -> {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Optional, Set
+from utils.file_operations import get_file_owner
+from utils.logging_utils import logger
+
+
+class FileProbe:
+    """NFS 파일 메타데이터(stat, 소유자, lock 상태) 조회를 스레드 풀로 병렬 실행하고 짧은 TTL로 캐시
+
+    디렉토리 목록을 이미 가지고 있으면 lock_names로 넘겨 `.lock` 존재 여부를 추가 stat 없이 판단합니다.
+    """
+
+    def __init__(self, max_workers: int = 16, ttl: float = 5.0):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-probe")
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Any] = {}
+
+    def probe(self, paths: Iterable[str], lock_names: Optional[Set[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """경로별 {"stat", "owner", "locked_by"} 반환 (캐시가 만료된 경로만 병렬 조회)"""
+        paths = list(dict.fromkeys(str(path) for path in paths))
+        now = time.monotonic()
+        results, missing = {}, []
+        with self._lock:
+            for path in paths:
+                cached = self._cache.get(path)
+                if cached and now - cached[0] < self.ttl:
+                    results[path] = cached[1]
+                else:
+                    missing.append(path)
+
+        if missing:
+            probed = self._executor.map(lambda path: self._probe_one(path, lock_names), missing)
+            with self._lock:
+                for path, result in zip(missing, probed):
+                    self._cache[path] = (now, result)
+                    results[path] = result
+                self._prune(now)
+        return results
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """파일 변경(복사/이름 변경/삭제) 후 캐시 제거"""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(str(path), None)
+
+    @staticmethod
+    def _probe_one(path: str, lock_names: Optional[Set[str]]) -> Dict[str, Any]:
+        try:
+            file_stat = os.stat(path)
+        except OSError as e:
+            logger.error(f"파일 정보 조회 실패 {path}: {e}")
+            file_stat = None
+
+        lock_path = f"{path}.lock"
+        if lock_names is not None:
+            is_locked = os.path.basename(lock_path) in lock_names
+        else:
+            is_locked = os.path.exists(lock_path)
+        return {
+            "stat": file_stat,
+            "owner": get_file_owner(path),
+            "locked_by": get_file_owner(lock_path) if is_locked else None,
+        }
+
+    def _prune(self, now: float) -> None:
+        expired = [path for path, (timestamp, _) in self._cache.items() if now - timestamp >= self.ttl]
+        for path in expired:
+            del self._cache[path]
+
+
+FILE_PROBE = FileProbe()
@@ -0,0 +1,120 @@
+import os
+import time
+import threading
+from typing import Dict, Callable, List, Optional
+from utils.logging_utils import logger
+
+
+class FileWatcher:
+    """열린 파일들의 변경을 하나의 스레드에서 감시
+
+    inotify_simple이 있으면 파일이 속한 디렉토리를 inotify로 감시하고 (임시 파일 + rename 저장도 감지),
+    없거나 NFS처럼 inotify 이벤트가 오지 않는 경우를 위해 poll_interval마다 mtime을 확인합니다.
+    클라이언트는 wait_for_change()로 변경 시점까지 대기합니다 (SSE 스트림에서 사용).
+    """
+
+    def __init__(self, poll_interval: float = 5.0):
+        self.poll_interval = poll_interval
+        self._condition = threading.Condition()
+        self._mtimes: Dict[str, Optional[float]] = {}
+        self._refcounts: Dict[str, int] = {}
+        self._listeners: List[Callable[[List[str]], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._inotify = None
+        self._watch_descriptors: Dict[int, str] = {}
+
+    def watch(self, path: str) -> None:
+        """파일 감시 등록 (구독자 수만큼 참조 카운트)"""
+        with self._condition:
+            self._refcounts[path] = self._refcounts.get(path, 0) + 1
+            if path not in self._mtimes:
+                self._mtimes[path] = self._getmtime(path)
+                self._add_inotify_watch(os.path.dirname(path))
+        self._start()
+
+    def unwatch(self, path: str) -> None:
+        with self._condition:
+            self._refcounts[path] = self._refcounts.get(path, 1) - 1
+            if self._refcounts[path] <= 0:
+                self._refcounts.pop(path, None)
+                self._mtimes.pop(path, None)
+
+    def add_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """감시 중인 디렉토리에서 변경이 감지되면 listener(디렉토리 목록) 호출"""
+        self._listeners.append(listener)
+
+    def mtime(self, path: str) -> Optional[float]:
+        with self._condition:
+            return self._mtimes.get(path)
+
+    def wait_for_change(self, path: str, known_mtime: Optional[float], timeout: float) -> Optional[float]:
+        """path의 mtime이 known_mtime과 달라질 때까지 최대 timeout초 대기하고 현재 mtime 반환"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._mtimes.get(path) == known_mtime:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return self._mtimes.get(path)
+
+    def _start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def _add_inotify_watch(self, dir_path: str) -> None:
+        if dir_path in self._watch_descriptors.values():
+            return
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            return
+        try:
+            if self._inotify is None:
+                self._inotify = INotify()
+            mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE | flags.MOVED_FROM
+            self._watch_descriptors[self._inotify.add_watch(dir_path, mask)] = dir_path
+        except OSError as e:
+            logger.error(f"inotify 감시 등록 실패, 폴링으로 감시 {dir_path}: {e}")
+
+    def _run(self) -> None:
+        while True:
+            changed_dirs = set()
+            if self._inotify is not None:
+                # 이벤트가 오거나 poll_interval이 지나면 반환 - 어느 쪽이든 아래에서 mtime을 다시 확인
+                for event in self._inotify.read(timeout=int(self.poll_interval * 1000)):
+                    if event.wd in self._watch_descriptors:
+                        changed_dirs.add(self._watch_descriptors[event.wd])
+            else:
+                time.sleep(self.poll_interval)
+            self._poll(changed_dirs)
+
+    def _poll(self, changed_dirs: set) -> None:
+        with self._condition:
+            paths = list(self._mtimes)
+        updates = {path: self._getmtime(path) for path in paths}
+        with self._condition:
+            changed = [path for path, mtime in updates.items() if path in self._mtimes and self._mtimes[path] != mtime]
+            for path in changed:
+                self._mtimes[path] = updates[path]
+                changed_dirs.add(os.path.dirname(path))
+            if changed:
+                self._condition.notify_all()
+        if changed_dirs:
+            for listener in self._listeners:
+                try:
+                    listener(sorted(changed_dirs))
+                except Exception as e:
+                    logger.error(f"파일 변경 listener 실패: {e}")
+
+    @staticmethod
+    def _getmtime(path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+
+FILE_WATCHER = FileWatcher()
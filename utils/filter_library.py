@@ -0,0 +1,159 @@
+import os
+import json
+import yaml
+import sqlite3
+import threading
+import polars as pl
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+from components.grid.dag.SSRM.apply_filter import filter_expression
+from utils.config import CONFIG
+from utils.logging_utils import logger
+
+
+def filter_columns(filter_model: Dict) -> List[str]:
+    """filter model(중첩 AND/OR 포함)이 참조하는 컬럼 목록"""
+    if not filter_model:
+        return []
+    if "conditions" in filter_model:
+        return list(dict.fromkeys(col for condition in filter_model["conditions"] for col in filter_columns(condition)))
+    return [filter_model["colId"]] if "colId" in filter_model else []
+
+
+class FilterLibrary:
+    """저장된 필터를 SQLite에 (application, name) 키로 저장하고, polars 표현식으로 미리 컴파일해 캐시
+
+    application별 조회는 인덱스로 처리하므로 필터 하나를 읽거나 쓸 때 전체 파일을 다시 읽고 쓰지 않습니다.
+    컴파일 시 현재 스키마에 없는 컬럼을 검사하고, match_counts()는 모든 필터의 일치 행 수를 한 번의 select로 계산합니다.
+    기존 filters.yaml이 있으면 처음 한 번 가져옵니다.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS filters (
+            application TEXT NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            columns TEXT,
+            filter_model TEXT NOT NULL,
+            created_at TEXT,
+            created_by TEXT,
+            PRIMARY KEY (application, name)
+        );
+        CREATE INDEX IF NOT EXISTS filters_name ON filters(name);
+    """
+
+    def __init__(self, db_path: str, legacy_yaml: Optional[str] = None):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._compiled: Dict[Tuple, Tuple[Optional[pl.Expr], List[str]]] = {}
+        self._initialize(legacy_yaml)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _initialize(self, legacy_yaml: Optional[str]) -> None:
+        os.makedirs(os.path.dirname(self.db_path), mode=0o777, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            is_empty = conn.execute("SELECT COUNT(*) FROM filters").fetchone()[0] == 0
+        if is_empty and legacy_yaml and os.path.exists(legacy_yaml):
+            try:
+                with open(legacy_yaml, "r") as file:
+                    legacy = yaml.safe_load(file) or {}
+                for info in legacy.values():
+                    self.save(info)
+                logger.info(f"{len(legacy)} filters imported from {legacy_yaml}")
+            except Exception as e:
+                logger.error(f"filters.yaml 가져오기 실패: {e}")
+
+    @staticmethod
+    def _row_to_info(row: sqlite3.Row) -> Dict[str, Any]:
+        info = dict(row)
+        info["columns"] = json.loads(info["columns"] or "[]")
+        info["filter_model"] = json.loads(info["filter_model"])
+        return info
+
+    def list(self, application: Optional[str] = None) -> List[Dict[str, Any]]:
+        query, args = "SELECT * FROM filters", ()
+        if application:
+            query, args = "SELECT * FROM filters WHERE application = ?", (application,)
+        with self._connect() as conn:
+            return [self._row_to_info(row) for row in conn.execute(f"{query} ORDER BY application, name", args)]
+
+    def get(self, name: str, application: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM filters WHERE application = ? AND name = ?", (application, name)).fetchone()
+        return self._row_to_info(row) if row else None
+
+    def save(self, info: Dict[str, Any]) -> None:
+        columns = info.get("columns") or filter_columns(info["filter_model"])
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO filters VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    info["application"],
+                    info["name"],
+                    info.get("description", ""),
+                    json.dumps(columns),
+                    json.dumps(info["filter_model"], sort_keys=True),
+                    info.get("created_at", ""),
+                    info.get("created_by", ""),
+                ),
+            )
+
+    def delete(self, name: str, application: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM filters WHERE application = ? AND name = ?", (application, name))
+
+    def compile(self, info: Dict[str, Any], schema: pl.Schema) -> Tuple[Optional[pl.Expr], List[str]]:
+        """(polars 표현식, 스키마에 없는 컬럼) 반환 - 없는 컬럼이 있거나 변환할 조건이 없으면 표현식은 None"""
+        model_json = json.dumps(info["filter_model"], sort_keys=True)
+        key = (model_json, tuple(schema.items()))
+        with self._lock:
+            if key in self._compiled:
+                return self._compiled[key]
+
+        missing = [col for col in filter_columns(info["filter_model"]) if col not in schema]
+        expr = None
+        if not missing:
+            try:
+                expr = filter_expression(info["filter_model"])
+            except Exception as e:
+                logger.error(f"필터 컴파일 실패 ({info['name']}): {e}")
+        with self._lock:
+            if len(self._compiled) > 1000:
+                self._compiled.clear()
+            self._compiled[key] = (expr, missing)
+        return expr, missing
+
+    def match_counts(self, filters: List[Dict[str, Any]], df: pl.DataFrame) -> List[Optional[int]]:
+        """각 필터의 일치 행 수를 한 번의 select로 계산 (적용할 수 없는 필터는 None)"""
+        exprs = [self.compile(info, df.schema)[0] for info in filters]
+        valid = [(i, expr) for i, expr in enumerate(exprs) if expr is not None]
+        counts: List[Optional[int]] = [None] * len(filters)
+        if not valid or df.is_empty():
+            return counts
+        try:
+            row = df.select([expr.fill_null(False).sum().alias(f"f{i}") for i, expr in valid]).row(0)
+            for (i, _), count in zip(valid, row):
+                counts[i] = count
+        except Exception as e:
+            # 타입이 맞지 않는 조건 등으로 실패하면 필터별로 다시 계산해 실패한 필터만 제외
+            logger.error(f"필터 일치 행 수 일괄 계산 실패, 필터별로 계산: {e}")
+            for i, expr in valid:
+                try:
+                    counts[i] = df.select(expr.fill_null(False).sum()).item()
+                except Exception as e:
+                    logger.error(f"필터 일치 행 수 계산 실패 ({filters[i]['name']}): {e}")
+        return counts
+
+
+FILTER_LIBRARY = FilterLibrary(os.path.join(CONFIG.USER_RV_DIR, "filters.sqlite3"), legacy_yaml="filters.yaml")
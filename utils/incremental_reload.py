@@ -0,0 +1,210 @@
+import io
+import os
+import hashlib
+import threading
+import polars as pl
+from typing import Dict, Any, List, Optional, Tuple
+from utils.data_processing import detect_separator, read_csv_source, process_dataframe, validate_df, merge_local_waivers, PositionalMergeError
+from utils.logging_utils import logger
+
+
+BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class IncrementalReloader:
+    """파일을 불러올 때의 블록별 체크섬을 기억해 두었다가, 파일이 바뀌면 첫 변경 블록부터만 다시 읽음
+
+    CSV는 줄바꿈에 맞춘 약 4MB 블록, parquet은 row group 단위로 (바이트 범위, 행 범위, sha1)을 기록합니다.
+    reload 시 앞쪽의 바뀌지 않은 블록은 불러올 당시의 프레임에서 그대로 가져오고, 나머지만 파싱합니다.
+    끝에 행이 추가된 경우(가장 흔한 경우)에는 추가된 부분만 읽습니다.
+    그리드에는 한 번에 파일 하나만 열리므로 마지막으로 불러온 파일의 프레임만 보관하고, 다른 파일을 열면 이전 것은 버립니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[str, Dict[str, Any]] = {}
+        self._current: Optional[str] = None
+
+    @property
+    def current(self) -> Optional[str]:
+        """마지막으로 불러온(그리드에 열린) 파일 경로"""
+        return self._current
+
+    def record(self, file_path: str, df: pl.DataFrame) -> threading.Thread:
+        """파일을 불러온 직후 호출 - 체크섬 계산은 백그라운드 스레드에서 수행 (완료를 기다리려면 반환된 스레드를 join)"""
+        with self._lock:
+            self._fingerprints.clear()
+            self._current = file_path
+        thread = threading.Thread(target=self._fingerprint, args=(file_path, df), daemon=True)
+        thread.start()
+        return thread
+
+    def forget(self, file_path: str) -> None:
+        with self._lock:
+            self._fingerprints.pop(file_path, None)
+            if self._current == file_path:
+                self._current = None
+
+    def reload(self, file_path: str) -> Optional[Tuple[pl.DataFrame, Dict[str, int]]]:
+        """변경된 부분만 다시 읽은 새 프레임과 통계 반환 (증분 reload가 불가능하면 None)"""
+        with self._lock:
+            fingerprint = self._fingerprints.get(file_path)
+        if fingerprint is None:
+            return None
+        try:
+            if file_path.endswith(".parquet"):
+                result = self._reload_parquet(file_path, fingerprint)
+            else:
+                result = self._reload_csv(file_path, fingerprint)
+        except Exception as e:
+            logger.error(f"증분 reload 실패, 전체 reload로 대체: {e}")
+            return None
+        if result is not None:
+            self.record(file_path, result[0])
+        return result
+
+    def reload_with_local_waivers(self, file_path: str, df_local: pl.DataFrame) -> Tuple[pl.DataFrame, str, str]:
+        """Reload 버튼: 파일을 다시 읽고(가능하면 증분) 로컬 waiver를 반영해 (새 프레임, 메시지, toast intent) 반환
+
+        자연 키 없이 행 수가 바뀌어 waiver를 병합할 수 없으면 파일 내용을 그대로 불러오고 경고로 알립니다.
+        """
+        result = self.reload(file_path)
+        if result is None:
+            df_file = validate_df(file_path)
+            self.record(file_path, df_file)
+            message = f"Reloaded {df_file.height:,} rows"
+        else:
+            df_file, stats = result
+            message = f"Reloaded incrementally (kept {stats['kept_rows']:,} rows, parsed {stats['parsed_rows']:,} rows)"
+            logger.info(message)
+
+        try:
+            df, conflicts = merge_local_waivers(df_file, df_local)
+        except PositionalMergeError as e:
+            logger.warning(f"로컬 waiver 병합 생략: {e}")
+            return df_file, f"{message} - local waivers not kept: {e}", "warning"
+        if conflicts.height:
+            message += f" - {conflicts.height:,} waiver edits kept the workspace value"
+        return df, message, "success"
+
+    def _fingerprint(self, file_path: str, df: pl.DataFrame) -> None:
+        try:
+            stat_before = os.stat(file_path)
+            if file_path.endswith(".parquet"):
+                blocks = self._parquet_blocks(file_path)
+                extra = {}
+            else:
+                separator = detect_separator(file_path)
+                header, blocks = self._csv_blocks(file_path)
+                extra = {"separator": separator, "header": header}
+            stat_after = os.stat(file_path)
+            rows = sum(block["rows"] for block in blocks)
+            if (stat_before.st_mtime, stat_before.st_size) != (stat_after.st_mtime, stat_after.st_size) or rows != df.height:
+                # 계산 중 파일이 바뀌었거나 따옴표 안 줄바꿈 등으로 행 수가 맞지 않으면 증분 reload 사용 안 함
+                return
+            with self._lock:
+                if self._current == file_path:  # 계산 중 다른 파일을 열었으면 보관하지 않음
+                    self._fingerprints[file_path] = {"blocks": blocks, "df": df, **extra}
+        except Exception as e:
+            logger.error(f"reload 체크섬 계산 실패: {e}")
+
+    @staticmethod
+    def _csv_blocks(file_path: str) -> Tuple[bytes, List[Dict[str, Any]]]:
+        """헤더 이후 데이터를 줄바꿈에 맞춘 블록으로 나누어 (offset, length, rows, sha1) 기록"""
+        blocks = []
+        with open(file_path, "rb") as f:
+            header = f.readline()
+            offset = f.tell()
+            remainder = b""
+            while True:
+                chunk = f.read(BLOCK_SIZE)
+                data = remainder + chunk
+                if not chunk:
+                    if data:
+                        blocks.append(IncrementalReloader._csv_block(offset, data))
+                    break
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:
+                    remainder = data
+                    continue
+                blocks.append(IncrementalReloader._csv_block(offset, data[:cut]))
+                offset += cut
+                remainder = data[cut:]
+        return header, blocks
+
+    @staticmethod
+    def _csv_block(offset: int, data: bytes) -> Dict[str, Any]:
+        rows = data.count(b"\n") + (0 if data.endswith(b"\n") else 1)
+        rows -= data.count(b"\n\n")  # 빈 줄은 행으로 읽히지 않음
+        return {"offset": offset, "length": len(data), "rows": rows, "digest": hashlib.sha1(data).hexdigest()}
+
+    @staticmethod
+    def _parquet_blocks(file_path: str) -> List[Dict[str, Any]]:
+        import pyarrow.parquet as pq
+
+        blocks = []
+        metadata = pq.ParquetFile(file_path).metadata
+        with open(file_path, "rb") as f:
+            for i in range(metadata.num_row_groups):
+                row_group = metadata.row_group(i)
+                chunks = [row_group.column(j) for j in range(row_group.num_columns)]
+                start = min(chunk.dictionary_page_offset or chunk.data_page_offset for chunk in chunks)
+                end = max((chunk.dictionary_page_offset or chunk.data_page_offset) + chunk.total_compressed_size for chunk in chunks)
+                f.seek(start)
+                blocks.append({"offset": start, "length": end - start, "rows": row_group.num_rows, "digest": hashlib.sha1(f.read(end - start)).hexdigest()})
+        return blocks
+
+    @staticmethod
+    def _unchanged_prefix(old_blocks: List[Dict[str, Any]], new_blocks: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """앞에서부터 같은 블록 수와 그 행 수"""
+        count, rows = 0, 0
+        for old, new in zip(old_blocks, new_blocks):
+            if old["digest"] != new["digest"] or old["offset"] != new["offset"]:
+                break
+            count += 1
+            rows += old["rows"]
+        return count, rows
+
+    @staticmethod
+    def _combine(loaded: pl.DataFrame, prefix_rows: int, tail: pl.DataFrame) -> pl.DataFrame:
+        tail = tail.with_row_index("uniqid", offset=prefix_rows).select(loaded.columns)
+        if tail.schema != loaded.schema:
+            raise ValueError("변경된 부분의 컬럼 구성이 기존과 다름")
+        return pl.concat([loaded.head(prefix_rows), tail])
+
+    def _reload_csv(self, file_path: str, fingerprint: Dict[str, Any]) -> Optional[Tuple[pl.DataFrame, Dict[str, int]]]:
+        header, new_blocks = self._csv_blocks(file_path)
+        if header != fingerprint["header"]:
+            return None
+        count, prefix_rows = self._unchanged_prefix(fingerprint["blocks"], new_blocks)
+        loaded = fingerprint["df"]
+        if count == len(new_blocks) == len(fingerprint["blocks"]):
+            return loaded, {"kept_rows": loaded.height, "parsed_rows": 0}
+
+        start = new_blocks[count]["offset"] if count < len(new_blocks) else None
+        if start is None:
+            tail = loaded.clear().drop("uniqid")
+        else:
+            with open(file_path, "rb") as f:
+                f.seek(start)
+                raw = read_csv_source(io.BytesIO(header + f.read()), fingerprint["separator"])
+            tail = process_dataframe(raw, schema=loaded.schema)
+        df = self._combine(loaded, prefix_rows, tail)
+        return df, {"kept_rows": prefix_rows, "parsed_rows": df.height - prefix_rows}
+
+    def _reload_parquet(self, file_path: str, fingerprint: Dict[str, Any]) -> Optional[Tuple[pl.DataFrame, Dict[str, int]]]:
+        import pyarrow.parquet as pq
+
+        new_blocks = self._parquet_blocks(file_path)
+        count, prefix_rows = self._unchanged_prefix(fingerprint["blocks"], new_blocks)
+        loaded = fingerprint["df"]
+        if count == len(new_blocks) == len(fingerprint["blocks"]):
+            return loaded, {"kept_rows": loaded.height, "parsed_rows": 0}
+
+        parquet_file = pq.ParquetFile(file_path)
+        tail = pl.from_arrow(parquet_file.read_row_groups(list(range(count, len(new_blocks)))))
+        df = self._combine(loaded, prefix_rows, tail)
+        return df, {"kept_rows": prefix_rows, "parsed_rows": df.height - prefix_rows}
+
+
+INCREMENTAL_RELOAD = IncrementalReloader()
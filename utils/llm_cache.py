@@ -0,0 +1,108 @@
+import os
+import re
+import hmac
+import json
+import secrets
+import hashlib
+import diskcache as dc
+import polars as pl
+from typing import Dict, List, Optional
+from utils.config import CONFIG
+from utils.logging_utils import logger
+
+
+INDEX_KEY = "llm-answer-index"
+
+
+def normalize_prompt(prompt: str) -> str:
+    """대소문자, 공백, 끝 문장부호 차이만 있는 질문을 같은 질문으로 취급"""
+    return re.sub(r"\s+", " ", prompt).strip().rstrip("?.!").strip().lower()
+
+
+def schema_fingerprint(lf: pl.LazyFrame) -> str:
+    """컬럼 이름/타입 기준 지문 - 같은 스키마의 데이터가 갱신되어도 캐시된 코드를 다시 실행해 재사용"""
+    return hashlib.sha1(json.dumps([(name, str(dtype)) for name, dtype in lf.collect_schema().items()]).encode()).hexdigest()
+
+
+def private_dir(path: str) -> str:
+    """현재 사용자만 접근할 수 있는(0700) 디렉터리 준비 - 다른 사용자 소유면 PermissionError"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        if os.stat(path).st_uid != os.getuid():
+            raise PermissionError(f"{path} is not owned by the current user")
+        os.chmod(path, 0o700)
+    return path
+
+
+class AnswerCache:
+    """AI Analysis 답변(설명 + 생성 코드)을 사용자 전용 디렉터리(CONFIG.LLM_CACHE_DIR, 0700)의 diskcache에 저장
+
+    키는 (정규화한 질문, 이전 질문들, 데이터 스키마 지문, 모델 이름)이며, 적중하면 모델 호출 없이 저장된 코드를
+    현재 데이터에 다시 실행합니다. 각 항목은 같은 디렉터리의 비밀 키(0600)로 HMAC 서명하고, 서명이 맞지 않는 항목은
+    실행하지 않고 삭제합니다. 항목은 CONFIG.LLM_CACHE_TTL 후 만료되고, CONFIG.LLM_CACHE_MAX_ENTRIES를
+    넘으면 오래된 것부터 삭제합니다. 디렉터리를 준비할 수 없으면 캐시를 사용하지 않습니다.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache = None
+        self._secret = b""
+        try:
+            private_dir(cache_dir)
+            self._secret = self._load_secret(os.path.join(cache_dir, "secret"))
+            self.cache = dc.Cache(os.path.join(cache_dir, "answers"))
+        except Exception as e:
+            logger.error(f"AI 답변 캐시 디렉터리 준비 실패, 캐시 사용 안 함: {e}")
+
+    @staticmethod
+    def _load_secret(path: str) -> bytes:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(path, "rb") as file:
+                return file.read()
+        secret = secrets.token_bytes(32)
+        with os.fdopen(fd, "wb") as file:
+            file.write(secret)
+        return secret
+
+    def _signature(self, key: str, answer: str, code: Optional[str]) -> str:
+        return hmac.new(self._secret, json.dumps([key, answer, code]).encode(), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def key(prompt: str, history: List[Dict[str, str]], fingerprint: str, model: str) -> str:
+        previous = [normalize_prompt(message["content"]) for message in history if message["role"] == "user"]
+        payload = json.dumps([normalize_prompt(prompt), previous, fingerprint, model])
+        return f"llm-answer-{hashlib.sha1(payload.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        if self.cache is None:
+            return None
+        try:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            if not hmac.compare_digest(entry.get("signature", ""), self._signature(key, entry.get("answer"), entry.get("code"))):
+                logger.error(f"AI 답변 캐시 서명 불일치, 항목 삭제: {key}")
+                self.cache.delete(key)
+                return None
+            return entry
+        except Exception as e:
+            logger.error(f"AI 답변 캐시 조회 실패: {e}")
+            return None
+
+    def set(self, key: str, answer: str, code: Optional[str]) -> None:
+        if self.cache is None:
+            return
+        try:
+            entry = {"answer": answer, "code": code, "signature": self._signature(key, answer, code)}
+            with self.cache.transact():
+                self.cache.set(key, entry, expire=CONFIG.LLM_CACHE_TTL)
+                index = [entry for entry in self.cache.get(INDEX_KEY, []) if entry != key and entry in self.cache] + [key]
+                for expired in index[: -CONFIG.LLM_CACHE_MAX_ENTRIES]:
+                    self.cache.delete(expired)
+                self.cache.set(INDEX_KEY, index[-CONFIG.LLM_CACHE_MAX_ENTRIES :])
+        except Exception as e:
+            logger.error(f"AI 답변 캐시 저장 실패: {e}")
+
+
+ANSWER_CACHE = AnswerCache(CONFIG.LLM_CACHE_DIR)
@@ -0,0 +1,139 @@
+import re
+import json
+import threading
+import polars as pl
+from typing import Any, Dict, List, Optional, Tuple
+from components.grid.dag.SSRM.apply_filter import filter_expression
+from utils.db_management import SSDF
+from utils.llm_sandbox import run_sandboxed
+from utils.config import CONFIG
+
+
+SYSTEM_PROMPT = """You are a data analyst for a circuit verification report viewer.
+The report is available as a polars LazyFrame named `lf` (polars is imported as `pl`).
+Only the dataset profile below is given to you, not the rows themselves.
+
+{profile}
+
+Answer with a short explanation followed by one ```python code block that computes the answer from `lf`
+and assigns it to a variable named `result` (a polars DataFrame/LazyFrame, a number or a string).
+Use only polars expressions; do not read files or import other modules."""
+
+RESULT_ROW_LIMIT = 1000
+
+
+def view_key() -> Tuple[int, Optional[bool], str]:
+    """분석 대상(현재 필터가 적용된 데이터) 캐시 키 - 데이터 버전과 필터/정렬/그룹 설정"""
+    request = SSDF.request or {}
+    view = {key: request.get(key) for key in ("filterModel", "sortModel", "rowGroupCols", "valueCols")}
+    return SSDF.version, SSDF.hide_waiver, json.dumps(view, sort_keys=True, default=str)
+
+
+def analysis_frame() -> Optional[pl.LazyFrame]:
+    """현재 보기의 필터(와 waiver 표시 설정)를 적용한 lazy plan - 생성된 분석 코드는 이 plan 위에서 실행"""
+    dff = SSDF.dataframe
+    if dff is None or dff.is_empty():
+        return None
+    lf = dff.lazy()
+    if SSDF.hide_waiver and "waiver" in dff.columns:
+        conditions_expr = pl.col("waiver").is_in(["Waiver.", "Fixed."])
+        lf = lf.with_columns(pl.when(conditions_expr).then(pl.col("waiver").str.strip_chars(".")).otherwise(pl.col("waiver")).alias("waiver"))
+    filter_expr = filter_expression((SSDF.request or {}).get("filterModel"))
+    if filter_expr is not None:
+        lf = lf.filter(filter_expr)
+    return lf.drop([col for col in ("childCount", "uniqid") if col in dff.columns])
+
+
+class ContextBuilder:
+    """LLM 프롬프트에 넣을 데이터셋 요약(스키마, 컬럼 통계, 상위 값, waiver 분포, 그룹 수) 생성
+
+    요약은 한 번의 병렬 collect로 계산하고 보기 키별로 캐시하므로, 프롬프트 크기와 첫 답변 지연이 데이터 크기와 무관합니다.
+    """
+
+    def __init__(self, top_k: int = 5, max_columns: int = 80):
+        self.top_k = top_k
+        self.max_columns = max_columns
+        self._lock = threading.Lock()
+        self._cache: Dict[Any, str] = {}
+
+    def context(self, key: Any, lf: pl.LazyFrame) -> str:
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        text = self.profile_text(self.profile(lf))
+        with self._lock:
+            self._cache = {key: text}
+        return text
+
+    def profile(self, lf: pl.LazyFrame) -> Dict[str, Any]:
+        schema = lf.collect_schema()
+        columns = list(schema.items())[: self.max_columns]
+        numeric = [name for name, dtype in columns if dtype.is_numeric()]
+        others = [name for name, dtype in columns if not dtype.is_numeric()]
+
+        stats_exprs = [pl.len().alias("__rows")]
+        for name in numeric:
+            stats_exprs += [pl.col(name).min().alias(f"{name}__min"), pl.col(name).max().alias(f"{name}__max"), pl.col(name).mean().alias(f"{name}__mean")]
+        for name, _ in columns:
+            stats_exprs += [pl.col(name).null_count().alias(f"{name}__nulls"), pl.col(name).n_unique().alias(f"{name}__unique")]
+        queries = [lf.select(stats_exprs)]
+        queries += [lf.group_by(name).len().sort("len", descending=True).head(self.top_k) for name in others]
+
+        group_cols = [col["id"] for col in (SSDF.request or {}).get("rowGroupCols") or [] if col.get("id") in schema]
+        if group_cols:
+            queries.append(lf.group_by(group_cols).len().sort("len", descending=True).head(self.top_k))
+
+        results = pl.collect_all(queries)
+        stats = results[0].row(0, named=True)
+        profile = {"rows": stats["__rows"], "total_columns": len(schema), "columns": [], "groups": None}
+        top_values = dict(zip(others, results[1 : 1 + len(others)]))
+        for name, dtype in columns:
+            info = {"name": name, "dtype": str(dtype), "nulls": stats[f"{name}__nulls"], "unique": stats[f"{name}__unique"]}
+            if name in numeric:
+                info.update(min=stats[f"{name}__min"], max=stats[f"{name}__max"], mean=stats[f"{name}__mean"])
+            else:
+                info["top"] = [(str(row[name])[:60], row["len"]) for row in top_values[name].iter_rows(named=True)]
+            profile["columns"].append(info)
+        if group_cols:
+            profile["groups"] = {"by": group_cols, "top": results[-1].rows()}
+        return profile
+
+    @staticmethod
+    def profile_text(profile: Dict[str, Any]) -> str:
+        lines = [f"Dataset profile: {profile['rows']:,} rows, {profile['total_columns']} columns"]
+        for info in profile["columns"]:
+            line = f"- {info['name']} ({info['dtype']}): nulls={info['nulls']}, unique={info['unique']}"
+            if "mean" in info:
+                fmt = lambda value: f"{value:.4g}" if isinstance(value, float) else value
+                line += f", min={fmt(info['min'])}, max={fmt(info['max'])}, mean={fmt(info['mean'])}"
+            else:
+                line += ", top=" + ", ".join(f"{value!r}:{count}" for value, count in info["top"])
+            if info["name"] == "waiver":
+                line += "  <- waiver status distribution"
+            lines.append(line)
+        if len(profile["columns"]) < profile["total_columns"]:
+            lines.append(f"- ... {profile['total_columns'] - len(profile['columns'])} more columns omitted")
+        if profile["groups"]:
+            lines.append(f"Current grouping {profile['groups']['by']} (largest groups, last value is row count): {profile['groups']['top']}")
+        return "\n".join(lines)
+
+
+def build_messages(context: str, question: str, history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """system(데이터 요약) + 이전 대화 + 질문으로 chat completion 메시지 구성"""
+    return [{"role": "system", "content": SYSTEM_PROMPT.format(profile=context)}, *history, {"role": "user", "content": question}]
+
+
+def extract_code(answer: str) -> Optional[str]:
+    blocks = re.findall(r"```(?:python|py)?\s*\n(.*?)```", answer, flags=re.DOTALL)
+    return blocks[-1].strip() if blocks else None
+
+
+def run_analysis_code(code: str, lf: pl.LazyFrame, key: Any = None) -> Any:
+    """생성된 코드를 제한된 별도 프로세스에서 lazy plan에 대해 실행하고 result 반환 (RESULT_ROW_LIMIT 행까지)
+
+    key는 view_key() - 같은 보기의 데이터 파일을 질문 간에 재사용합니다.
+    """
+    return run_sandboxed(code, lf, CONFIG.LLM_CODE_TIMEOUT, RESULT_ROW_LIMIT, key=key)
+
+
+CONTEXT_BUILDER = ContextBuilder()
@@ -0,0 +1,176 @@
+"""AI Analysis가 생성한 polars 코드를 제한된 별도 프로세스에서 실행
+
+- 실행 전 AST로 검사해 import, 밑줄로 시작하는 이름/속성, 파일 입출력 메서드(read_/scan_/write_/sink_)와
+  SQL(pl.sql, SQLContext, lf.sql - read_csv 같은 테이블 함수로 파일을 읽을 수 있음) 사용을 거부
+- 허용 목록의 builtins(open, __import__, eval, exec, compile 등 제외)와 모듈을 제외한 polars 이름만 제공
+- 분석 대상 보기는 보기 키별로 한 번만 비압축 IPC 파일로 기록(FRAME_STORE)하고, 자식 프로세스(임시 디렉터리에서 실행)는
+  이를 scan_ipc(memory-map)로 읽으므로 질문마다 데이터를 직렬화/복사하지 않음 - timeout 후 종료
+- result는 polars DataFrame/LazyFrame/Series 또는 스칼라(숫자, 문자열, bool, None)만 허용
+
+자식 프로세스는 이 파일을 스크립트로 실행하므로 polars 외의 앱 모듈을 import하지 않습니다.
+"""
+import io
+import os
+import re
+import ast
+import sys
+import json
+import uuid
+import types
+import atexit
+import shutil
+import builtins
+import tempfile
+import threading
+import subprocess
+import polars as pl
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+SAFE_BUILTINS = {
+    name: getattr(builtins, name)
+    for name in (
+        "abs", "all", "any", "bool", "dict", "divmod", "enumerate", "filter", "float", "int", "isinstance", "len", "list",
+        "map", "max", "min", "pow", "print", "range", "reversed", "round", "set", "slice", "sorted", "str", "sum", "tuple", "zip",
+        "ArithmeticError", "Exception", "KeyError", "IndexError", "TypeError", "ValueError", "ZeroDivisionError",
+    )
+}
+# 파일/네트워크에 접근할 수 있는 이름: 입출력 함수, SQL(read_csv 등 테이블 함수 사용 가능), 카탈로그/원격 실행/자격 증명
+BLOCKED_ATTRIBUTE = re.compile(
+    r"^(_|read_|scan_|write_|sink_|sql|CredentialProvider)|^(serialize|deserialize|Config|SQLContext|Catalog|PartitionBy|RemoteEngine)$"
+)
+SCALAR_TYPES = (bool, int, float, str, type(None))
+
+
+class UnsafeCodeError(ValueError):
+    """생성된 코드가 허용되지 않는 구문을 포함"""
+
+
+def validate_code(code: str) -> None:
+    """실행 전에 코드를 AST로 검사 - 허용되지 않는 구문이 있으면 UnsafeCodeError"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        raise UnsafeCodeError(f"코드 구문 오류: {e}") from e
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            raise UnsafeCodeError(f"import는 사용할 수 없습니다 (line {node.lineno})")
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            raise UnsafeCodeError(f"global/nonlocal은 사용할 수 없습니다 (line {node.lineno})")
+        if isinstance(node, ast.Name) and node.id.startswith("_"):
+            raise UnsafeCodeError(f"허용되지 않는 이름: {node.id} (line {node.lineno})")
+        if isinstance(node, ast.Attribute) and BLOCKED_ATTRIBUTE.match(node.attr):
+            raise UnsafeCodeError(f"허용되지 않는 속성: {node.attr} (line {node.lineno})")
+
+
+def safe_polars() -> types.SimpleNamespace:
+    """모듈(pl.os 등)과 파일 입출력 함수를 뺀 polars 이름 공간"""
+    names = {}
+    for name in dir(pl):
+        if BLOCKED_ATTRIBUTE.match(name):
+            continue
+        value = getattr(pl, name)
+        if not isinstance(value, types.ModuleType):
+            names[name] = value
+    return types.SimpleNamespace(**names)
+
+
+class FrameStore:
+    """분석 대상 보기를 보기 키별로 사용자 전용 임시 디렉터리의 IPC 파일로 한 번만 기록 (최근 max_frames개 유지)
+
+    sink_ipc로 스트리밍 기록하므로 필터 결과 전체를 메모리에 한 번 더 만들지 않고, 같은 보기에 대한 이후 질문은 파일을 재사용합니다.
+    """
+
+    def __init__(self, max_frames: int = 2):
+        self.max_frames = max_frames
+        self._lock = threading.Lock()
+        self._paths: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._dir: Optional[str] = None
+
+    def path(self, key: Hashable, lf: pl.LazyFrame) -> str:
+        with self._lock:
+            if key in self._paths:
+                self._paths.move_to_end(key)
+                return self._paths[key]
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix="rv_llm_frames_")  # 0700
+                atexit.register(shutil.rmtree, self._dir, True)
+            path = os.path.join(self._dir, f"{uuid.uuid4().hex}.arrow")
+            tmp_path = f"{path}.tmp"
+            try:
+                lf.sink_ipc(tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self._paths[key] = path
+            while len(self._paths) > self.max_frames:
+                _, expired = self._paths.popitem(last=False)
+                os.remove(expired)
+            return path
+
+
+FRAME_STORE = FrameStore()
+
+
+def run_sandboxed(code: str, lf: pl.LazyFrame, timeout: float, row_limit: int, key: Optional[Hashable] = None) -> Any:
+    """검사한 코드를 자식 프로세스에서 lf에 대해 실행하고 result 반환 (DataFrame은 row_limit 행까지)
+
+    key(보기 키)가 같으면 이전에 기록한 IPC 파일을 재사용합니다. key가 없으면 매번 새로 기록합니다.
+    """
+    validate_code(code)
+    if lf is None:
+        raise ValueError("분석할 데이터가 없습니다")
+    frame_path = FRAME_STORE.path(key if key is not None else uuid.uuid4().hex, lf)
+    payload = json.dumps({"code": code, "row_limit": row_limit, "frame": frame_path}).encode()
+    with tempfile.TemporaryDirectory(prefix="rv_llm_") as workdir:
+        try:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__)], input=payload, capture_output=True, timeout=timeout, cwd=workdir
+            )
+        except subprocess.TimeoutExpired:
+            raise TimeoutError(f"분석 코드 실행 시간 초과 ({timeout:g}s)")
+    status, _, body = completed.stdout.partition(b"\n")
+    try:
+        status = json.loads(status)
+    except ValueError:
+        raise RuntimeError(f"분석 코드 실행 실패: {completed.stderr.decode(errors='replace').strip()[-500:]}")
+    if status["kind"] == "error":
+        raise RuntimeError(status["error"])
+    if status["kind"] == "frame":
+        return pl.read_ipc(io.BytesIO(body))
+    return status["value"]
+
+
+def _child() -> None:
+    """자식 프로세스: stdin에서 코드와 보기 IPC 파일 경로를 받아 실행하고 stdout에 결과 기록"""
+    stdout = sys.stdout.buffer
+    sys.stdout = sys.stderr  # 코드의 print가 결과 출력과 섞이지 않도록
+    request = json.loads(sys.stdin.buffer.read())
+    try:
+        validate_code(request["code"])
+        lf = pl.scan_ipc(request["frame"])
+        namespace = {"__builtins__": SAFE_BUILTINS, "pl": safe_polars(), "lf": lf}
+        exec(compile(request["code"], "<analysis>", "exec"), namespace)
+        result = namespace.get("result")
+        if isinstance(result, pl.LazyFrame):
+            result = result.head(request["row_limit"]).collect()
+        elif isinstance(result, pl.Series):
+            result = result.head(request["row_limit"]).to_frame()
+        elif isinstance(result, pl.DataFrame):
+            result = result.head(request["row_limit"])
+        elif not isinstance(result, SCALAR_TYPES):
+            raise TypeError(f"result는 polars DataFrame/LazyFrame 또는 스칼라여야 합니다 ({type(result).__name__})")
+    except Exception as e:
+        stdout.write(json.dumps({"kind": "error", "error": f"{type(e).__name__}: {e}"}).encode() + b"\n")
+        return
+    if isinstance(result, pl.DataFrame):
+        buffer = io.BytesIO()
+        result.write_ipc(buffer)
+        stdout.write(json.dumps({"kind": "frame"}).encode() + b"\n" + buffer.getvalue())
+    else:
+        stdout.write(json.dumps({"kind": "scalar", "value": result}).encode() + b"\n")
+
+
+if __name__ == "__main__":
+    _child()
@@ -0,0 +1,97 @@
+import json
+import time
+import uuid
+import threading
+from typing import Dict, Any, List, Optional
+from utils.logging_utils import logger
+
+
+class LLMStreamer:
+    """OpenAI 호환 /chat/completions를 stream=True로 호출해 도착한 토큰을 작업별로 누적
+
+    콜백은 start()로 요청을 시작하고 바로 반환하며, UI는 status()를 주기적으로 조회해 지금까지의 답변을 표시합니다.
+    cancel()은 응답 연결을 닫아 진행 중인 HTTP 요청 자체를 중단합니다 (모델 서버도 생성을 멈춤).
+    서버가 스트리밍을 지원하지 않고 일반 JSON으로 답하면 한 번에 받은 답변을 그대로 사용합니다.
+    """
+
+    def __init__(self, max_finished: int = 20):
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def start(self, api_base: str, model: str, messages: List[Dict[str, str]], timeout: float = 300) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        job = {"id": job_id, "state": "running", "text": "", "error": None, "cancelled": False, "response": None, "submitted": time.time()}
+        with self._lock:
+            self._jobs[job_id] = job
+            self._prune()
+        threading.Thread(target=self._run, args=(job, api_base, model, messages, timeout), name="llm-stream", daemon=True).start()
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """{"state": running/done/failed/cancelled, "text", "error"} 반환"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return {key: job[key] for key in ("id", "state", "text", "error")} if job else None
+
+    def cancel(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["state"] != "running":
+                return
+            job["cancelled"] = True
+            response = job["response"]
+        if response is not None:
+            try:
+                response.close()
+            except Exception as e:
+                logger.error(f"LLM 요청 연결 종료 실패: {e}")
+        logger.info(f"LLM request cancelled: {job_id}")
+
+    def _run(self, job: Dict[str, Any], api_base: str, model: str, messages: List[Dict[str, str]], timeout: float) -> None:
+        import requests
+
+        state, error = "done", None
+        try:
+            payload = {"model": model, "messages": messages, "temperature": 0, "stream": True}
+            with requests.post(f"{api_base.rstrip('/')}/chat/completions", json=payload, stream=True, timeout=(10, timeout)) as response:
+                with self._lock:
+                    job["response"] = response
+                    cancelled = job["cancelled"]
+                if not cancelled:
+                    response.raise_for_status()
+                    if "text/event-stream" in response.headers.get("Content-Type", ""):
+                        self._read_events(job, response)
+                    else:
+                        self._append(job, response.json()["choices"][0]["message"]["content"])
+        except Exception as e:
+            if not job["cancelled"]:
+                logger.error(f"LLM 스트리밍 요청 실패: {e}")
+                state, error = "failed", str(e)
+        with self._lock:
+            job.update(state="cancelled" if job["cancelled"] else state, error=error, response=None, finished=time.time())
+        logger.info(f"LLM answer {job['state']} ({len(job['text'])} chars)")
+
+    def _read_events(self, job: Dict[str, Any], response) -> None:
+        for line in response.iter_lines(decode_unicode=True):
+            if job["cancelled"]:
+                return
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                return
+            choices = json.loads(data).get("choices") or [{}]
+            self._append(job, choices[0].get("delta", {}).get("content") or "")
+
+    def _append(self, job: Dict[str, Any], text: str) -> None:
+        with self._lock:
+            job["text"] += text
+
+    def _prune(self) -> None:
+        finished = sorted((job for job in self._jobs.values() if job["state"] != "running"), key=lambda job: job["submitted"])
+        for job in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job["id"]]
+
+
+LLM_STREAM = LLMStreamer()
@@ -0,0 +1,107 @@
+"""OpenAI 호환 LLM 서버 대용 로컬 HTTP 서버 (모델 서버 없이 AI Analysis 동작 확인용)
+
+사용법:
+    python -m utils.llm_stub_server --port 8001 --delay 0.5
+    LLMAnalysis.api_base를 http://127.0.0.1:8001/v1 로 지정
+
+/v1/chat/completions 요청에 고정된 설명 + polars 코드 블록으로 답하고, 받은 프롬프트 크기를 출력합니다.
+"stream": true 요청에는 --token-delay 간격으로 SSE 청크를 보냅니다 (스트리밍/취소 확인용).
+"""
+import re
+import json
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_ANSWER = """Counting rows of the current view.
+
+```python
+result = lf.select(pl.len().alias("rows"))
+```"""
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    answer = DEFAULT_ANSWER
+    delay = 0.0
+    token_delay = 0.02
+    requests = []
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json({"object": "list", "data": [{"id": "stub-model", "object": "model"}]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.requests.append(body)
+        prompt_chars = sum(len(message.get("content", "")) for message in body.get("messages", []))
+        print(f"[LLM] model={body.get('model')} messages={len(body.get('messages', []))} prompt_chars={prompt_chars:,}", flush=True)
+        time.sleep(self.delay)
+        if body.get("stream"):
+            self._send_stream(body.get("model"))
+            return
+        self._send_json(
+            {
+                "id": "stub",
+                "object": "chat.completion",
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": self.answer}, "finish_reason": "stop"}],
+            }
+        )
+
+    def _send_stream(self, model):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            for token in re.findall(r"\S+\s*|\s+", self.answer):
+                chunk = {"id": "stub", "object": "chat.completion.chunk", "model": model, "choices": [{"index": 0, "delta": {"content": token}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(self.token_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            print("[LLM] client closed the stream", flush=True)
+
+    def _send_json(self, data):
+        payload = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, answer: str = DEFAULT_ANSWER, token_delay: float = 0.02) -> ThreadingHTTPServer:
+    """별도 클래스 속성을 가진 핸들러로 서버 생성 (serve_forever는 호출하는 쪽에서 실행)"""
+    handler = type("Handler", (StubLLMHandler,), {"delay": delay, "answer": answer, "token_delay": token_delay, "requests": []})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stand-in LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", default=8001, type=int)
+    parser.add_argument("--delay", default=0.0, type=float, help="응답 전 지연(초)")
+    parser.add_argument("--token-delay", default=0.02, type=float, help="스트리밍 청크 간격(초)")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.delay, token_delay=args.token_delay)
+    print(f"LLM stand-in server listening on http://{args.host}:{server.server_port}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
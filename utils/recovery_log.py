@@ -0,0 +1,209 @@
+import os
+import json
+import uuid
+import threading
+import polars as pl
+from typing import Dict, Any, List, Optional
+from utils.config import CONFIG
+from utils.file_operations import fsync_path
+from utils.logging_utils import logger
+
+
+def atomic_write_parquet(df: pl.DataFrame, file_path: str, **kwargs) -> None:
+    """임시 파일에 쓰고 fsync한 뒤 os.replace로 교체 - 쓰는 도중이나 교체 직후 중단되어도 기존 파일 또는 완전한 새 파일이 남음"""
+    tmp_path = f"{file_path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        df.write_parquet(tmp_path, **{**CONFIG.PARQUET_OPTIONS, **kwargs})
+        fsync_path(tmp_path)
+        os.replace(tmp_path, file_path)
+        fsync_path(os.path.dirname(os.path.abspath(file_path)))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def atomic_write_json(data: Dict[str, Any], file_path: str) -> None:
+    tmp_path = f"{file_path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+        fsync_path(os.path.dirname(os.path.abspath(file_path)))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class RecoveryLog:
+    """자동 백업용 복구 로그: 기준 스냅샷(base) + 이후 변경분 세그먼트
+
+    체크포인트마다 직전 체크포인트와 비교하여 변경된 컬럼만 기록합니다.
+    변경된 행이 적으면 (uniqid, value) 셀 패치로, 많으면 컬럼 전체로 저장합니다.
+    모든 파일은 임시 파일 + rename으로 기록되고, manifest가 교체되는 순간에만 새 상태가 유효해집니다.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str, patch_ratio: float = 0.05, max_segments: int = 5):
+        self.directory = directory
+        self.patch_ratio = patch_ratio
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._reference: Optional[pl.DataFrame] = None
+        self._version: Optional[int] = None
+        self._compactor: Optional[threading.Thread] = None
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, self.MANIFEST)
+
+    @property
+    def version(self) -> Optional[int]:
+        """마지막으로 기록된 SSDF.version"""
+        return self._version
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def mtime(self) -> float:
+        return os.path.getmtime(self.manifest_path)
+
+    def checkpoint(self, df: pl.DataFrame, version: int) -> str:
+        """현재 상태를 기록하고 결과("skipped", "base", "delta")를 반환"""
+        with self._lock:
+            if self._version == version and self.exists():
+                return "skipped"
+
+            os.makedirs(self.directory, mode=0o777, exist_ok=True)
+            reference = self._reference
+            if reference is None or not self.exists() or reference.height != df.height or not self._same_rows(reference, df):
+                self._write_base(df)
+                result = "base"
+            else:
+                segment = self._write_segment(reference, df)
+                if segment is None:
+                    result = "skipped"
+                else:
+                    manifest = self._read_manifest()
+                    manifest["segments"].append(segment)
+                    manifest["order"] = df.columns
+                    atomic_write_json(manifest, self.manifest_path)
+                    result = "delta"
+
+            self._reference = df
+            self._version = version
+
+        if result == "delta" and len(self._read_manifest()["segments"]) >= self.max_segments:
+            self.compact_in_background()
+        return result
+
+    def load(self) -> pl.DataFrame:
+        """base에 세그먼트를 순서대로 적용하여 마지막 체크포인트 상태를 복원"""
+        manifest = self._read_manifest()
+        df = pl.read_parquet(os.path.join(self.directory, manifest["base"]))
+        for segment in manifest["segments"]:
+            dropped = [col for col in segment["dropped"] if col in df.columns]
+            if dropped:
+                df = df.drop(dropped)
+            if segment["columns_file"]:
+                df = df.with_columns(pl.read_parquet(os.path.join(self.directory, segment["columns_file"])).get_columns())
+            for col, patch_file in segment["patches"].items():
+                patch = pl.read_parquet(os.path.join(self.directory, patch_file)).rename({"value": col})
+                df = df.update(patch, on="uniqid", how="left", include_nulls=True)
+        return df.select([col for col in manifest["order"] if col in df.columns])
+
+    def compact_in_background(self) -> None:
+        """세그먼트를 접어 새 base로 만드는 작업을 별도 스레드에서 실행"""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self.compact, daemon=True)
+        self._compactor.start()
+
+    def compact(self) -> None:
+        with self._lock:
+            if self._reference is None or not self.exists():
+                return
+            try:
+                self._write_base(self._reference)
+            except Exception as e:
+                logger.error(f"복구 로그 압축 실패: {e}")
+
+    def release(self) -> None:
+        """메모리에 든 직전 체크포인트 DataFrame을 해제 (디스크의 로그는 유지 - 다음 체크포인트는 새 base로 기록)"""
+        with self._lock:
+            self._reference = None
+            self._version = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reference = None
+            self._version = None
+            if os.path.exists(self.manifest_path):
+                os.remove(self.manifest_path)
+            self._remove_unreferenced(set())
+
+    @staticmethod
+    def _same_rows(reference: pl.DataFrame, df: pl.DataFrame) -> bool:
+        if "uniqid" not in reference.columns or "uniqid" not in df.columns:
+            return False
+        return reference["uniqid"].equals(df["uniqid"])
+
+    def _write_base(self, df: pl.DataFrame) -> None:
+        base_file = f"base_{uuid.uuid4().hex[:12]}.parquet"
+        atomic_write_parquet(df, os.path.join(self.directory, base_file))
+        atomic_write_json({"base": base_file, "segments": [], "order": df.columns}, self.manifest_path)
+        self._remove_unreferenced({base_file})
+
+    def _write_segment(self, reference: pl.DataFrame, df: pl.DataFrame) -> Optional[Dict[str, Any]]:
+        """직전 체크포인트 대비 변경분을 파일로 기록하고 manifest 항목을 반환 (변경 없으면 None)"""
+        segment_id = uuid.uuid4().hex[:12]
+        dropped = [col for col in reference.columns if col not in df.columns]
+        full_columns: List[pl.Series] = []
+        patches: Dict[str, str] = {}
+
+        for col in df.columns:
+            if col == "uniqid":
+                continue
+            new = df[col]
+            if col not in reference.columns or reference[col].dtype != new.dtype:
+                full_columns.append(new)
+                continue
+            old = reference[col]
+            if new.equals(old):
+                continue
+            changed = new.ne_missing(old)
+            changed_count = changed.sum()
+            if changed_count > df.height * self.patch_ratio:
+                full_columns.append(new)
+            else:
+                patch_file = f"seg_{segment_id}_patch_{len(patches)}.parquet"
+                patch = df.filter(changed).select(pl.col("uniqid"), pl.col(col).alias("value"))
+                atomic_write_parquet(patch, os.path.join(self.directory, patch_file))
+                patches[col] = patch_file
+
+        if not dropped and not full_columns and not patches and reference.columns == df.columns:
+            return None
+
+        columns_file = None
+        if full_columns:
+            columns_file = f"seg_{segment_id}_columns.parquet"
+            atomic_write_parquet(pl.DataFrame(full_columns), os.path.join(self.directory, columns_file))
+
+        return {"columns_file": columns_file, "patches": patches, "dropped": dropped}
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        with open(self.manifest_path, "r") as f:
+            return json.load(f)
+
+    def _remove_unreferenced(self, keep: set) -> None:
+        """manifest에 없는 이전 base/세그먼트 파일 정리"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".parquet") and name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except Exception as e:
+                    logger.error(f"복구 로그 파일 삭제 실패: {e}")
@@ -0,0 +1,232 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+from utils.config import CONFIG
+from utils.file_operations import get_file_owner
+from utils.file_watcher import FILE_WATCHER
+from utils.logging_utils import logger
+
+
+class WorkspaceIndex:
+    """WORKSPACE 파일 메타데이터(경로, 크기, mtime, 소유자, lock 상태)를 SQLite에 저장하는 검색 인덱스
+
+    백그라운드 크롤러가 주기적으로 갱신하며, mtime이 그대로인 디렉토리는 다시 나열하지 않고
+    인덱스에 기록된 하위 디렉토리로만 내려갑니다 (디렉토리당 stat 1회).
+    파일 이름은 FTS5 trigram 인덱스로 부분 문자열(LIKE)/glob 검색을 처리하고,
+    trigram을 지원하지 않는 SQLite에서는 일반 테이블 LIKE 검색으로 동작합니다.
+    SQLite 파일은 import 시점이 아니라 start() 또는 처음 사용할 때 엽니다.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            dir TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER,
+            mtime REAL,
+            owner TEXT,
+            locked_by TEXT
+        );
+        CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+        CREATE TABLE IF NOT EXISTS dirs (
+            path TEXT PRIMARY KEY,
+            parent TEXT,
+            mtime REAL
+        );
+        CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+    """
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(name, content='files', content_rowid='id', tokenize='trigram');
+        CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+            INSERT INTO names(rowid, name) VALUES (new.id, new.name);
+        END;
+        CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+            INSERT INTO names(names, rowid, name) VALUES ('delete', old.id, old.name);
+        END;
+    """
+
+    def __init__(self, root: str, db_path: str, interval: int = 300, full_scan_every: int = 12):
+        self.root = root
+        self.db_path = db_path
+        self.interval = interval
+        self.full_scan_every = full_scan_every
+        self.ready = False
+        self._fts = False
+        self._crawl_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _ensure_initialized(self) -> None:
+        with self._init_lock:
+            if not self._initialized:
+                self._initialize()
+                self._initialized = True
+
+    def _initialize(self) -> None:
+        os.makedirs(os.path.dirname(self.db_path), mode=0o777, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            try:
+                conn.executescript(self.FTS_SCHEMA)
+                self._fts = True
+            except sqlite3.OperationalError as e:
+                logger.error(f"SQLite trigram 미지원, LIKE 검색으로 대체: {e}")
+            self.ready = conn.execute("SELECT 1 FROM dirs WHERE path = ?", (self.root,)).fetchone() is not None
+
+    def start(self) -> None:
+        """백그라운드 크롤러 시작 (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="workspace-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        count = 0
+        try:
+            self._ensure_initialized()
+        except Exception as e:
+            logger.error(f"WORKSPACE 인덱스 초기화 실패: {e}")
+            return
+        while not self._stop.is_set():
+            try:
+                self.refresh(full=count % self.full_scan_every == 0)
+            except Exception as e:
+                logger.error(f"WORKSPACE 인덱스 갱신 실패: {e}")
+            count += 1
+            self._stop.wait(self.interval)
+
+    def refresh(self, full: bool = False) -> None:
+        """인덱스 갱신 - full이 아니면 mtime이 바뀐 디렉토리만 다시 나열"""
+        self._ensure_initialized()
+        with self._crawl_lock, self._connect() as conn:
+            known_dirs = {row["path"]: row["mtime"] for row in conn.execute("SELECT path, mtime FROM dirs")}
+            seen_dirs = set()
+            stack = [self.root]
+            while stack:
+                dir_path = stack.pop()
+                try:
+                    dir_mtime = os.stat(dir_path).st_mtime
+                except OSError:
+                    continue
+                seen_dirs.add(dir_path)
+                if not full and known_dirs.get(dir_path) == dir_mtime:
+                    stack.extend(row["path"] for row in conn.execute("SELECT path FROM dirs WHERE parent = ?", (dir_path,)))
+                    continue
+                stack.extend(self._scan_dir(conn, dir_path, dir_mtime))
+                conn.commit()
+
+            removed = [path for path in known_dirs if path not in seen_dirs]
+            for path in removed:
+                conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+                conn.execute("DELETE FROM dirs WHERE path = ?", (path,))
+            conn.commit()
+            self.ready = True
+
+    def update_dirs(self, dir_paths: List[str]) -> None:
+        """파일 감시 등으로 변경이 확인된 디렉토리만 즉시 다시 나열"""
+        root = os.path.normpath(self.root)
+        dir_paths = [path for path in dir_paths if os.path.normpath(path) == root or os.path.normpath(path).startswith(root + os.sep)]
+        if not dir_paths or not self._initialized:
+            return  # 아직 인덱스를 열지 않았으면 첫 크롤링에서 반영됨
+        with self._crawl_lock, self._connect() as conn:
+            for dir_path in dir_paths:
+                try:
+                    dir_mtime = os.stat(dir_path).st_mtime
+                except OSError:
+                    conn.execute("DELETE FROM files WHERE dir = ?", (dir_path,))
+                    conn.execute("DELETE FROM dirs WHERE path = ?", (dir_path,))
+                    continue
+                self._scan_dir(conn, dir_path, dir_mtime)
+            conn.commit()
+
+    def _scan_dir(self, conn: sqlite3.Connection, dir_path: str, dir_mtime: float) -> List[str]:
+        """디렉토리 한 단계를 나열하여 파일 행을 갱신하고 하위 디렉토리 목록 반환"""
+        known = {row["name"]: (row["size"], row["mtime"]) for row in conn.execute("SELECT name, size, mtime FROM files WHERE dir = ?", (dir_path,))}
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.error(f"디렉토리 나열 실패 {dir_path}: {e}")
+            return []
+
+        names = {entry.name for entry in entries}
+        subdirs, present = [], set()
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                if entry.name.endswith(".lock"):
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            present.add(entry.name)
+            lock_name = f"{entry.name}.lock"
+            locked_by = get_file_owner(os.path.join(dir_path, lock_name)) if lock_name in names else None
+            if known.get(entry.name) == (stat.st_size, stat.st_mtime):
+                conn.execute("UPDATE files SET locked_by = ? WHERE path = ?", (locked_by, entry.path))
+                continue
+            conn.execute(
+                """INSERT INTO files (path, dir, name, size, mtime, owner, locked_by) VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime = excluded.mtime, owner = excluded.owner, locked_by = excluded.locked_by""",
+                (entry.path, dir_path, entry.name, stat.st_size, stat.st_mtime, get_file_owner(entry.path), locked_by),
+            )
+
+        for name in set(known) - present:
+            conn.execute("DELETE FROM files WHERE path = ?", (os.path.join(dir_path, name),))
+        conn.execute(
+            "INSERT INTO dirs (path, parent, mtime) VALUES (?, ?, ?) ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime",
+            (dir_path, os.path.dirname(dir_path) if dir_path != self.root else None, dir_mtime),
+        )
+        return subdirs
+
+    def search(self, pattern: str, root_dir: Optional[str] = None, limit: int = 5000) -> List[Dict[str, Any]]:
+        """파일 이름 검색 - *, ?, [ 가 있으면 glob, 아니면 대소문자 무시 부분 문자열 검색"""
+        self._ensure_initialized()
+        is_glob = any(char in pattern for char in "*?[")
+        condition = "GLOB ?" if is_glob else "LIKE ?"
+        arg = pattern if is_glob else f"%{pattern}%"
+
+        # trigram 인덱스는 3글자 이상의 리터럴이 있어야 사용 가능
+        literal = pattern.strip("*?[]%_")
+        if self._fts and len(literal) >= 3:
+            query = f"SELECT f.* FROM names JOIN files f ON f.id = names.rowid WHERE names.name {condition}"
+        else:
+            query = f"SELECT f.* FROM files f WHERE f.name {condition}"
+        args: List[Any] = [arg]
+
+        if root_dir and os.path.normpath(root_dir) != os.path.normpath(self.root):
+            # 경로 접두사 범위 조건 ('/' 다음 문자가 '0')
+            prefix = os.path.normpath(root_dir)
+            query += " AND f.path > ? AND f.path < ?"
+            args += [prefix + "/", prefix + "0"]
+
+        query += " ORDER BY f.path LIMIT ?"
+        args.append(limit)
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query, args)]
+
+
+WORKSPACE_INDEX = WorkspaceIndex(CONFIG.WORKSPACE, os.path.join(CONFIG.USER_RV_DIR, "workspace_index.sqlite3"))
+FILE_WATCHER.add_listener(WORKSPACE_INDEX.update_dirs)